@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Optional, Sequence
 
 from pylinks.api.doi import DOI
-from pylinks.api.github import GitHub
+from pylinks.api.github import GitHub, MetadataCache, MutationQueue, NodeIDCache, RateLimiter
 from pylinks.api.orcid import Orcid
 from pylinks.api.zenodo import Zenodo
 
@@ -10,8 +10,22 @@ def doi(doi: str) -> DOI:
     return DOI(doi=doi)
 
 
-def github(token: Optional[str] = None, timezone: str | None = "UTC") -> GitHub:
-    return GitHub(token=token, timezone=timezone)
+def github(
+    token: Optional[str | Sequence[str]] = None,
+    timezone: str | None = "UTC",
+    rate_limiter: Optional[RateLimiter] = None,
+    mutation_queue: Optional[MutationQueue] = None,
+    node_ids: Optional[NodeIDCache] = None,
+    metadata_cache: Optional[MetadataCache] = None,
+) -> GitHub:
+    return GitHub(
+        token=token,
+        timezone=timezone,
+        rate_limiter=rate_limiter,
+        mutation_queue=mutation_queue,
+        node_ids=node_ids,
+        metadata_cache=metadata_cache,
+    )
 
 
 def orcid(orcid_id: str) -> Orcid:
@@ -1,15 +1,126 @@
 # Standard libraries
 from __future__ import annotations as _annotations
-from typing import TYPE_CHECKING as _TYPE_CHECKING
+from typing import TYPE_CHECKING as _TYPE_CHECKING, NamedTuple as _NamedTuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait as _wait_futures, FIRST_COMPLETED
+from contextlib import contextmanager
+import bisect
+import copy
+import fnmatch
+import hashlib
+import hmac
+import json as _json
 import re
 import mimetypes
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.parse
+
+try:
+    import fcntl as _fcntl
+except ImportError:  # Windows
+    _fcntl = None
+    import msvcrt as _msvcrt
 
 # Non-standard libraries
 import pylinks as _pylinks
+from pylinks.exception import api as _api_exception
 
 if _TYPE_CHECKING:
-    from typing import Optional, Literal, Any
+    from typing import Optional, Literal, Any, Callable, Sequence
+    from requests import Response
+
+
+_GRAPHQL_RATE_LIMIT_ALIAS = "pylinksRateLimit"
+# Block strings and regular string literals of GraphQL documents
+_GRAPHQL_STRING = re.compile(r'("""(?:\\"""|.)*?"""|"(?:\\.|[^"\\\n])*")', re.DOTALL)
+
+_DISCUSSION_CATEGORY_FIELDS = {
+    "minimal": "name, slug, id",
+    "full": "name, slug, id, emoji, emojiHTML, createdAt, updatedAt, isAnswerable, description",
+}
+
+_BRANCH_PROTECTION_RULE_ALLOWANCE_FIELDS = "(first: 100) {nodes {actor {... on Node {id}}}}"
+_BRANCH_PROTECTION_RULE_FIELDS = {
+    "minimal": "id, pattern",
+    "full": (
+        "id, pattern, allowsDeletions, allowsForcePushes, blocksCreations, dismissesStaleReviews, "
+        "isAdminEnforced, lockAllowsFetchAndMerge, lockBranch, requireLastPushApproval, "
+        "requiredApprovingReviewCount, requiredDeploymentEnvironments, requiredStatusCheckContexts, "
+        "requiresApprovingReviews, requiresCodeOwnerReviews, requiresCommitSignatures, "
+        "requiresConversationResolution, requiresDeployments, requiresLinearHistory, "
+        "requiresStatusChecks, requiresStrictStatusChecks, restrictsPushes, restrictsReviewDismissals, "
+        f"pushAllowances{_BRANCH_PROTECTION_RULE_ALLOWANCE_FIELDS}, "
+        f"bypassForcePushAllowances{_BRANCH_PROTECTION_RULE_ALLOWANCE_FIELDS}, "
+        f"bypassPullRequestAllowances{_BRANCH_PROTECTION_RULE_ALLOWANCE_FIELDS}, "
+        f"reviewDismissalAllowances{_BRANCH_PROTECTION_RULE_ALLOWANCE_FIELDS}"
+    ),
+}
+
+_REPO_SNAPSHOT_INFO_FIELDS = (
+    "id, databaseId, name, nameWithOwner, owner {login}, description, homepageUrl, url, visibility, "
+    "isPrivate, isArchived, isFork, isTemplate, isEmpty, createdAt, updatedAt, pushedAt, "
+    "defaultBranchRef {name, target {oid}}, "
+    "hasIssuesEnabled, hasDiscussionsEnabled, hasProjectsEnabled, hasWikiEnabled, forkingAllowed, "
+    "mergeCommitAllowed, squashMergeAllowed, rebaseMergeAllowed, autoMergeAllowed, deleteBranchOnMerge, "
+    "allowUpdateBranch, webCommitSignoffRequired, squashMergeCommitTitle, squashMergeCommitMessage, "
+    "mergeCommitTitle, mergeCommitMessage, repositoryTopics(first: 100) {nodes {topic {name}}}"
+)
+
+# Connections fetched by `Repo.snapshot`, as {alias: (field, arguments, node fields)}
+_REPO_SNAPSHOT_CONNECTIONS = {
+    "labels": ("labels", "", "id, name, color, description, isDefault"),
+    "branches": ("refs", 'refPrefix: "refs/heads/", ', "name, target {oid}"),
+    "tags": ("refs", 'refPrefix: "refs/tags/", ', "name, target {oid}"),
+    "rulesets": ("rulesets", "includeParents: true, ", "id, databaseId, name, target, enforcement"),
+    "branchProtectionRules": ("branchProtectionRules", "", _BRANCH_PROTECTION_RULE_FIELDS["full"]),
+    "discussionCategories": ("discussionCategories", "", _DISCUSSION_CATEGORY_FIELDS["full"]),
+}
+
+# Arguments of `Repo.repo_update` that can be compared with `RepoSnapshot.info`, as {argument: field path}
+_REPO_SETTINGS_FIELDS = {
+    "name": ("name",),
+    "description": ("description",),
+    "homepage": ("homepageUrl",),
+    "visibility": ("visibility",),
+    "is_template": ("isTemplate",),
+    "default_branch": ("defaultBranchRef", "name"),
+    "archived": ("isArchived",),
+    "has_issues": ("hasIssuesEnabled",),
+    "has_discussions": ("hasDiscussionsEnabled",),
+    "has_projects": ("hasProjectsEnabled",),
+    "has_wiki": ("hasWikiEnabled",),
+    "allow_forking": ("forkingAllowed",),
+    "allow_merge_commit": ("mergeCommitAllowed",),
+    "allow_squash_merge": ("squashMergeAllowed",),
+    "allow_rebase_merge": ("rebaseMergeAllowed",),
+    "allow_auto_merge": ("autoMergeAllowed",),
+    "delete_branch_on_merge": ("deleteBranchOnMerge",),
+    "allow_update_branch": ("allowUpdateBranch",),
+    "web_commit_signoff_required": ("webCommitSignoffRequired",),
+    "squash_merge_commit_title": ("squashMergeCommitTitle",),
+    "squash_merge_commit_message": ("squashMergeCommitMessage",),
+    "merge_commit_title": ("mergeCommitTitle",),
+    "merge_commit_message": ("mergeCommitMessage",),
+}
+
+# Maximum number of results GitHub returns for a search query, and page size of code search
+_SEARCH_RESULTS_CAP = 1000
+_SEARCH_PAGE_SIZE = 100
+# Upper bound of file sizes (in bytes) indexed by code search
+_CODE_SEARCH_MAX_FILE_SIZE = 384 * 1024
+
+# Inputs of branch protection rule mutations that are read from a differently named field
+_BRANCH_PROTECTION_RULE_ALLOWANCE_INPUTS = {
+    "pushActorIds": "pushAllowances",
+    "bypassForcePushActorIds": "bypassForcePushAllowances",
+    "bypassPullRequestActorIds": "bypassPullRequestAllowances",
+    "reviewDismissalActorIds": "reviewDismissalAllowances",
+}
 
 
 class GitHub:
@@ -21,26 +132,484 @@ class GitHub:
     - [GraphQL API Documentation](https://docs.github.com/en/graphql)
     """
 
-    def __init__(self, token: Optional[str] = None, timezone: str | None = "UTC"):
+    def __init__(
+        self,
+        token: str | Sequence[str] | None = None,
+        timezone: str | None = "UTC",
+        rate_limiter: RateLimiter | None = None,
+        mutation_queue: MutationQueue | None = None,
+        node_ids: NodeIDCache | None = None,
+        metadata_cache: MetadataCache | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        token : str | Sequence[str], optional
+            A personal access token or GitHub App installation token,
+            or a sequence of such tokens to use as a pool.
+            When multiple tokens are given, each request is sent with
+            the token that has the most remaining rate-limit budget
+            for the requested resource (e.g., REST, GraphQL, search).
+        timezone : str, optional, default: 'UTC'
+            Timezone to use for timestamps in REST API responses.
+        rate_limiter : RateLimiter, optional
+            A rate limiter shared with other processes on the same host.
+            If provided, each request waits until the used token has budget left
+            for the requested resource, according to the state shared by all processes.
+        mutation_queue : MutationQueue, optional
+            Queue through which all content-creating requests (REST requests with verbs
+            POST, PUT, PATCH, and DELETE, and GraphQL mutations) are sent,
+            to avoid GitHub's secondary rate limits.
+            Defaults to a `MutationQueue` with default settings.
+        node_ids : NodeIDCache, optional
+            Cache of GraphQL node IDs, filled from REST responses and used by mutations
+            to avoid extra lookup requests. Pass a `NodeIDCache` with a path to persist it.
+            Defaults to an in-memory `NodeIDCache`.
+        metadata_cache : MetadataCache, optional
+            Cache of repository and user metadata (e.g., `Repo.info`, `Repo.labels`, `User.info`),
+            invalidated by mutations sent through this client.
+            By default, metadata is not cached, and each access sends a new request.
+        """
         self._endpoint = {
             "api": _pylinks.url.create("https://api.github.com"),
             "upload": _pylinks.url.create("https://uploads.github.com"),
         }
-        self._token = token
+        tokens = [token] if isinstance(token, str) else [tok for tok in (token or []) if tok]
+        self._token_pool = _TokenPool(tokens) if tokens else None
+        self._rate_limiter = rate_limiter
+        self._mutation_queue = mutation_queue or MutationQueue()
+        self._node_ids = node_ids if node_ids is not None else NodeIDCache()
+        self._metadata_cache = metadata_cache
+        self._version_indices: dict[tuple[str, str], VersionIndex] = {}
+        self._graphql_costs: dict[str, dict[str, float]] = {}
+        self._graphql_costs_lock = threading.Lock()
         self._headers = {"X-GitHub-Api-Version": "2022-11-28"}
         if timezone:
             # https://docs.github.com/en/rest/using-the-rest-api/timezones-and-the-rest-api?apiVersion=2022-11-28
             self._headers["Time-Zone"] = timezone
-        if self._token:
-            self._headers["Authorization"] = f"Bearer {self._token}"
         return
 
     def user(self, username) -> "User":
-        return User(username=username, token=self._token)
+        return User(username=username, github=self)
 
     def user_from_id(self, user_id) -> "User":
         user_data = self.rest_query(f"user/{user_id}")
-        return User(username=user_data["login"], token=self._token)
+        return User(username=user_data["login"], github=self)
+
+    def repo(self, username: str, name: str) -> "Repo":
+        return Repo(username=username, name=name, github=self)
+
+    def repo_snapshots(self, repos: Sequence[tuple[str, str]], pages: bool = True) -> list[RepoSnapshot]:
+        """Get snapshots of many repositories in as few requests as possible.
+
+        The first page (100 items) of all connections of all repositories
+        is fetched in batched GraphQL queries, each with as many repositories
+        as GitHub's node limit allows (see `graphql_query_batch`);
+        only connections with more items need follow-up queries.
+
+        Parameters
+        ----------
+        repos : Sequence[tuple[str, str]]
+            Repositories as tuples of (owner, name).
+        pages : bool, default: True
+            Whether to also fetch the GitHub Pages site information of each repository.
+            This is not available in the GraphQL API, and thus requires one REST request per repository.
+
+        Returns
+        -------
+        list[RepoSnapshot]
+            Snapshots of the repositories, in the same order as the input.
+        """
+
+        def connection_selection(alias: str, cursor: str | None = None) -> str:
+            field, args, node_fields = _REPO_SNAPSHOT_CONNECTIONS[alias]
+            after = f', after: "{cursor}"' if cursor else ""
+            return (
+                f"{alias}: {field}({args}first: 100{after}) "
+                f"{{pageInfo {{hasNextPage, endCursor}} nodes {{{node_fields}}}}}"
+            )
+
+        def repo_selection(owner: str, name: str, payload: str) -> str:
+            return f'repository(name: "{name}", owner: "{owner}") {{{payload}}}'
+
+        payload = " ".join(
+            [_REPO_SNAPSHOT_INFO_FIELDS] + [connection_selection(alias) for alias in _REPO_SNAPSHOT_CONNECTIONS]
+        )
+        infos = [
+            result.data for result in self.graphql_query_batch(
+                [repo_selection(owner, name, payload) for owner, name in repos],
+                operation="repo_snapshots",
+            )
+        ]
+        connections = [{} for _ in infos]
+        pending = {}
+        for idx, info in enumerate(infos):
+            for alias in _REPO_SNAPSHOT_CONNECTIONS:
+                connection = info.pop(alias)
+                connections[idx][alias] = connection["nodes"]
+                if connection["pageInfo"]["hasNextPage"]:
+                    pending[(idx, alias)] = connection["pageInfo"]["endCursor"]
+        # Follow up on connections with more than one page, in batches across all repositories
+        while pending:
+            keys = list(pending)
+            results = self.graphql_query_batch(
+                [
+                    repo_selection(*repos[idx], connection_selection(alias, pending[(idx, alias)]))
+                    for idx, alias in keys
+                ],
+                operation="repo_snapshots",
+            )
+            pending = {}
+            for (idx, alias), result in zip(keys, results):
+                connection = result.data[alias]
+                connections[idx][alias].extend(connection["nodes"])
+                if connection["pageInfo"]["hasNextPage"]:
+                    pending[(idx, alias)] = connection["pageInfo"]["endCursor"]
+        snapshots = []
+        for (owner, name), info, connection in zip(repos, infos, connections):
+            info["topics"] = [node["topic"]["name"] for node in info.pop("repositoryTopics")["nodes"]]
+            self._node_ids.set(info["id"], "repo", owner, name)
+            for label in connection["labels"]:
+                self._node_ids.set(label["id"], "label", owner, name, label["name"])
+            pages_info = None
+            if pages:
+                try:
+                    pages_info = self.rest_query(f"repos/{owner}/{name}/pages")
+                except _api_exception.WebAPIStatusCodeError as e:
+                    if e.response.status_code != 404:
+                        raise
+            snapshots.append(
+                RepoSnapshot(
+                    info=info,
+                    labels=connection["labels"],
+                    branches=connection["branches"],
+                    tags=connection["tags"],
+                    pages=pages_info,
+                    rulesets=connection["rulesets"],
+                    branch_protection_rules=connection["branchProtectionRules"],
+                    discussion_categories=connection["discussionCategories"],
+                )
+            )
+        return snapshots
+
+    def contents_many(
+        self,
+        files: Sequence[tuple[str, str, str | None, str]],
+        max_size: int = 100,
+        max_workers: int = 8,
+    ) -> list[str | bytes | None]:
+        """Get the contents of many files from one or several repositories in as few requests as possible.
+
+        The text of all blobs is fetched in batched GraphQL queries,
+        using one aliased `object(expression: "ref:path")` selection per file.
+        Files that are binary, or too large for their full text to be returned by GraphQL,
+        are instead fetched (concurrently) with the raw media type of the REST Contents API.
+
+        Parameters
+        ----------
+        files : Sequence[tuple[str, str, str | None, str]]
+            Files as tuples of (owner, repository name, ref, path),
+            where ref is the name of a commit/branch/tag, or None for the default branch.
+        max_size : int, default: 100
+            Maximum number of files in a single GraphQL query.
+        max_workers : int, default: 8
+            Maximum number of concurrent REST requests for binary or oversized files.
+
+        Returns
+        -------
+        list[str | bytes | None]
+            Contents of the files, in the same order as the input:
+            text (str) for text files, raw bytes for binary files,
+            and None for paths (or refs) that do not exist, or are not files.
+
+        Raises
+        ------
+        pylinks.exception.api.GraphQLResponseError
+            If a repository does not exist or is not accessible.
+
+        References
+        ----------
+        - [GitHub API Docs: Blob](https://docs.github.com/en/graphql/reference/objects#blob)
+        - [GitHub API Docs: Contents](https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#get-repository-content)
+        """
+        queries = [
+            (
+                f'repository(name: "{name}", owner: "{owner}") '
+                f"{{object(expression: $expression) {{... on Blob {{text, isBinary, isTruncated}}}}}}",
+                {"expression": (f"{ref or 'HEAD'}:{path.strip('/')}", "String", True)},
+            )
+            for owner, name, ref, path in files
+        ]
+        results = self.graphql_query_batch(queries, max_size=max_size, operation="contents_many")
+        contents = []
+        fallbacks = []
+        for idx, result in enumerate(results):
+            blob = result.data["object"]
+            if not blob or "isBinary" not in blob:
+                # Path does not exist, or points to a tree or a submodule
+                contents.append(None)
+            elif blob["isBinary"] or blob["isTruncated"] or blob["text"] is None:
+                contents.append(None)
+                fallbacks.append(idx)
+            else:
+                contents.append(blob["text"])
+
+        def download(idx: int) -> bytes:
+            owner, name, ref, path = files[idx]
+            query = f"repos/{owner}/{name}/contents/{path.strip('/')}{f'?ref={ref}' if ref else ''}"
+            with self._request(
+                url=self._endpoint["api"] / query,
+                extra_headers={"Accept": "application/vnd.github.raw+json"},
+                stream=True,
+            ) as response:
+                return response.content
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for idx, content in zip(fallbacks, executor.map(download, fallbacks)):
+                contents[idx] = content if results[idx].data["object"]["isBinary"] else content.decode()
+        return contents
+
+    def labels_apply(
+        self,
+        repos: Sequence[tuple[str, str]],
+        desired: Sequence[dict[str, str | Sequence[str]]],
+        delete: bool = False,
+        dry_run: bool = False,
+        max_workers: int = 4,
+    ) -> list[LabelsApplyReport | Exception]:
+        """Reconcile the labels of many repositories with a desired set of labels.
+
+        Repositories are processed concurrently; see `Repo.labels_apply` for details.
+        A failure in one repository does not affect the others.
+        Mutations of all repositories share this client's mutation queue,
+        so that they are spaced to respect secondary rate limits.
+
+        Parameters
+        ----------
+        repos : Sequence[tuple[str, str]]
+            Repositories as tuples of (owner, name).
+        desired : Sequence[dict[str, str | Sequence[str]]]
+            Desired labels; see `Repo.labels_apply`.
+        delete : bool, default: False
+            Whether to delete existing labels that do not match any desired label.
+        dry_run : bool, default: False
+            Only compute and return the plans, without sending any mutations.
+        max_workers : int, default: 4
+            Maximum number of concurrent requests.
+
+        Returns
+        -------
+        list[LabelsApplyReport | Exception]
+            Reports of the repositories, in the same order as the input.
+            For a repository that could not be processed at all
+            (e.g., because its labels could not be read), the raised error is returned instead.
+
+        Raises
+        ------
+        ValueError
+            If two desired labels have the same name (compared case-insensitively).
+        """
+        _check_unique_label_names(desired)
+
+        def apply(repo: tuple[str, str]) -> LabelsApplyReport | Exception:
+            owner, name = repo
+            try:
+                return self.repo(owner, name).labels_apply(
+                    desired=desired, delete=delete, dry_run=dry_run, max_workers=max_workers
+                )
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(apply, repos))
+
+    def apply_settings(
+        self,
+        repos: Sequence[tuple[str, str]],
+        spec: dict,
+        dry_run: bool = False,
+        max_workers: int = 4,
+    ) -> list[SettingsApplyReport | Exception]:
+        """Apply a declarative settings specification to many repositories.
+
+        The current state of all repositories is read with `repo_snapshots` in batched queries,
+        and each repository is then reconciled concurrently; see `Repo.apply_settings` for details.
+        Re-applying an unchanged specification thus only sends read requests.
+        A failure in one repository does not affect the others.
+
+        Parameters
+        ----------
+        repos : Sequence[tuple[str, str]]
+            Repositories as tuples of (owner, name).
+        spec : dict
+            Settings specification; see `Repo.apply_settings`.
+        dry_run : bool, default: False
+            Only compute and return the required changes, without sending any mutations.
+        max_workers : int, default: 4
+            Maximum number of repositories to reconcile concurrently.
+
+        Returns
+        -------
+        list[SettingsApplyReport | Exception]
+            Reports of the repositories, in the same order as the input.
+            For a repository that could not be processed at all
+            (e.g., because the specification is invalid for it), the raised error is returned instead.
+        """
+        snapshots = self.repo_snapshots(repos, pages="pages" in spec)
+
+        def apply(repo_snapshot: tuple[tuple[str, str], RepoSnapshot]) -> SettingsApplyReport | Exception:
+            (owner, name), snapshot = repo_snapshot
+            try:
+                return self.repo(owner, name).apply_settings(spec=spec, dry_run=dry_run, snapshot=snapshot)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(apply, zip(repos, snapshots)))
+
+    def ingest_webhook(
+        self,
+        event: str,
+        payload: dict | str | bytes,
+        mirrors: Sequence[RepoMirror] = (),
+    ) -> None:
+        """Keep the client's caches and local mirrors fresh from a webhook payload, without any API requests.
+
+        - Node IDs of all repositories, users, labels, issues, and pull requests in the payload
+          are added to the node-ID cache, and renamed, transferred, or deleted objects are invalidated.
+        - Metadata views changed by the event are invalidated in the metadata cache (if any),
+          e.g., labels for 'label' events, branches and tags for 'push', 'create', and 'delete' events,
+          and all views of the repository for 'repository' events.
+        - Cached semantic-version indices are dropped when tags are pushed, created, or deleted.
+        - Given mirrors of the repository are updated; see `RepoMirror.ingest`.
+
+        Parameters
+        ----------
+        event : str
+            Name of the event, i.e., the value of the 'X-GitHub-Event' header.
+        payload : dict | str | bytes
+            Webhook payload, either parsed or as the raw JSON request body.
+        mirrors : Sequence[RepoMirror], optional
+            Local mirrors to update.
+
+        References
+        ----------
+        - [GitHub Docs: Webhook events and payloads](https://docs.github.com/en/webhooks/webhook-events-and-payloads)
+        """
+        if not isinstance(payload, dict):
+            payload = _json.loads(payload)
+        repository = payload.get("repository") or {}
+        full_name = repository.get("full_name")
+        action = payload.get("action")
+        changes = payload.get("changes") or {}
+        if full_name:
+            owner, name = full_name.split("/", 1)
+            scope = f"repos/{owner}/{name}"
+            if event == "repository":
+                old_name = ((changes.get("repository") or {}).get("name") or {}).get("from")
+                old_owner = (((changes.get("owner") or {}).get("from") or {}).get("user") or {}).get("login")
+                if old_name or old_owner:
+                    self._node_ids.invalidate("repo", old_owner or owner, old_name or name)
+                    if self._metadata_cache:
+                        self._metadata_cache.invalidate(f"repos/{old_owner or owner}/{old_name or name}")
+                if action == "deleted":
+                    self._node_ids.invalidate("repo", owner, name)
+            elif event == "label":
+                old_label = (changes.get("name") or {}).get("from")
+                if action == "deleted" or old_label:
+                    self._node_ids.invalidate("label", owner, name, old_label or payload["label"]["name"])
+            elif event == "issues" and action in ("deleted", "transferred"):
+                self._node_ids.invalidate("issue", owner, name, str(payload["issue"]["number"]))
+            if self._metadata_cache:
+                views = {
+                    "repository": (),
+                    "label": ("labels",),
+                    "push": ("branches", "tags", "info"),
+                    "create": ("branches", "tags"),
+                    "delete": ("branches", "tags"),
+                    "page_build": ("pages",),
+                }.get(event)
+                if views is not None:
+                    self._metadata_cache.invalidate(scope, *views)
+            ref = payload.get("ref") or ""
+            if (event == "push" and ref.startswith("refs/tags/")) or (
+                event in ("create", "delete") and payload.get("ref_type") == "tag"
+            ):
+                for key in [key for key in self._version_indices if key[0] == full_name.lower()]:
+                    self._version_indices.pop(key, None)
+        if action not in ("deleted", "transferred"):
+            self._node_ids.record(query="", verb="GET", json=None, value=payload)
+        for mirror in mirrors:
+            mirror.ingest(event=event, payload=payload)
+        return
+
+    @staticmethod
+    def verify_webhook_signature(body: bytes, signature: str | None, secret: str) -> bool:
+        """Verify that a webhook request was sent by GitHub, using the webhook's secret.
+
+        Parameters
+        ----------
+        body : bytes
+            Raw request body.
+        signature : str
+            Value of the 'X-Hub-Signature-256' request header.
+        secret : str
+            Secret of the webhook.
+
+        References
+        ----------
+        - [GitHub Docs](https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries)
+        """
+        if not signature:
+            return False
+        expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    def user_node_id(self, login: str) -> str:
+        """Get the node ID of a user or organization, from the cache if available.
+
+        Parameters
+        ----------
+        login : str
+            Username of the user or organization.
+        """
+        return self._cached_node_id(
+            key=("user", login),
+            selection="repositoryOwner(login: $login) {id}",
+            variables={"login": (login, "String", True)},
+            path=("repositoryOwner",),
+        )
+
+    def _cached_node_id(
+        self,
+        key: tuple[str, ...],
+        selection: str,
+        variables: dict[str, tuple[Any, str, bool]] | None = None,
+        path: Sequence[str] = (),
+    ) -> str:
+        """Get a node ID from the cache, or query it with a GraphQL selection and add it to the cache.
+
+        Parameters
+        ----------
+        key : tuple[str, ...]
+            Key of the node in the cache; see `NodeIDCache`.
+        selection : str
+            Top-level GraphQL selection ending with the `id` field of the node.
+        variables : dict[str, tuple[Any, str, bool]], optional
+            Variables of the selection, in the same format as in `graphql_query`.
+        path : Sequence[str]
+            Keys leading from the response data to the object containing the `id` field.
+        """
+        node_id = self._node_ids.get(*key)
+        if node_id:
+            return node_id
+        data = self.graphql_query(query=selection, variables=variables, operation="node_id")
+        for field in path:
+            data = data[field]
+            if data is None:
+                raise ValueError(f"No node found for {key}.")
+        self._node_ids.set(data["id"], *key)
+        return data["id"]
 
     def search_code(self, query: str, max_results: int = 0):
         results = {
@@ -54,11 +623,61 @@ class GitHub:
             results["total_count"] = response["total_count"]
             results["incomplete_results"] = results["incomplete_results"] or response["incomplete_results"]
             results["items"].extend(response["items"])
-            page += 1
-            if len(response["items"]) < 100 or (max_results and len(results["items"]) >= max_results):
+            if (
+                len(response["items"]) < 100
+                or page * 100 >= min(response["total_count"], _SEARCH_RESULTS_CAP)
+                or (max_results and len(results["items"]) >= max_results)
+            ):
                 break
+            page += 1
         return results
 
+    def search_code_crawl(
+        self,
+        query: str,
+        max_workers: int = 4,
+        per_minute: float | None = None,
+        split: bool = True,
+        max_retries: int = 3,
+    ) -> CodeSearchCrawl:
+        """Crawl all results of a code search, with concurrent, rate-paced page requests.
+
+        Parameters
+        ----------
+        query : str
+            Search query, e.g., `'"import pylinks" language:python'`.
+        max_workers : int, default: 4
+            Maximum number of concurrent requests.
+        per_minute : float, optional
+            Maximum number of requests per minute.
+            Defaults to the code search rate limit (10 requests per minute) times the number of tokens.
+        split : bool, default: True
+            Whether to split queries with more results than GitHub returns (1,000)
+            into sub-queries over file size ranges.
+        max_retries : int, default: 3
+            Maximum number of times a request is retried after hitting a rate limit.
+
+        Returns
+        -------
+        CodeSearchCrawl
+            Iterable over the deduplicated result items, fetched lazily as it is iterated.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/search/search?apiVersion=2022-11-28#search-code)
+        - [GitHub API Docs](https://docs.github.com/en/rest/search/search?apiVersion=2022-11-28#rate-limit)
+        """
+        if per_minute is None:
+            per_minute = 10 * (len(self._token_pool.tokens) if self._token_pool else 1)
+        return CodeSearchCrawl(
+            github=self,
+            query=query,
+            max_workers=max_workers,
+            per_minute=per_minute,
+            split=split,
+            max_retries=max_retries,
+        )
+
     def search_code_graphql(
         self,
         query: str,
@@ -68,129 +687,2079 @@ class GitHub:
         cursor_before: str | None = None,
         cursor_after: str | None = None,
         sort: Literal["first", "last"] = "first",
+        page_size: int = 100,
+        target_cost: float | None = None,
+        target_seconds: float | None = None,
+    ) -> list[dict]:
+        """
+        Search GitHub using the GraphQL API.
+
+        Parameters
+        ----------
+        query : str
+            Search query.
+        search_type : {'discussion', 'issue', 'repository', 'user'}
+            Type of the searched objects.
+        payload : str
+            Fields to select from the search result connection, e.g., `'nodes {... on Issue {number}}'`.
+        count : int, default: 0
+            Maximum number of results to fetch. If 0 or negative, all results are fetched.
+        cursor_before : str, optional
+            Only fetch results before this cursor.
+        cursor_after : str, optional
+            Only fetch results after this cursor.
+        sort : {'first', 'last'}, default: 'first'
+            Whether to fetch results from the start or the end of the result list.
+        page_size : int, default: 100
+            Initial number of results per page (at most 100).
+        target_cost : float, optional
+            Target rate-limit cost (in points) per page.
+            If set, the page size is adapted after each page to approach this cost.
+        target_seconds : float, optional
+            Target response time (in seconds) per page.
+            If set, the page size is adapted after each page to approach this response time.
+
+        Returns
+        -------
+        list[dict]
+            The search result connection of each page (without its `pageInfo` field).
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/graphql/reference/queries#search)
+        """
+
+        def make_query(size: int) -> str:
+            search_args = [
+                f'query: "{query}"', f"type: {search_type.upper()}", "after: $after", "before: $before", f"{sort}: {size}"
+            ]
+            return f'search({", ".join(search_args)}) {{{page_info_fields} {payload}}}'
+
+        page_info_fields = "pageInfo {startCursor, endCursor, hasNextPage, hasPreviousPage}"
+        variables = {
+            "after": (cursor_after, "String", False),
+            "before": (cursor_before, "String", False),
+        }
+        pages = self._graphql_paginate(
+            query=make_query,
+            connection=lambda data: data["search"],
+            variables=variables,
+            count=count,
+            sort=sort,
+            page_size=_AdaptivePageSize(page_size, target_cost=target_cost, target_seconds=target_seconds),
+            operation="search_code_graphql",
+        )
+        out = []
+        for page in pages:
+            page["search"].pop("pageInfo")
+            out.append(page["search"])
+        return out
+
+    def graphql_query(
+        self,
+        query: str,
+        variables: dict[str, tuple[Any, str, bool]] | None = None,
+        extra_headers: dict | None = None,
+        operation: str | None = None,
+    ) -> dict:
+        return self._graphql_query_with_cost(
+            query=query, variables=variables, extra_headers=extra_headers, operation=operation
+        )[0]
+
+    def graphql_mutation(
+        self, mutation_name: str,
+        mutation_input_name: str,
+        mutation_input: dict,
+        mutation_payload: str,
+        extra_headers: dict | None = None,
+    ):
+        query = self._graphql_document(
+            f"mutation($mutationInput:{mutation_input_name}!)",
+            f"{mutation_name}(input:$mutationInput) {{{mutation_payload}}}",
+            cost=False,
+        )
+        return self._graphql_request(
+            query=query,
+            variables={"mutationInput": mutation_input},
+            extra_headers=extra_headers,
+            mutation=True,
+            operation=mutation_name,
+        )
+
+    def graphql_query_batch(
+        self,
+        queries: Sequence[str | tuple[str, dict[str, tuple[Any, str, bool]]]],
+        max_size: int = 50,
+        max_nodes: int = 500_000,
+        max_cost: int = 5000,
+        raise_errors: bool = True,
+        extra_headers: dict | None = None,
+        operation: str = "graphql_query_batch",
+    ) -> list[GraphQLResult]:
+        """Send many independent GraphQL queries in as few requests as possible.
+
+        The queries are merged into aliased documents,
+        each containing as many queries as allowed by the given limits,
+        and the response of each document is split back into the results of the individual queries.
+
+        Parameters
+        ----------
+        queries : Sequence[str | tuple[str, dict[str, tuple[Any, str, bool]]]]
+            Queries to send. Each query is a single top-level selection,
+            e.g., `'repository(name: "repo", owner: "user") {id}'`,
+            or a tuple of such a selection and its variables
+            (in the same format as the `variables` argument of `graphql_query`).
+        max_size : int, default: 50
+            Maximum number of queries in a single document.
+        max_nodes : int, default: 500_000
+            Maximum number of nodes requested by a single document.
+            This is GitHub's node limit for a single call.
+        max_cost : int, default: 5000
+            Maximum estimated rate-limit cost (in points) of a single document.
+            GitHub only limits the number of nodes of a single call, not its cost;
+            the default equals the primary rate limit of a user token (5,000 points per hour),
+            so that a single document never needs more than a full hour's budget.
+        raise_errors : bool, default: True
+            Raise a `GraphQLResponseError` when the response to a document contains errors.
+            Otherwise, errors are returned in the `errors` field of the corresponding results.
+        extra_headers : dict, optional
+            Headers to add to (or override) the default headers.
+        operation : str, default: 'graphql_query_batch'
+            Name under which the rate-limit cost of the requests is accounted in `graphql_costs`.
+
+        Returns
+        -------
+        list[GraphQLResult]
+            The results of the queries, in the same order as the input.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/graphql/overview/rate-limits-and-node-limits-for-the-graphql-api)
+        """
+        items = []
+        for query in queries:
+            selection, variables = (query, None) if isinstance(query, str) else query
+            items.append((selection, variables or {}))
+        results = []
+        for batch in self._graphql_batches([selection for selection, _ in items], max_size, max_nodes, max_cost):
+            fields = []
+            variables = {}
+            for idx in batch:
+                selection, query_variables = items[idx]
+                alias = f"q{idx}"
+                fields.append(f"{alias}: {self._graphql_aliased_selection(selection, alias)}")
+                for name, spec in query_variables.items():
+                    variables[f"{alias}_{name}"] = spec
+            results.extend(
+                self._graphql_batch_results(
+                    operation_type="query",
+                    fields=fields,
+                    variables=variables,
+                    aliases=[f"q{idx}" for idx in batch],
+                    raise_errors=raise_errors,
+                    extra_headers=extra_headers,
+                    mutation=False,
+                    operation=operation,
+                )
+            )
+        return results
+
+    def graphql_mutation_batch(
+        self,
+        mutations: Sequence[tuple[str, str, dict, str]],
+        max_size: int = 25,
+        raise_errors: bool = True,
+        extra_headers: dict | None = None,
+    ) -> list[GraphQLResult]:
+        """Send many independent GraphQL mutations in as few requests as possible.
+
+        The mutations are merged into aliased documents of at most `max_size` mutations each,
+        which GitHub executes in order.
+
+        Parameters
+        ----------
+        mutations : Sequence[tuple[str, str, dict, str]]
+            Mutations to send, each as a tuple of
+            (mutation name, mutation input type name, mutation input, mutation payload),
+            corresponding to the arguments of `graphql_mutation`.
+        max_size : int, default: 25
+            Maximum number of mutations in a single document.
+        raise_errors : bool, default: True
+            Raise a `GraphQLResponseError` when the response to a document contains errors.
+            Otherwise, errors are returned in the `errors` field of the corresponding results.
+        extra_headers : dict, optional
+            Headers to add to (or override) the default headers.
+
+        Returns
+        -------
+        list[GraphQLResult]
+            The results of the mutations, in the same order as the input.
+        """
+        results = []
+        for start in range(0, len(mutations), max_size):
+            fields = []
+            variables = {}
+            aliases = []
+            for idx, (name, input_name, input_, payload) in enumerate(
+                mutations[start:start + max_size], start=start
+            ):
+                alias = f"m{idx}"
+                fields.append(f"{alias}: {name}(input:${alias}) {{{payload}}}")
+                variables[alias] = (input_, input_name, True)
+                aliases.append(alias)
+            results.extend(
+                self._graphql_batch_results(
+                    operation_type="mutation",
+                    fields=fields,
+                    variables=variables,
+                    aliases=aliases,
+                    raise_errors=raise_errors,
+                    extra_headers=extra_headers,
+                    mutation=True,
+                    operation="graphql_mutation_batch",
+                )
+            )
+        return results
+
+    def rest_query(
+        self,
+        query: str,
+        verb: Literal["GET", "POST", "PUT", "PATCH", "OPTIONS", "DELETE"] = "GET",
+        data=None,
+        json=None,
+        response_type: Literal["json", "str", "bytes"] | None = "json",
+        extra_headers: dict | None = None,
+        endpoint: Literal['api', 'upload'] = "api"
+    ):
+        response = self._request(
+            url=self._endpoint[endpoint] / query,
+            resource=self._rest_resource(query),
+            verb=verb,
+            data=data,
+            json=json,
+            extra_headers=extra_headers,
+            mutation=verb in ("POST", "PUT", "PATCH", "DELETE") and endpoint == "api",
+        )
+        value = self._response_value(response, response_type)
+        if endpoint == "api":
+            self._node_ids.record(query=query, verb=verb, json=json, value=value)
+            if self._metadata_cache and verb != "GET":
+                self._metadata_cache.record(query=query, verb=verb)
+        return value
+
+    def rest_download(
+        self,
+        query: str,
+        filepath: str | Path,
+        extra_headers: dict | None = None,
+        endpoint: Literal['api', 'upload'] = "api",
+        create_dirs: bool = True,
+        overwrite: bool = False,
+        chunk_size: int = 2 ** 16,
+        digest: str | None = None,
+    ) -> Path:
+        """Stream the response body of a REST API GET request to a file.
+
+        The body is written in chunks as it is received, so it is never held in memory as a whole.
+        It is written to a temporary file that replaces the target file only when the download is complete
+        (and verified, if `digest` is given).
+
+        Parameters
+        ----------
+        query : str
+            Query part of the URL.
+        filepath : str | pathlib.Path
+            Local path to save the response body to.
+        extra_headers : dict, optional
+            Headers to add to (or override) the default headers,
+            e.g., to request a raw media type.
+        endpoint : {'api', 'upload'}, default: 'api'
+            API endpoint to send the request to.
+        create_dirs : bool, default: True
+            Whether to create directories in the local path if they do not exist.
+        overwrite : bool, default: False
+            Whether to overwrite an existing file in the local path.
+        chunk_size : int, default: 65536
+            Number of bytes to read into memory at once.
+        digest : str, optional
+            Expected digest of the body, as '<algorithm>:<hex digest>' (e.g., 'sha256:e3b0...').
+            The chunks are hashed as they are written, and on a mismatch,
+            the downloaded data is deleted and the target file is left untouched.
+
+        Returns
+        -------
+        pathlib.Path
+            Path to the downloaded file.
+
+        Raises
+        ------
+        FileExistsError
+            If `overwrite` is False and the file already exists.
+        pylinks.exception.api.WebAPIValueError
+            If the digest of the body does not match `digest`.
+        """
+        filepath = _download_target(filepath, create_dirs=create_dirs, overwrite=overwrite)
+        algorithm, _, expected = digest.partition(":") if digest else (None, None, None)
+        hasher = hashlib.new(algorithm) if algorithm else None
+        response = self._request(
+            url=self._endpoint[endpoint] / query,
+            resource=self._rest_resource(query),
+            extra_headers=extra_headers,
+            stream=True,
+        )
+        with response, _atomic_write(filepath) as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                if hasher:
+                    hasher.update(chunk)
+            if hasher and hasher.hexdigest() != expected:
+                raise _api_exception.WebAPIValueError(
+                    response_value=f"{algorithm}:{hasher.hexdigest()}",
+                    response_verifier=lambda value: value == digest,
+                )
+        return filepath
+
+    @property
+    def authenticated(self) -> bool:
+        return self._token_pool is not None
+
+    @property
+    def rate_limits(self) -> dict[str, dict[str, dict[str, int]]]:
+        """Last known rate-limit budget of each token in the pool.
+
+        Returns
+        -------
+        dict[str, dict[str, dict[str, int]]]
+            A dictionary mapping a redacted form of each token (its last four characters)
+            to a dictionary mapping rate-limit resources (e.g., 'core', 'graphql', 'search')
+            to dictionaries with keys 'limit', 'remaining', and 'reset' (epoch seconds).
+            Resources that have not been used yet are not included.
+        """
+        return self._token_pool.snapshot() if self._token_pool else {}
+
+    @property
+    def graphql_costs(self) -> dict[str, dict[str, float]]:
+        """Cumulative rate-limit cost of GraphQL requests sent by this client, per operation.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            A dictionary mapping operation names (e.g., 'pull_commits', or the top-level field name
+            for queries sent directly via `graphql_query`) to dictionaries with keys
+            'calls' (number of requests), 'cost' (total rate-limit points as reported by GitHub),
+            and 'seconds' (total response time).
+        """
+        with self._graphql_costs_lock:
+            return {operation: dict(costs) for operation, costs in self._graphql_costs.items()}
+
+    def _graphql_query_with_cost(
+        self,
+        query: str,
+        variables: dict[str, tuple[Any, str, bool]] | None = None,
+        extra_headers: dict | None = None,
+        operation: str | None = None,
+    ) -> tuple[dict, float, float]:
+        """Send a GraphQL query and get its data, rate-limit cost (in points), and response time (in seconds)."""
+        if variables:
+            args = ", ".join(
+                f"${name}:{typ}{"!" if required else ""}" for name, (_, typ, required) in variables.items()
+            )
+            sig = f"query({args})"
+        else:
+            sig = "query"
+        if operation is None:
+            field = re.match(r"\s*(?:\w+\s*:\s*)?(\w+)", query)
+            operation = field.group(1) if field else "query"
+        return self._graphql_request(
+            query=self._graphql_document(sig, query),
+            variables={name: value for name, (value, _, _) in variables.items()} if variables else None,
+            extra_headers=extra_headers,
+            operation=operation,
+            with_cost=True,
+        )
+
+    def _graphql_request(
+        self,
+        query: str,
+        variables: dict | None = None,
+        extra_headers: dict | None = None,
+        mutation: bool = False,
+        operation: str = "query",
+        with_cost: bool = False,
+    ):
+        response, cost, seconds = self._graphql_response(
+            query=query, variables=variables, extra_headers=extra_headers, mutation=mutation, operation=operation
+        )
+        if "errors" in response or "data" not in response:
+            raise _api_exception.GraphQLResponseError(response, query)
+        return (response["data"], cost, seconds) if with_cost else response["data"]
+
+    def _graphql_response(
+        self,
+        query: str,
+        variables: dict | None = None,
+        extra_headers: dict | None = None,
+        mutation: bool = False,
+        operation: str = "query",
+    ) -> tuple[dict, float, float]:
+        """Send a GraphQL document and get the full response (including any errors),
+        its rate-limit cost (in points), and its response time (in seconds).
+
+        If the document selects the rate-limit cost (see `_graphql_document`),
+        it is removed from the response; otherwise (e.g., for mutations) the cost is taken as one point.
+        """
+        payload = {"query": query}
+        if variables is not None:
+            payload["variables"] = variables
+        start = time.perf_counter()
+        response = self._request(
+            url=self._endpoint["api"] / "graphql",
+            resource="graphql",
+            verb="POST",
+            json=payload,
+            extra_headers=extra_headers,
+            mutation=mutation,
+        ).json()
+        seconds = time.perf_counter() - start
+        rate_limit = (response.get("data") or {}).pop(_GRAPHQL_RATE_LIMIT_ALIAS, None)
+        cost = rate_limit["cost"] if rate_limit else 1
+        with self._graphql_costs_lock:
+            costs = self._graphql_costs.setdefault(operation, {"calls": 0, "cost": 0, "seconds": 0})
+            costs["calls"] += 1
+            costs["cost"] += cost
+            costs["seconds"] += seconds
+        return response, cost, seconds
+
+    @staticmethod
+    def _graphql_document(signature: str, selection: str, cost: bool = True) -> str:
+        """Compose a GraphQL document from its operation signature and top-level selection set.
+
+        Parameters
+        ----------
+        signature : str
+            Operation type and variable definitions, e.g., `'query($after:String)'`.
+        selection : str
+            Top-level fields of the operation, without the enclosing braces.
+        cost : bool, default: True
+            Whether to also select the rate-limit cost of the query
+            (under the alias `_GRAPHQL_RATE_LIMIT_ALIAS`). Not supported for mutations.
+        """
+        if cost:
+            # Separate with newlines, so that a trailing comment in the selection cannot swallow the field
+            selection = f"{selection}\n{_GRAPHQL_RATE_LIMIT_ALIAS}: rateLimit {{cost remaining resetAt}}"
+        return f"{signature} {{{selection}\n}}"
+
+    def _graphql_paginate(
+        self,
+        query: Callable[[int], str],
+        connection: Callable[[dict], dict],
+        variables: dict[str, tuple[Any, str, bool]],
+        count: int,
+        sort: Literal["first", "last"],
+        page_size: _AdaptivePageSize,
+        operation: str,
+    ) -> list[dict]:
+        """Fetch all pages of a GraphQL connection, adapting the page size after each page.
+
+        Parameters
+        ----------
+        query : Callable[[int], str]
+            Function returning the query for a given page size.
+            The query must use the variables `$after` and `$before` as cursors of the connection.
+        connection : Callable[[dict], dict]
+            Function returning the paginated connection (including its `pageInfo`) from the data of a page.
+        variables : dict[str, tuple[Any, str, bool]]
+            Variables of the query, including `after` and `before`.
+        count : int
+            Maximum number of nodes to fetch. If 0 or negative, all nodes are fetched.
+        sort : {'first', 'last'}
+            Whether the connection is paginated forwards or backwards.
+        page_size : _AdaptivePageSize
+            Page size controller.
+        operation : str
+            Name under which the cost of the requests is accounted.
+
+        Returns
+        -------
+        list[dict]
+            Data of each page.
+        """
+        pages = []
+        downloaded = 0
+        while True:
+            size = page_size.size if count <= 0 else min(page_size.size, count - downloaded)
+            data, cost, seconds = self._graphql_query_with_cost(query(size), variables, operation=operation)
+            page_size.update(cost=cost, seconds=seconds)
+            pages.append(data)
+            downloaded += size
+            page_info = connection(data)["pageInfo"]
+            if not page_info["hasNextPage" if sort == "first" else "hasPreviousPage"] or (
+                0 < count <= downloaded
+            ):
+                return pages
+            variables["after" if sort == "first" else "before"] = (
+                page_info["endCursor" if sort == "first" else "startCursor"], "String", False
+            )
+
+    def _graphql_batch_results(
+        self,
+        operation_type: Literal["query", "mutation"],
+        fields: list[str],
+        variables: dict[str, tuple[Any, str, bool]],
+        aliases: list[str],
+        raise_errors: bool,
+        extra_headers: dict | None,
+        mutation: bool,
+        operation: str,
+    ) -> list[GraphQLResult]:
+        if variables:
+            args = ", ".join(
+                f"${name}:{typ}{"!" if required else ""}" for name, (_, typ, required) in variables.items()
+            )
+            operation_type = f"{operation_type}({args})"
+        query = self._graphql_document(operation_type, " ".join(fields), cost=not mutation)
+        response, _, _ = self._graphql_response(
+            query=query,
+            variables={name: value for name, (value, _, _) in variables.items()} if variables else None,
+            extra_headers=extra_headers,
+            mutation=mutation,
+            operation=operation,
+        )
+        errors = response.get("errors", [])
+        if (raise_errors and errors) or "data" not in response:
+            raise _api_exception.GraphQLResponseError(response, query)
+        data = response["data"] or {}
+        alias_errors = {alias: [] for alias in aliases}
+        for error in errors:
+            path = error.get("path")
+            if path and path[0] in alias_errors:
+                alias_errors[path[0]].append(error)
+            else:
+                # Errors not attributable to a single selection (e.g., parse errors)
+                for alias in aliases:
+                    alias_errors[alias].append(error)
+        return [GraphQLResult(data=data.get(alias), errors=alias_errors[alias]) for alias in aliases]
+
+    @staticmethod
+    def _graphql_aliased_selection(selection: str, alias: str) -> str:
+        """Remove any existing alias from a top-level selection and prefix its variables with an alias.
+
+        Variables are only renamed outside string literals.
+        """
+        selection = re.sub(r"^\s*\w+\s*:(?=\s*\w+\s*[({])", "", selection, count=1).strip()
+        # `split` with a capturing group puts the string literals at odd indices
+        return "".join(
+            part if idx % 2 else re.sub(r"\$(\w+)", rf"${alias}_\1", part)
+            for idx, part in enumerate(_GRAPHQL_STRING.split(selection))
+        )
+
+    @staticmethod
+    def _graphql_batches(
+        selections: list[str], max_size: int, max_nodes: int, max_cost: int
+    ) -> list[list[int]]:
+        """Group selections into batches (of indices) that stay within the given limits."""
+        batches = []
+        batch = []
+        batch_nodes = batch_cost = 0
+        for idx, selection in enumerate(selections):
+            nodes, cost = _graphql_estimate(selection)
+            if batch and (
+                len(batch) >= max_size or batch_nodes + nodes > max_nodes or batch_cost + cost > max_cost
+            ):
+                batches.append(batch)
+                batch = []
+                batch_nodes = batch_cost = 0
+            batch.append(idx)
+            batch_nodes += nodes
+            batch_cost += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _request(
+        self,
+        url,
+        resource: str = "core",
+        verb: Literal["GET", "POST", "PUT", "PATCH", "OPTIONS", "DELETE"] = "GET",
+        extra_headers: dict | None = None,
+        mutation: bool = False,
+        **kwargs,
+    ) -> Response:
+        """Send an authenticated request and record the rate-limit budget of the used token.
+
+        Parameters
+        ----------
+        url : str | pylinks.url.URL
+            Full URL of the request.
+        resource : str, default: 'core'
+            Rate-limit resource the request is counted against;
+            used to select the token with the most remaining budget.
+        verb : str, default: 'GET'
+            HTTP verb of the request.
+        extra_headers : dict, optional
+            Headers to add to (or override) the default headers.
+        mutation : bool, default: False
+            Whether the request creates or modifies content,
+            in which case it is sent through the mutation queue.
+        **kwargs
+            Additional arguments passed to `pylinks.http.request`.
+        """
+        headers = self._headers | extra_headers if extra_headers else dict(self._headers)
+        token = self._token_pool.select(resource) if self._token_pool else None
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        def send():
+            if token and self._rate_limiter:
+                self._rate_limiter.acquire(token, resource)
+            try:
+                response = _pylinks.http.request(
+                    url=url, verb=verb, headers=headers, response_type=None, **kwargs
+                )
+            except _api_exception.WebAPIStatusCodeError as e:
+                self._record_rate_limit(token, e.response.headers)
+                raise
+            self._record_rate_limit(token, response.headers)
+            return response
+
+        return self._mutation_queue.submit(token or "", send) if mutation else send()
+
+    def _record_rate_limit(self, token: str | None, headers) -> None:
+        if not token:
+            return
+        self._token_pool.update(token, headers)
+        if self._rate_limiter:
+            self._rate_limiter.update(token, headers)
+        return
+
+    @staticmethod
+    def _response_value(response: Response, response_type: Literal["json", "str", "bytes"] | None):
+        if response_type is None:
+            return response
+        if response_type == "json":
+            return response.json()
+        if response_type == "str":
+            return response.text
+        if response_type == "bytes":
+            return response.content
+        raise ValueError(f"`response_type` {response_type} not recognized.")
+
+    @staticmethod
+    def _rest_resource(query: str) -> str:
+        """Get the rate-limit resource that a REST API query is counted against.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/rate-limit/rate-limit?apiVersion=2022-11-28)
+        """
+        if query.startswith("search/code"):
+            return "code_search"
+        if query.startswith("search/"):
+            return "search"
+        return "core"
+
+
+class _AdaptivePageSize:
+    """Page size of a paginated GraphQL query, adapted to a target cost and response time per page.
+
+    After each page, the page size is scaled by the ratio of the target to the measured value
+    (the smaller ratio when both targets are set), limited to halving or doubling per page.
+
+    Parameters
+    ----------
+    initial : int, default: 100
+        Initial page size.
+    minimum : int, default: 1
+        Minimum page size.
+    maximum : int, default: 100
+        Maximum page size. This is GitHub's maximum for all connections.
+    target_cost : float, optional
+        Target rate-limit cost (in points) per page.
+    target_seconds : float, optional
+        Target response time (in seconds) per page.
+    """
+
+    def __init__(
+        self,
+        initial: int = 100,
+        minimum: int = 1,
+        maximum: int = 100,
+        target_cost: float | None = None,
+        target_seconds: float | None = None,
+    ):
+        self._min = minimum
+        self._max = maximum
+        self._size = max(minimum, min(initial, maximum))
+        self._target_cost = target_cost
+        self._target_seconds = target_seconds
+        return
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def update(self, cost: float, seconds: float) -> None:
+        ratios = []
+        if self._target_cost and cost > 0:
+            ratios.append(self._target_cost / cost)
+        if self._target_seconds and seconds > 0:
+            ratios.append(self._target_seconds / seconds)
+        if not ratios:
+            return
+        ratio = max(0.5, min(min(ratios), 2))
+        self._size = max(self._min, min(round(self._size * ratio), self._max))
+        return
+
+
+class RepoSnapshot(_NamedTuple):
+    """Snapshot of a repository's metadata and settings, as returned by `Repo.snapshot`.
+
+    Except for `pages`, all data is in the format of the GraphQL API (i.e., with camelCase keys).
+
+    Attributes
+    ----------
+    info : dict
+        General information and settings of the repository,
+        with topics flattened into a list of names under the key 'topics'.
+    labels : list[dict]
+        Labels, with keys 'id', 'name', 'color', 'description', and 'isDefault'.
+    branches : list[dict]
+        Branches, with keys 'name' and 'target' (a dictionary with key 'oid').
+    tags : list[dict]
+        Tags, with keys 'name' and 'target' (a dictionary with key 'oid').
+    pages : dict | None
+        GitHub Pages site information in the format of the REST API,
+        or `None` if the repository has no Pages site or it was not requested.
+    rulesets : list[dict]
+        Rulesets (including those of parents), with keys 'id', 'databaseId', 'name', 'target', and 'enforcement'.
+    branch_protection_rules : list[dict]
+        Branch protection rules, with all fields of the 'full' preset of `Repo.branch_protection_rules`.
+    discussion_categories : list[dict]
+        Discussion categories, with all fields of the 'full' preset of `Repo.discussion_categories`.
+    """
+
+    info: dict
+    labels: list[dict]
+    branches: list[dict]
+    tags: list[dict]
+    pages: dict | None
+    rulesets: list[dict]
+    branch_protection_rules: list[dict]
+    discussion_categories: list[dict]
+
+
+class DirSyncReport(_NamedTuple):
+    """Result of `Repo.sync_dir`.
+
+    Attributes
+    ----------
+    added : list[str]
+        Relative paths of files that were downloaded because they did not exist locally.
+    updated : list[str]
+        Relative paths of files that were downloaded because their local content differed.
+    removed : list[str]
+        Relative paths of local files that do not exist in the remote directory.
+        These are deleted when `Repo.sync_dir` is called with `delete=True`.
+    unchanged : list[str]
+        Relative paths of files that were already up to date.
+    """
+
+    added: list[str]
+    updated: list[str]
+    removed: list[str]
+    unchanged: list[str]
+
+
+class LabelsApplyReport(_NamedTuple):
+    """Result of `Repo.labels_apply`.
+
+    Attributes
+    ----------
+    created : list[str]
+        Names of created labels.
+    updated : list[str]
+        Names of labels whose color or description was updated.
+    renamed : list[tuple[str, str]]
+        Labels that were renamed (and possibly updated), as tuples of (old name, new name).
+    deleted : list[str]
+        Names of deleted labels.
+    unchanged : list[str]
+        Names of labels that were already up to date.
+    failed : dict[str, Exception]
+        Names of labels whose change failed (their current names, for renamed and deleted labels),
+        mapped to the raised error. Failed changes are not included in the other fields.
+    """
+
+    created: list[str]
+    updated: list[str]
+    renamed: list[tuple[str, str]]
+    deleted: list[str]
+    unchanged: list[str]
+    failed: dict[str, Exception]
+
+
+class SettingsApplyReport(_NamedTuple):
+    """Result of `Repo.apply_settings`.
+
+    Attributes
+    ----------
+    repo : dict
+        Arguments of `Repo.repo_update` that were applied.
+    topics : list[str] | None
+        New topics of the repository, or None if they were not changed.
+    pages : dict | None
+        Arguments of `Repo.pages_update` (or `Repo.pages_create`) that were applied,
+        or None if the Pages site was not changed.
+    rulesets : dict[str, str]
+        Names of created and updated rulesets, mapped to either 'created' or 'updated'.
+    branch_protection_rules : dict[str, str]
+        Patterns of created and updated branch protection rules, mapped to either 'created' or 'updated'.
+    failed : dict[str, Exception]
+        Settings whose change failed, mapped to the raised error. Keys are 'repo', 'topics', 'pages',
+        'rulesets/{name}', and 'branch_protection_rules/{pattern}'.
+        Failed changes are not included in the other fields.
+    """
+
+    repo: dict
+    topics: list[str] | None
+    pages: dict | None
+    rulesets: dict[str, str]
+    branch_protection_rules: dict[str, str]
+    failed: dict[str, Exception]
+
+    @property
+    def changed(self) -> bool:
+        """Whether any setting was changed."""
+        return bool(
+            self.repo or self.topics is not None or self.pages is not None
+            or self.rulesets or self.branch_protection_rules
+        )
+
+
+class TriageResult(_NamedTuple):
+    """Result of a single operation of `Repo.issues_triage`.
+
+    Attributes
+    ----------
+    number : int
+        Number of the issue or pull request.
+    data : dict[str, dict | None]
+        Payloads of the sent mutations, keyed by mutation name (e.g., 'addLabelsToLabelable').
+    errors : list[dict]
+        Errors of resolving node IDs and of the mutations; empty if the operation fully succeeded.
+        When a request failed as a whole, its errors are attributed to all its items,
+        and include the raised error under the key 'exception'.
+    """
+
+    number: int
+    data: dict[str, dict | None]
+    errors: list[dict]
+
+
+class MirrorSyncReport(_NamedTuple):
+    """Result of `RepoMirror.sync`.
+
+    Attributes
+    ----------
+    issues : int
+        Number of added or updated issues and pull requests.
+    comments : int
+        Number of added or updated comments.
+    labels : int
+        Number of labels, if they were changed and thus fetched again; otherwise 0.
+    """
+
+    issues: int
+    comments: int
+    labels: int
+
+
+class ReleasePublishReport(_NamedTuple):
+    """Result of `Repo.release_publish`.
+
+    Attributes
+    ----------
+    release : dict
+        The release, as returned by the last create or update request.
+    uploaded : list[str]
+        Names of uploaded assets, including those that replaced an outdated asset.
+    skipped : list[str]
+        Names of assets that already existed with the same size and digest.
+    failed : dict[str, Exception]
+        Names of assets that could not be uploaded after all retries, mapped to the last error.
+    """
+
+    release: dict
+    uploaded: list[str]
+    skipped: list[str]
+    failed: dict[str, Exception]
+
+
+class AssetsDownloadReport(_NamedTuple):
+    """Result of `Repo.release_assets_download`.
+
+    Attributes
+    ----------
+    downloaded : list[pathlib.Path]
+        Local paths of downloaded assets.
+    skipped : list[pathlib.Path]
+        Local paths of assets that already existed with the same size and digest.
+    size : int
+        Total number of downloaded bytes.
+    duration : float
+        Wall-clock time of the downloads, in seconds.
+    """
+
+    downloaded: list[Path]
+    skipped: list[Path]
+    size: int
+    duration: float
+
+    @property
+    def throughput(self) -> float:
+        """Download throughput, in bytes per second."""
+        return self.size / self.duration if self.duration else 0.0
+
+
+class VersionIndex:
+    """Sorted index of SemVer version numbers, supporting fast (bisect) queries.
+
+    Parameters
+    ----------
+    versions : Sequence[str]
+        Version numbers of the form 'X.Y.Z', where X, Y, and Z are integers, in any order.
+    etag : str, optional
+        ETag of the response the versions were read from, used for conditional refreshes.
+    """
+
+    def __init__(self, versions: Sequence[str], etag: str | None = None):
+        self._keys = sorted(_version_key(version) for version in versions)
+        self.etag = etag
+        return
+
+    @property
+    def versions(self) -> list[str]:
+        """All version numbers, sorted in ascending order."""
+        return [".".join(map(str, key)) for key in self._keys]
+
+    def latest(self, below: str | None = None, inclusive: bool = False) -> str | None:
+        """Get the latest version, optionally below a given (possibly partial) version.
+
+        Parameters
+        ----------
+        below : str, optional
+            Upper bound, e.g., '2' or '2.0' or '2.0.0' to get the latest version before '2.0.0'.
+        inclusive : bool, default: False
+            Whether a version equal to `below` may be returned.
+
+        Returns
+        -------
+        str | None
+            The latest matching version, or None if there is none.
+        """
+        if below is None:
+            end = len(self._keys)
+        else:
+            bisector = bisect.bisect_right if inclusive else bisect.bisect_left
+            end = bisector(self._keys, _version_key(below))
+        return ".".join(map(str, self._keys[end - 1])) if end else None
+
+    def between(self, lower: str | None = None, upper: str | None = None) -> list[str]:
+        """Get all versions in a range, i.e., `lower <= version < upper`, sorted in ascending order.
+
+        Parameters
+        ----------
+        lower : str, optional
+            Inclusive lower bound (possibly partial, e.g., '1.2'). Defaults to no lower bound.
+        upper : str, optional
+            Exclusive upper bound (possibly partial, e.g., '2'). Defaults to no upper bound.
+        """
+        start = bisect.bisect_left(self._keys, _version_key(lower)) if lower else 0
+        end = bisect.bisect_left(self._keys, _version_key(upper)) if upper else len(self._keys)
+        return [".".join(map(str, key)) for key in self._keys[start:end]]
+
+    def __contains__(self, version: str) -> bool:
+        key = _version_key(version)
+        idx = bisect.bisect_left(self._keys, key)
+        return idx < len(self._keys) and self._keys[idx] == key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class CodeSearchCrawl:
+    """Lazy crawl of all results of a code search; see `GitHub.search_code_crawl`.
+
+    Iterating the crawl sends the search requests and yields the result items as pages arrive,
+    skipping items (identified by repository and path) that were already yielded.
+    The first page of a query reports its total number of results, after which its remaining pages
+    are requested concurrently. A query with more results than GitHub returns is split into
+    two sub-queries over halves of its file size range (using the `size:` qualifier), recursively.
+    All requests are paced evenly to stay within the per-minute budget of the code search API.
+
+    Attributes
+    ----------
+    total_count : int | None
+        Total number of results of the original query, as reported by GitHub; None before iteration.
+    incomplete_results : bool
+        Whether some results may be missing, either because GitHub reported incomplete results
+        (e.g., due to a timeout), or because a query still had too many results after splitting.
+    queries : list[str]
+        All queries (including sub-queries) that were sent, in the order they were submitted.
+        Sub-queries are submitted as soon as the first page of their parent query arrives,
+        so the relative order of sub-queries of different parents depends on response times.
+    """
+
+    # Time (in seconds) to wait after the first rate-limit response that does not specify a wait time;
+    # the code search rate limit is per minute.
+    _BACKOFF_INIT = 60
+
+    def __init__(
+        self,
+        github: GitHub,
+        query: str,
+        max_workers: int,
+        per_minute: float,
+        split: bool,
+        max_retries: int,
+    ):
+        self._github = github
+        self._query = query
+        self._max_workers = max_workers
+        self._pacer = _RequestPacer(per_minute)
+        self._split = split
+        self._max_retries = max_retries
+        self.total_count: int | None = None
+        self.incomplete_results = False
+        self.queries: list[str] = []
+        return
+
+    def __iter__(self):
+        seen = set()
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        futures = {executor.submit(self._fetch, self._query, 1): (self._query, None, 1)}
+        self.queries.append(self._query)
+        try:
+            while futures:
+                done, _ = _wait_futures(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query, size_range, page = futures.pop(future)
+                    response = future.result()
+                    self.incomplete_results |= response["incomplete_results"]
+                    if page == 1:
+                        if query == self._query:
+                            self.total_count = response["total_count"]
+                        for sub_query in self._sub_queries(query, size_range, response["total_count"]):
+                            futures[executor.submit(self._fetch, sub_query[0], sub_query[2])] = sub_query
+                            if sub_query[2] == 1:
+                                self.queries.append(sub_query[0])
+                    for item in response["items"]:
+                        key = (item["repository"]["full_name"], item["path"])
+                        if key not in seen:
+                            seen.add(key)
+                            yield item
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return
+
+    def _sub_queries(
+        self, query: str, size_range: tuple[int, int] | None, total_count: int
+    ) -> list[tuple[str, tuple[int, int] | None, int]]:
+        """Get the requests following the first page of a query, as (query, size range, page) tuples."""
+        if total_count > _SEARCH_RESULTS_CAP and self._split:
+            lower, upper = size_range or (0, _CODE_SEARCH_MAX_FILE_SIZE)
+            if lower < upper:
+                middle = (lower + upper) // 2
+                return [
+                    (f"{self._query} size:{start}..{end}", (start, end), 1)
+                    for start, end in ((lower, middle), (middle + 1, upper))
+                ]
+        if total_count > _SEARCH_RESULTS_CAP:
+            self.incomplete_results = True
+        last_page = -(-min(total_count, _SEARCH_RESULTS_CAP) // _SEARCH_PAGE_SIZE)
+        return [(query, size_range, page) for page in range(2, last_page + 1)]
+
+    def _fetch(self, query: str, page: int) -> dict:
+        """Get a page of search results, waiting for the pacer and retrying on rate limits."""
+        for attempt in range(self._max_retries + 1):
+            self._pacer.wait()
+            try:
+                response = self._github._request(
+                    url=self._github._endpoint["api"] / (
+                        f"search/code?q={urllib.parse.quote(query)}&per_page={_SEARCH_PAGE_SIZE}&page={page}"
+                    ),
+                    resource="code_search",
+                )
+            except _api_exception.WebAPIStatusCodeError as e:
+                delay = _rate_limit_delay(e.response, attempt, backoff_init=self._BACKOFF_INIT)
+                if delay is None or attempt == self._max_retries:
+                    raise
+                self._pacer.delay(delay)
+                continue
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                self._pacer.delay(int(response.headers.get("X-RateLimit-Reset", 0)) - time.time() + 1)
+            return response.json()
+
+
+class GraphQLResult(_NamedTuple):
+    """Result of a single query or mutation in a batched GraphQL request.
+
+    Attributes
+    ----------
+    data : dict | None
+        Data of the query or mutation, or `None` if it failed.
+    errors : list[dict]
+        Errors attributed to the query or mutation.
+    """
+
+    data: dict | None
+    errors: list[dict]
+
+
+class _TokenPool:
+    """Pool of access tokens with rate-limit budget tracking.
+
+    The budget of each token is tracked per rate-limit resource,
+    using the `X-RateLimit-*` headers of the responses.
+    Tokens whose budget for a resource is not yet known are assumed to have a full budget,
+    so that every token is tried before the budgets are compared.
+
+    References
+    ----------
+    - [GitHub API Docs](https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api?apiVersion=2022-11-28#checking-the-status-of-your-rate-limit)
+    """
+
+    def __init__(self, tokens: Sequence[str]):
+        self._tokens = list(dict.fromkeys(tokens))
+        self._budget: dict[str, dict[str, dict[str, int]]] = {token: {} for token in self._tokens}
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def tokens(self) -> list[str]:
+        return list(self._tokens)
+
+    def select(self, resource: str = "core") -> str:
+        """Get the token with the most remaining budget for a resource."""
+        if len(self._tokens) == 1:
+            return self._tokens[0]
+        now = time.time()
+        with self._lock:
+            return max(self._tokens, key=lambda token: self._remaining(token, resource, now))
+
+    def update(self, token: str, headers) -> None:
+        """Update the budget of a token from the rate-limit headers of a response."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        with self._lock:
+            self._budget[token][resource] = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": int(remaining),
+                "reset": int(headers.get("X-RateLimit-Reset", 0)),
+            }
+        return
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, int]]]:
+        with self._lock:
+            return {
+                f"...{token[-4:]}": {resource: dict(budget) for resource, budget in resources.items()}
+                for token, resources in self._budget.items()
+            }
+
+    def _remaining(self, token: str, resource: str, now: float) -> float:
+        budget = self._budget[token].get(resource)
+        if budget is None:
+            return float("inf")
+        if budget["reset"] <= now:
+            # The rate-limit window has been reset since the last response.
+            return budget["limit"]
+        return budget["remaining"]
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared between processes on the same host.
+
+    The remaining budget of each token and rate-limit resource is stored in a local JSON state file,
+    keyed by a hash of the token (tokens themselves are never written to disk).
+    The file is locked during each read-modify-write cycle,
+    so all processes using the same state file draw from a single bucket per token.
+    Each acquired request decrements the bucket,
+    and each response resets it to the true remaining budget reported by GitHub.
+    When a bucket is empty, processes wait until the rate-limit window is reset.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path, optional
+        Path to the state file.
+        Defaults to 'pylinks_github_ratelimit.json' in the system's temporary directory.
+    pace_threshold : float, default: 0.2
+        Fraction of the rate limit below which requests are paced,
+        i.e., the remaining budget is spread evenly over the time left until reset,
+        instead of being spent in a burst. Set to 0 to disable pacing.
+    reserve : int, default: 0
+        Number of requests per token and resource to keep in reserve,
+        i.e., the bucket is considered empty when this many requests remain.
+    """
+
+    def __init__(self, path: str | Path | None = None, pace_threshold: float = 0.2, reserve: int = 0):
+        self._path = Path(path) if path else Path(tempfile.gettempdir()) / "pylinks_github_ratelimit.json"
+        self._pace_threshold = pace_threshold
+        self._reserve = reserve
+        self._thread_lock = threading.Lock()
+        return
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def acquire(self, token: str, resource: str = "core") -> None:
+        """Wait until a request can be sent with a token, and count it against the shared budget."""
+        key = self._key(token, resource)
+        while True:
+            with self._state() as state:
+                now = time.time()
+                bucket = state.get(key)
+                if bucket is None or bucket["reset"] <= now:
+                    # Unknown budget or a new rate-limit window;
+                    # the next response will report the true budget.
+                    wait = 0
+                elif bucket["remaining"] <= self._reserve:
+                    wait = bucket["reset"] - now
+                elif bucket["remaining"] < bucket["limit"] * self._pace_threshold:
+                    interval = (bucket["reset"] - now) / (bucket["remaining"] - self._reserve)
+                    wait = bucket["last"] + interval - now
+                else:
+                    wait = 0
+                if wait <= 0:
+                    if bucket is not None and bucket["reset"] > now:
+                        bucket["remaining"] -= 1
+                        bucket["last"] = now
+                    return
+            time.sleep(wait)
+
+    def update(self, token: str, headers) -> None:
+        """Set the shared budget of a token from the rate-limit headers of a response."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        key = self._key(token, resource)
+        reset = int(headers.get("X-RateLimit-Reset", 0))
+        with self._state() as state:
+            bucket = state.get(key)
+            remaining = int(remaining)
+            if bucket is not None and bucket["reset"] == reset:
+                # Same window; requests acquired by other processes may still be in flight,
+                # so the reported budget may not reflect them yet.
+                remaining = min(remaining, bucket["remaining"])
+            state[key] = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": remaining,
+                "reset": reset,
+                "last": bucket["last"] if bucket else 0,
+            }
+        return
+
+    @staticmethod
+    def _key(token: str, resource: str) -> str:
+        return f"{hashlib.sha256(token.encode()).hexdigest()[:32]}:{resource}"
+
+    @contextmanager
+    def _state(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._thread_lock, open(self._path, "a+", encoding="utf-8") as file:
+            _lock_file(file)
+            try:
+                file.seek(0)
+                try:
+                    state = _json.loads(file.read() or "{}")
+                except _json.JSONDecodeError:
+                    state = {}
+                yield state
+                # Drop buckets of windows that were reset more than an hour ago.
+                cutoff = time.time() - 3600
+                state = {key: bucket for key, bucket in state.items() if bucket["reset"] > cutoff}
+                file.seek(0)
+                file.truncate()
+                _json.dump(state, file)
+                file.flush()
+            finally:
+                _unlock_file(file)
+        return
+
+
+class NodeIDCache:
+    """Cache of GraphQL node IDs of repositories, labels, users, issues, and pull requests.
+
+    The cache is filled opportunistically from every REST API response
+    that contains such objects (including nested ones, e.g., the labels of an issue),
+    and entries are invalidated when the corresponding objects are renamed, transferred, or deleted
+    through the REST API.
+    Keys are case-insensitive, as are the corresponding names on GitHub.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path, optional
+        Path to a JSON file to load the cache from (if it exists) and save it to with `save`.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self._path = Path(path) if path else None
+        self._ids: dict[str, str] = {}
+        if self._path and self._path.is_file():
+            self._ids = _json.loads(self._path.read_text())
+        self._lock = threading.Lock()
+        return
+
+    def get(self, kind: Literal["repo", "label", "user", "issue", "pull"], *key: str) -> str | None:
+        """Get a node ID from the cache.
+
+        Parameters
+        ----------
+        kind : {'repo', 'label', 'user', 'issue', 'pull'}
+            Type of the node.
+        *key : str
+            Identifiers of the node: (owner, name) for repositories, (login,) for users and organizations,
+            (owner, name, label name) for labels, and (owner, name, number) for issues and pull requests.
+        """
+        with self._lock:
+            return self._ids.get(self._key(kind, *key))
+
+    def set(self, node_id: str, kind: Literal["repo", "label", "user", "issue", "pull"], *key: str) -> None:
+        """Add a node ID to the cache; see `get` for the arguments."""
+        with self._lock:
+            self._ids[self._key(kind, *key)] = node_id
+        return
+
+    def invalidate(self, kind: Literal["repo", "label", "user", "issue", "pull"], *key: str) -> None:
+        """Remove a node ID from the cache; for repositories, also remove the IDs of their labels,
+        issues, and pull requests. See `get` for the arguments.
+        """
+        key = self._key(kind, *key)
+        with self._lock:
+            self._ids.pop(key, None)
+            if kind == "repo":
+                repo = key.removeprefix("repo:")
+                for sub_key in [k for k in self._ids if k.split(":", 1)[1].startswith(f"{repo}:")]:
+                    self._ids.pop(sub_key)
+        return
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """Save the cache to a JSON file.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path, optional
+            Path to the file. Defaults to the path given at initialization.
+        """
+        path = Path(path) if path else self._path
+        if not path:
+            raise ValueError("No path specified.")
+        with self._lock:
+            path.write_text(_json.dumps(self._ids))
+        return path
+
+    def record(self, query: str, verb: str, json: dict | None, value) -> None:
+        """Update the cache from a REST API request and its response value.
+
+        Parameters
+        ----------
+        query : str
+            Query part of the request URL.
+        verb : str
+            HTTP verb of the request.
+        json : dict, optional
+            JSON body of the request.
+        value
+            Response value of the request.
+        """
+        path = urllib.parse.unquote(query.split("?", 1)[0]).strip("/").split("/")
+        if path[0] == "repos" and len(path) >= 3:
+            repo = path[1:3]
+            if len(path) == 3 and (verb == "DELETE" or (verb == "PATCH" and "name" in (json or {}))):
+                self.invalidate("repo", *repo)
+            elif len(path) == 4 and path[3] == "transfer" and verb == "POST":
+                self.invalidate("repo", *repo)
+            elif len(path) == 5 and path[3] == "labels" and (
+                verb == "DELETE" or (verb == "PATCH" and "new_name" in (json or {}))
+            ):
+                self.invalidate("label", *repo, path[4])
+        if isinstance(value, (dict, list)):
+            with self._lock:
+                self._observe(value)
+        return
+
+    def _observe(self, value: dict | list) -> None:
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, (dict, list)):
+                    self._observe(item)
+            return
+        node_id = value.get("node_id")
+        if isinstance(node_id, str):
+            key = self._entity_key(value)
+            if key:
+                self._ids[key] = node_id
+        for item in value.values():
+            if isinstance(item, (dict, list)):
+                self._observe(item)
+        return
+
+    def _entity_key(self, entity: dict) -> str | None:
+        """Get the cache key of an object in a REST API response, if it is of a cached type."""
+        if "full_name" in entity and "owner" in entity:
+            return self._key("repo", *entity["full_name"].split("/", 1))
+        if "login" in entity and "type" in entity:
+            return self._key("user", entity["login"])
+        url = entity.get("url")
+        if not isinstance(url, str):
+            return None
+        match = re.search(r"/repos/([^/]+)/([^/]+)/(labels|issues|pulls)/([^/]+)$", url)
+        if match:
+            owner, name, kind, identifier = match.groups()
+            if kind == "labels":
+                return self._key("label", owner, name, entity.get("name", urllib.parse.unquote(identifier)))
+            if kind == "issues" and "pull_request" not in entity:
+                return self._key("issue", owner, name, identifier)
+            if kind == "pulls":
+                return self._key("pull", owner, name, identifier)
+        return None
+
+    @staticmethod
+    def _key(kind: str, *key: str) -> str:
+        return ":".join([kind, "/".join(key[:2]).lower(), *(str(part).lower() for part in key[2:])])
+
+
+class MetadataCache:
+    """Time-based cache of repository and user metadata, invalidated by mutations.
+
+    Each cached view (e.g., the information, labels, or Pages site of a repository)
+    is kept for a time-to-live, unless a REST mutation sent through the same client
+    changes it earlier; for example, creating a label only invalidates the labels of that repository,
+    while renaming or deleting a repository invalidates all its views.
+    Cached values are copied on each access, so they can be modified by callers.
+
+    Parameters
+    ----------
+    ttl : float, default: 60
+        Default time-to-live of cached views, in seconds.
+    ttls : dict[str, float], optional
+        Time-to-live of specific views, e.g., `{"info": 300, "labels": 30}`.
+        Views are named after the corresponding `Repo` and `User` properties.
+    """
+
+    # Views invalidated by mutations of repository sub-resources, as {sub-resource: views};
+    # mutations of the repository itself invalidate all views.
+    _INVALIDATES = {
+        "topics": ("info",),
+        "labels": ("labels",),
+        "pages": ("pages", "info"),
+        "rulesets": ("rulesets",),
+        "git": ("branches", "tags"),
+        "branches": ("branches", "info"),
+        # Creating or updating a release may create its tag
+        "releases": ("tags",),
+        "vulnerability-alerts": ("info",),
+        "automated-security-fixes": ("info",),
+        "private-vulnerability-reporting": ("info",),
+        "transfer": None,
+    }
+
+    def __init__(self, ttl: float = 60, ttls: dict[str, float] | None = None):
+        self._ttl = ttl
+        self._ttls = ttls or {}
+        self._entries: dict[tuple[str, str], tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        return
+
+    def get(self, scope: str, view: str, fetch: Callable[[], Any]) -> Any:
+        """Get a cached view, fetching it if it is missing or expired.
+
+        Parameters
+        ----------
+        scope : str
+            Path of the object the view belongs to, e.g., 'repos/{owner}/{name}' or 'users/{username}'.
+        view : str
+            Name of the view, optionally followed by ':' and a variant, e.g., 'rulesets:True'.
+        fetch : Callable[[], Any]
+            Function to fetch the view.
+        """
+        key = (scope.lower(), view)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[1])
+        value = fetch()
+        ttl = self._ttls.get(view.split(":", 1)[0], self._ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, scope: str, *views: str) -> None:
+        """Remove cached views (with all their variants) of an object; all views if none are given."""
+        scope = scope.lower()
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == scope]:
+                if not views or key[1].split(":", 1)[0] in views:
+                    self._entries.pop(key)
+        return
+
+    def clear(self) -> None:
+        """Remove all cached views."""
+        with self._lock:
+            self._entries.clear()
+        return
+
+    def record(self, query: str, verb: str) -> None:
+        """Invalidate the views changed by a REST API mutation.
+
+        Parameters
+        ----------
+        query : str
+            Query part of the request URL.
+        verb : str
+            HTTP verb of the request.
+        """
+        if verb == "GET":
+            return
+        path = query.split("?", 1)[0].strip("/").split("/")
+        if path[0] == "users" and len(path) >= 2:
+            self.invalidate("/".join(path[:2]))
+        elif path[0] == "user":
+            # Mutations of the authenticated user's profile
+            with self._lock:
+                for key in [key for key in self._entries if key[0].startswith("users/")]:
+                    self._entries.pop(key)
+        elif path[0] == "repos" and len(path) >= 3:
+            scope = "/".join(path[:3])
+            if len(path) == 3:
+                self.invalidate(scope)
+            elif path[3] in self._INVALIDATES:
+                views = self._INVALIDATES[path[3]]
+                if views is None:
+                    self.invalidate(scope)
+                else:
+                    self.invalidate(scope, *views)
+        return
+
+
+class MutationQueue:
+    """Ordered queue for content-creating requests, avoiding GitHub's secondary rate limits.
+
+    Requests submitted with the same token are sent one at a time, in submission order,
+    with at least `min_interval` seconds between them.
+    Requests with different tokens do not wait for each other.
+    When a request hits a secondary rate limit, it is retried after the wait time
+    requested by GitHub (or an exponentially increasing backoff time when none is given),
+    and all later requests with the same token wait as well.
+
+    Parameters
+    ----------
+    min_interval : float, default: 1
+        Minimum time (in seconds) between two requests with the same token.
+    max_retries : int, default: 5
+        Maximum number of times a request is retried after hitting a rate limit.
+    backoff_init : float, default: 60
+        Time (in seconds) to wait after the first rate-limit response
+        that does not specify a wait time. This is doubled after each retry.
+
+    References
+    ----------
+    - [GitHub API Docs](https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api?apiVersion=2022-11-28#avoid-concurrent-requests)
+    - [GitHub API Docs](https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api?apiVersion=2022-11-28#about-secondary-rate-limits)
+    """
+
+    def __init__(self, min_interval: float = 1, max_retries: int = 5, backoff_init: float = 60):
+        self._min_interval = min_interval
+        self._max_retries = max_retries
+        self._backoff_init = backoff_init
+        self._lock = threading.Lock()
+        self._slots: dict[str, dict] = {}
+        return
+
+    def submit(self, token: str, send: Callable[[], Response]) -> Response:
+        """Send a request when it is its turn, retrying on rate-limit responses.
+
+        Parameters
+        ----------
+        token : str
+            The token the request is sent with.
+        send : Callable[[], requests.Response]
+            Function sending the request.
+        """
+        with self._lock:
+            slot = self._slots.setdefault(
+                token, {"condition": threading.Condition(), "next_ticket": 0, "serving": 0, "next_time": 0}
+            )
+        condition = slot["condition"]
+        with condition:
+            ticket = slot["next_ticket"]
+            slot["next_ticket"] += 1
+            condition.wait_for(lambda: slot["serving"] == ticket)
+        try:
+            for attempt in range(self._max_retries + 1):
+                wait = slot["next_time"] - time.time()
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    return send()
+                except _api_exception.WebAPIStatusCodeError as e:
+                    delay = _rate_limit_delay(e.response, attempt, backoff_init=self._backoff_init)
+                    if delay is None or attempt == self._max_retries:
+                        raise
+                    slot["next_time"] = time.time() + delay
+                finally:
+                    slot["next_time"] = max(slot["next_time"], time.time() + self._min_interval)
+        finally:
+            with condition:
+                slot["serving"] += 1
+                condition.notify_all()
+
+
+class _RequestPacer:
+    """Thread-safe pacer spacing requests evenly to stay within a per-minute budget."""
+
+    def __init__(self, per_minute: float):
+        self._interval = 60 / per_minute
+        self._next_time = 0
+        self._lock = threading.Lock()
+        return
+
+    def wait(self) -> None:
+        """Wait until the next free slot, and reserve it."""
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_time)
+            self._next_time = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+        return
+
+    def delay(self, seconds: float) -> None:
+        """Postpone all following requests by at least the given time from now."""
+        with self._lock:
+            self._next_time = max(self._next_time, time.time() + seconds)
+        return
+
+
+class RepoMirror:
+    """Incrementally synchronized local mirror of a repository's issues, pull requests, comments, and labels.
+
+    Data is stored in a SQLite database with indexed tables, so that repeated questions
+    can be answered locally instead of re-downloading whole histories.
+    Issues (including pull requests) and issue comments are synchronized incrementally,
+    requesting only items updated since the last synchronization.
+    Synchronization requests are conditional, so unchanged data costs no rate-limit budget,
+    except for the first synchronization after a change, which re-fetches the latest items
+    (since their URL differs from the one of the previous request) to obtain a new ETag.
+    Items deleted on GitHub are not removed from the mirror.
+
+    Parameters
+    ----------
+    repo : Repo
+        Repository to mirror.
+    path : str | pathlib.Path
+        Path to the SQLite database file. It is created if it does not exist.
+        A database can hold mirrors of multiple repositories.
+
+    References
+    ----------
+    - [GitHub API Docs: Issues](https://docs.github.com/en/rest/issues/issues?apiVersion=2022-11-28#list-repository-issues)
+    - [GitHub API Docs: Comments](https://docs.github.com/en/rest/issues/comments?apiVersion=2022-11-28#list-issue-comments-for-a-repository)
+    - [GitHub API Docs: Conditional requests](https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api?apiVersion=2022-11-28#use-conditional-requests-if-appropriate)
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS issues (
+            repo TEXT NOT NULL, number INTEGER NOT NULL, is_pull INTEGER NOT NULL, state TEXT NOT NULL,
+            title TEXT, author TEXT, created_at TEXT, updated_at TEXT, closed_at TEXT, data TEXT NOT NULL,
+            PRIMARY KEY (repo, number)
+        );
+        CREATE INDEX IF NOT EXISTS issues_state ON issues (repo, is_pull, state);
+        CREATE INDEX IF NOT EXISTS issues_author ON issues (repo, author);
+        CREATE INDEX IF NOT EXISTS issues_updated_at ON issues (repo, updated_at);
+        CREATE TABLE IF NOT EXISTS issue_labels (
+            repo TEXT NOT NULL, number INTEGER NOT NULL, label TEXT NOT NULL COLLATE NOCASE,
+            PRIMARY KEY (repo, number, label)
+        );
+        CREATE INDEX IF NOT EXISTS issue_labels_label ON issue_labels (repo, label);
+        CREATE TABLE IF NOT EXISTS comments (
+            repo TEXT NOT NULL, id INTEGER NOT NULL, number INTEGER NOT NULL, author TEXT,
+            created_at TEXT, updated_at TEXT, data TEXT NOT NULL,
+            PRIMARY KEY (repo, id)
+        );
+        CREATE INDEX IF NOT EXISTS comments_number ON comments (repo, number);
+        CREATE TABLE IF NOT EXISTS labels (
+            repo TEXT NOT NULL, name TEXT NOT NULL COLLATE NOCASE, data TEXT NOT NULL,
+            PRIMARY KEY (repo, name)
+        );
+        CREATE TABLE IF NOT EXISTS sync_state (
+            repo TEXT NOT NULL, stream TEXT NOT NULL, since TEXT, etag TEXT,
+            PRIMARY KEY (repo, stream)
+        );
+    """
+
+    def __init__(self, repo: Repo, path: str | Path):
+        self._repo = repo
+        self._key = f"{repo.username}/{repo.name}".lower()
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self._SCHEMA)
+        return
+
+    def close(self) -> None:
+        self._db.close()
+        return
+
+    def __enter__(self) -> RepoMirror:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+        return
+
+    def sync(self) -> MirrorSyncReport:
+        """Fetch issues, pull requests, and comments updated since the last synchronization,
+        and all labels if they have changed.
+
+        Returns
+        -------
+        MirrorSyncReport
+            Numbers of added or updated items.
+        """
+        issues = self._sync_stream("issues", "issues?state=all&sort=updated&direction=asc")
+        with self._db:
+            self._store_issues(issues)
+        comments = self._sync_stream("comments", "issues/comments?sort=updated&direction=asc")
+        with self._db:
+            self._store_comments(comments)
+        labels = self._sync_stream("labels", "labels", incremental=False)
+        if labels is not None:
+            with self._db:
+                self._db.execute("DELETE FROM labels WHERE repo = ?", (self._key,))
+                self._store_labels(labels)
+        return MirrorSyncReport(issues=len(issues), comments=len(comments), labels=len(labels or []))
+
+    def ingest(self, event: str, payload: dict) -> bool:
+        """Update the mirror from a webhook payload, without any API requests.
+
+        Supported events are 'issues', 'pull_request', 'issue_comment', and 'label';
+        payloads of other events, or of other repositories, are ignored.
+
+        Parameters
+        ----------
+        event : str
+            Name of the event, i.e., the value of the 'X-GitHub-Event' header.
+        payload : dict
+            Webhook payload.
+
+        Returns
+        -------
+        bool
+            Whether the mirror was changed.
+
+        References
+        ----------
+        - [GitHub Docs: Webhook events and payloads](https://docs.github.com/en/webhooks/webhook-events-and-payloads)
+        """
+        if (payload.get("repository") or {}).get("full_name", "").lower() != self._key:
+            return False
+        action = payload.get("action")
+        with self._db:
+            if event == "issues":
+                issue = payload["issue"]
+                if action in ("deleted", "transferred"):
+                    self._db.execute("DELETE FROM issues WHERE repo = ? AND number = ?", (self._key, issue["number"]))
+                    self._db.execute(
+                        "DELETE FROM issue_labels WHERE repo = ? AND number = ?", (self._key, issue["number"])
+                    )
+                else:
+                    self._store_issues([issue])
+            elif event == "pull_request":
+                pull = payload["pull_request"]
+                # Store pull requests in the shape returned by the Issues API, as done by `sync`
+                issue = self.issue(pull["number"]) or {"pull_request": {}}
+                for key in (
+                    "id", "node_id", "number", "title", "body", "state", "locked", "user", "labels",
+                    "assignees", "milestone", "created_at", "updated_at", "closed_at", "html_url",
+                ):
+                    if key in pull:
+                        issue[key] = pull[key]
+                issue["pull_request"] |= {
+                    "url": pull.get("url"),
+                    "html_url": pull.get("html_url"),
+                    "diff_url": pull.get("diff_url"),
+                    "patch_url": pull.get("patch_url"),
+                    "merged_at": pull.get("merged_at"),
+                }
+                self._store_issues([issue])
+            elif event == "issue_comment":
+                comment = payload["comment"]
+                if action == "deleted":
+                    self._db.execute("DELETE FROM comments WHERE repo = ? AND id = ?", (self._key, comment["id"]))
+                else:
+                    self._store_comments([comment])
+            elif event == "label":
+                label = payload["label"]
+                old_name = ((payload.get("changes") or {}).get("name") or {}).get("from")
+                name = old_name or label["name"]
+                if action == "deleted" or old_name:
+                    self._db.execute("DELETE FROM labels WHERE repo = ? AND name = ?", (self._key, name))
+                if action != "deleted":
+                    self._store_labels([label])
+                if action in ("edited", "deleted"):
+                    self._update_issue_labels(name=name, label=None if action == "deleted" else label)
+            else:
+                return False
+        return True
+
+    def issues(
+        self,
+        state: Literal["open", "closed"] | None = None,
+        pulls: bool | None = None,
+        label: str | None = None,
+        author: str | None = None,
+        updated_since: str | None = None,
     ) -> list[dict]:
-        """
-        Get a list of commits for a pull request.
+        """Query mirrored issues and pull requests, sorted by number.
 
         Parameters
         ----------
-        number : int
-            Pull request number.
+        state : {'open', 'closed'}, optional
+            Only return items with this state.
+        pulls : bool, optional
+            Only return pull requests (True) or issues (False). By default, both are returned.
+        label : str, optional
+            Only return items with this label (case-insensitive).
+        author : str, optional
+            Only return items created by this user.
+        updated_since : str, optional
+            Only return items updated at or after this ISO 8601 timestamp, e.g., '2024-01-01T00:00:00Z'.
 
         Returns
         -------
         list[dict]
-            A list of commits as dictionaries.
-            Commits are ordered by ascending commit date.
-
-        References
-        ----------
-        - [GitHub API Docs](https://docs.github.com/en/rest/pulls/commits?apiVersion=2022-11-28#list-commits-on-a-pull-request)
+            Items as returned by the REST API.
         """
+        conditions = ["issues.repo = ?"]
+        params = [self._key]
+        for column, value in (("state", state), ("is_pull", pulls), ("author", author)):
+            if value is not None:
+                conditions.append(f"issues.{column} = ?")
+                params.append(value)
+        if updated_since:
+            conditions.append("issues.updated_at >= ?")
+            params.append(updated_since)
+        join = ""
+        if label:
+            join = "JOIN issue_labels ON issue_labels.repo = issues.repo AND issue_labels.number = issues.number"
+            conditions.append("issue_labels.label = ?")
+            params.append(label)
+        rows = self._db.execute(
+            f"SELECT issues.data FROM issues {join} WHERE {' AND '.join(conditions)} ORDER BY issues.number",
+            params,
+        )
+        return [_json.loads(data) for data, in rows]
+
+    def issue(self, number: int) -> dict | None:
+        """Get a mirrored issue or pull request by its number."""
+        row = self._db.execute(
+            "SELECT data FROM issues WHERE repo = ? AND number = ?", (self._key, number)
+        ).fetchone()
+        return _json.loads(row[0]) if row else None
+
+    def comments(self, number: int) -> list[dict]:
+        """Get the mirrored comments of an issue or pull request, sorted by creation time."""
+        rows = self._db.execute(
+            "SELECT data FROM comments WHERE repo = ? AND number = ? ORDER BY created_at, id", (self._key, number)
+        )
+        return [_json.loads(data) for data, in rows]
 
-        def make_query():
-            response = self.graphql_query(
-                query=f'{search_sig} {{{page_info_fields} {payload}}}',
-                variables=variables,
-            )["search"]
-            page_info = response.pop("pageInfo")
-            return page_info, response
+    def labels(self) -> list[dict]:
+        """Get the mirrored labels of the repository, sorted by name."""
+        rows = self._db.execute("SELECT data FROM labels WHERE repo = ? ORDER BY name", (self._key,))
+        return [_json.loads(data) for data, in rows]
+
+    def _store_issues(self, issues: list[dict]) -> None:
+        for issue in issues:
+            self._db.execute(
+                "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key, issue["number"], "pull_request" in issue, issue["state"], issue["title"],
+                    (issue.get("user") or {}).get("login"), issue["created_at"], issue["updated_at"],
+                    issue["closed_at"], _json.dumps(issue),
+                ),
+            )
+            self._db.execute(
+                "DELETE FROM issue_labels WHERE repo = ? AND number = ?", (self._key, issue["number"])
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO issue_labels VALUES (?, ?, ?)",
+                [(self._key, issue["number"], label["name"]) for label in issue.get("labels", [])],
+            )
+        return
 
-        search_args = [f'query: "{query}"', f"type: {search_type.upper()}", "after: $after", "before: $before", f"{sort}: {100 if count <= 0 else min(count, 100)}"]
-        page_info_fields = "pageInfo {startCursor, endCursor, hasNextPage, hasPreviousPage}"
-        search_sig = f"search({", ".join(search_args)})"
-        variables = {
-            "after": (cursor_after, "String", False),
-            "before": (cursor_before, "String", False),
-        }
-        page_info, data = make_query()
-        out = [data]
-        total_downloaded = 100
-        while True:
-            if count <= 0:
-                must_continue = page_info["hasNextPage" if sort == "first" else "hasPreviousPage"]
-                if not must_continue:
-                    return out
-            elif total_downloaded >= count:
-                return out
-            else:
-                variables["after" if sort == "first" else "before"] = (page_info["endCursor" if sort == "first" else "startCursor"], "String", False)
-                page_info, data = make_query()
-                out.append(data)
-                total_downloaded += 100
+    def _update_issue_labels(self, name: str, label: dict | None) -> None:
+        """Replace a label with its new data (or remove it, when `label` is None) in all mirrored issues.
 
-    def graphql_query(
-        self,
-        query: str,
-        variables: dict[str, tuple[Any, str, bool]] | None = None,
-        extra_headers: dict | None = None,
-    ) -> dict:
-        headers = self._headers | extra_headers if extra_headers else self._headers
-        if variables:
-            args = ", ".join(
-                f"${name}:{typ}{"!" if required else ""}" for name, (_, typ, required) in variables.items()
+        GitHub does not send events for the issues of a renamed, edited, or deleted label,
+        so both the label index and the stored issue payloads are updated here.
+        """
+        rows = self._db.execute(
+            "SELECT issues.number, issues.data FROM issues JOIN issue_labels "
+            "ON issue_labels.repo = issues.repo AND issue_labels.number = issues.number "
+            "WHERE issues.repo = ? AND issue_labels.label = ?",
+            (self._key, name),
+        ).fetchall()
+        for number, data in rows:
+            issue = _json.loads(data)
+            issue["labels"] = [
+                issue_label if issue_label["name"].lower() != name.lower() else issue_label | label
+                for issue_label in issue.get("labels", [])
+                if label or issue_label["name"].lower() != name.lower()
+            ]
+            self._db.execute(
+                "UPDATE issues SET data = ? WHERE repo = ? AND number = ?", (_json.dumps(issue), self._key, number)
+            )
+        if label:
+            self._db.execute(
+                "UPDATE issue_labels SET label = ? WHERE repo = ? AND label = ?", (label["name"], self._key, name)
             )
-            sig = f"query({args})"
         else:
-            sig = "query"
-        response = _pylinks.http.graphql_query(
-            url=self._endpoint["api"] / "graphql",
-            query=f"{sig} {{{query}}}",
-            headers=headers,
-            variables={name: value for name, (value, _, _) in variables.items()} if variables else None
-        )
-        return response
+            self._db.execute("DELETE FROM issue_labels WHERE repo = ? AND label = ?", (self._key, name))
+        return
 
-    def graphql_mutation(
-        self, mutation_name: str,
-        mutation_input_name: str,
-        mutation_input: dict,
-        mutation_payload: str,
-        extra_headers: dict | None = None,
-    ):
-        headers = self._headers | extra_headers if extra_headers else self._headers
-        query = (
-            f'mutation($mutationInput:{mutation_input_name}!) '
-            f'{{{mutation_name}(input:$mutationInput) {{{mutation_payload}}}}}'
-        )
-        response = _pylinks.http.graphql_query(
-            url=self._endpoint["api"] / "graphql",
-            query=query,
-            variables={"mutationInput": mutation_input},
-            headers=headers,
+    def _store_comments(self, comments: list[dict]) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO comments VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    self._key, comment["id"], int(comment["issue_url"].rsplit("/", 1)[1]),
+                    (comment.get("user") or {}).get("login"), comment["created_at"], comment["updated_at"],
+                    _json.dumps(comment),
+                ) for comment in comments
+            ],
         )
-        return response
+        return
 
-    def rest_query(
-        self,
-        query: str,
-        verb: Literal["GET", "POST", "PUT", "PATCH", "OPTIONS", "DELETE"] = "GET",
-        data=None,
-        json=None,
-        response_type: Literal["json", "str", "bytes"] | None = "json",
-        extra_headers: dict | None = None,
-        endpoint: Literal['api', 'upload'] = "api"
-    ):
-        headers = self._headers | extra_headers if extra_headers else self._headers
-        return _pylinks.http.request(
-            verb=verb,
-            url=self._endpoint[endpoint] / query,
-            headers=headers,
-            data=data,
-            json=json,
-            response_type=response_type
+    def _store_labels(self, labels: list[dict]) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO labels VALUES (?, ?, ?)",
+            [(self._key, label["name"], _json.dumps(label)) for label in labels],
         )
+        return
 
-    @property
-    def authenticated(self) -> bool:
-        return self._token is not None
+    def _sync_stream(self, stream: str, query: str, incremental: bool = True) -> list[dict] | None:
+        """Fetch all pages of a list endpoint, only requesting items updated since the last synchronization.
+
+        The first page is requested conditionally; when it is unchanged (304),
+        nothing is fetched and an empty list (or None, when not `incremental`) is returned.
+        An ETag is only valid for the URL it was returned for, so it is only stored
+        when the next synchronization requests the same URL, i.e., when `since` has not advanced.
+        Therefore, after items have changed, the next synchronization is unconditional
+        and re-fetches the latest item(s) to obtain a new ETag; only the ones after it can be free.
+        """
+        row = self._db.execute(
+            "SELECT since, etag FROM sync_state WHERE repo = ? AND stream = ?", (self._key, stream)
+        ).fetchone()
+        since, etag = row or (None, None)
+        previous_since = since
+        if incremental and since:
+            query = f"{query}&since={since}"
+        separator = "&" if "?" in query else "?"
+        items = []
+        page = 1
+        while True:
+            response = self._repo._github._request(
+                url=self._repo._github._endpoint["api"]
+                / f"repos/{self._repo.username}/{self._repo.name}/{query}{separator}per_page=100&page={page}",
+                extra_headers={"If-None-Match": etag} if page == 1 and etag else None,
+            )
+            if response.status_code == 304:
+                return [] if incremental else None
+            if page == 1:
+                first_etag = response.headers.get("ETag")
+            response_items = response.json()
+            items.extend(response_items)
+            if len(response_items) < 100:
+                break
+            page += 1
+        if incremental and items:
+            # `since` is inclusive, so the latest item is fetched again on the next synchronization,
+            # which keeps items updated within the same second from being missed.
+            since = max(item["updated_at"] for item in items)
+        if since != previous_since:
+            # The ETag belongs to the URL with the previous `since`, which is not requested again
+            first_etag = None
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)", (self._key, stream, since, first_etag)
+            )
+        return items
+
+
+class _UploadStream:
+    """Iterable over the chunks of a file, with a known length, to stream it as a request body.
+
+    Each iteration reads the file from the start, so that retried requests send the whole file again.
+    The SHA-256 digest of the file is available as `sha256` after a full iteration.
+    """
+
+    def __init__(self, filepath: Path, chunk_size: int, progress: Callable[[int, int], None] | None = None):
+        self._filepath = filepath
+        self._size = filepath.stat().st_size
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self.sha256: str | None = None
+        return
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        digest = hashlib.sha256()
+        read = 0
+        with open(self._filepath, "rb") as f:
+            while chunk := f.read(self._chunk_size):
+                digest.update(chunk)
+                read += len(chunk)
+                if self._progress:
+                    self._progress(read, self._size)
+                yield chunk
+        self.sha256 = digest.hexdigest()
+        return
 
 
 class User:
-    def __init__(self, username: str, token: Optional[str] = None, timezone: str | None = "UTC"):
+    """Handle to a GitHub user or organization.
+
+    Handles are lightweight: they only hold the username and a reference to the client
+    they were created from, and share its token pool, rate limiter, mutation queue, and caches.
+
+    Parameters
+    ----------
+    username : str
+        Username of the user or organization.
+    token : str, optional
+        Access token of a new client to create for the handle; ignored if `github` is given.
+    timezone : str, optional, default: 'UTC'
+        Timezone of a new client to create for the handle; ignored if `github` is given.
+    github : GitHub, optional
+        Client to send requests with. If not given, a new client is created with `token` and `timezone`.
+    """
+
+    __slots__ = ("_username", "_github")
+
+    def __init__(
+        self,
+        username: str,
+        token: str | None = None,
+        timezone: str | None = "UTC",
+        github: GitHub | None = None,
+    ):
         self._username = username
-        self._token = token
-        self._github = GitHub(token, timezone=timezone)
+        self._github = github if github is not None else GitHub(token, timezone=timezone)
         return
 
     def _rest_query(
@@ -220,22 +2789,54 @@ class User:
 
     @property
     def info(self) -> dict:
-        return self._rest_query()
+        return self._cached("info", self._rest_query)
 
     @property
     def social_accounts(self) -> dict:
-        return self._rest_query(f"social_accounts")
+        return self._cached("social_accounts", lambda: self._rest_query(f"social_accounts"))
+
+    def _cached(self, view: str, fetch: Callable[[], Any]) -> Any:
+        cache = self._github._metadata_cache
+        return cache.get(f"users/{self._username}", view, fetch) if cache else fetch()
 
     def repo(self, repo_name) -> "Repo":
-        return Repo(username=self.username, name=repo_name, token=self._token)
+        return Repo(username=self.username, name=repo_name, github=self._github)
 
 
 class Repo:
-    def __init__(self, username: str, name: str, token: Optional[str] = None, timezone: str | None = "UTC"):
+    """Handle to a GitHub repository.
+
+    Handles are lightweight: they only hold the owner and name of the repository
+    and a reference to the client they were created from,
+    and share its token pool, rate limiter, mutation queue, and caches.
+
+    Parameters
+    ----------
+    username : str
+        Username of the repository owner.
+    name : str
+        Name of the repository.
+    token : str, optional
+        Access token of a new client to create for the handle; ignored if `github` is given.
+    timezone : str, optional, default: 'UTC'
+        Timezone of a new client to create for the handle; ignored if `github` is given.
+    github : GitHub, optional
+        Client to send requests with. If not given, a new client is created with `token` and `timezone`.
+    """
+
+    __slots__ = ("_username", "_name", "_github")
+
+    def __init__(
+        self,
+        username: str,
+        name: str,
+        token: str | None = None,
+        timezone: str | None = "UTC",
+        github: GitHub | None = None,
+    ):
         self._username = username
         self._name = name
-        self._token = token
-        self._github = GitHub(token, timezone=timezone)
+        self._github = github if github is not None else GitHub(token, timezone=timezone)
         return
 
     def _rest_query(
@@ -264,13 +2865,28 @@ class Repo:
         payload: str,
         variables: dict[str, tuple[Any, str, bool]] | None = None,
         extra_headers: dict | None = None,
+        operation: str | None = None,
     ) -> dict:
         return self._github.graphql_query(
-            query=f'repository(name: "{self._name}", owner: "{self._username}") {{{payload}}}',
+            query=self._graphql_selection(payload),
             variables=variables,
             extra_headers=extra_headers,
+            operation=operation,
         )["repository"]
 
+    def _graphql_selection(self, payload: str) -> str:
+        return f'repository(name: "{self._name}", owner: "{self._username}") {{{payload}}}'
+
+    def _cached(self, view: str, fetch: Callable[[], Any]) -> Any:
+        cache = self._github._metadata_cache
+        return cache.get(f"repos/{self._username}/{self._name}", view, fetch) if cache else fetch()
+
+    def _invalidate(self, *views: str) -> None:
+        cache = self._github._metadata_cache
+        if cache:
+            cache.invalidate(f"repos/{self._username}/{self._name}", *views)
+        return
+
     @property
     def username(self) -> str:
         return self._username
@@ -279,9 +2895,61 @@ class Repo:
     def name(self) -> str:
         return self._name
 
+    @property
+    def node_id(self) -> str:
+        """Node ID of the repository, from the client's node-ID cache if available."""
+        return self._github._cached_node_id(
+            key=("repo", self._username, self._name),
+            selection=self._graphql_selection("id"),
+            path=("repository",),
+        )
+
+    def label_node_id(self, name: str) -> str:
+        """Get the node ID of a label, from the client's node-ID cache if available.
+
+        Parameters
+        ----------
+        name : str
+            Name of the label.
+        """
+        return self._github._cached_node_id(
+            key=("label", self._username, self._name, name),
+            selection=self._graphql_selection("label(name: $name) {id}"),
+            variables={"name": (name, "String", True)},
+            path=("repository", "label"),
+        )
+
+    def issue_node_id(self, number: int) -> str:
+        """Get the node ID of an issue, from the client's node-ID cache if available.
+
+        Parameters
+        ----------
+        number : int
+            Issue number.
+        """
+        return self._github._cached_node_id(
+            key=("issue", self._username, self._name, str(number)),
+            selection=self._graphql_selection(f"issue(number: {int(number)}) {{id}}"),
+            path=("repository", "issue"),
+        )
+
+    def pull_node_id(self, number: int) -> str:
+        """Get the node ID of a pull request, from the client's node-ID cache if available.
+
+        Parameters
+        ----------
+        number : int
+            Pull request number.
+        """
+        return self._github._cached_node_id(
+            key=("pull", self._username, self._name, str(number)),
+            selection=self._graphql_selection(f"pullRequest(number: {int(number)}) {{id}}"),
+            path=("repository", "pullRequest"),
+        )
+
     @property
     def info(self) -> dict:
-        return self._rest_query()
+        return self._cached("info", self._rest_query)
 
     @property
     def branches(self) -> list[dict]:
@@ -292,19 +2960,23 @@ class Repo:
         ----------
         - [GitHub API Docs](https://docs.github.com/en/rest/branches/branches?apiVersion=2022-11-28#list-branches)
         """
-        branches = []
-        page = 1
-        while True:
-            response = self._rest_query(f"branches?per_page=100&page={page}")
-            branches.extend(response)
-            page += 1
-            if len(response) < 100:
-                break
-        return branches
+
+        def fetch():
+            branches = []
+            page = 1
+            while True:
+                response = self._rest_query(f"branches?per_page=100&page={page}")
+                branches.extend(response)
+                page += 1
+                if len(response) < 100:
+                    break
+            return branches
+
+        return self._cached("branches", fetch)
 
     @property
     def tags(self) -> list[dict]:
-        return self._rest_query(f"git/refs/tags")
+        return self._cached("tags", lambda: self._rest_query(f"git/refs/tags"))
 
     @property
     def info_pages(self) -> dict:
@@ -319,7 +2991,7 @@ class Repo:
         ----------
         - [GitHub Docs](https://docs.github.com/en/free-pro-team@latest/rest/pages/pages?apiVersion=2022-11-28#create-a-github-pages-site)
         """
-        return self._rest_query("pages")
+        return self._cached("pages", lambda: self._rest_query("pages"))
 
     @property
     def labels(self) -> list[dict]:
@@ -342,15 +3014,19 @@ class Repo:
         ----------
         - [GitHub Docs](https://docs.github.com/en/rest/issues/labels?apiVersion=2022-11-28#list-labels-for-a-repository)
         """
-        labels = []
-        page = 1
-        while True:
-            response = self._rest_query(f"labels?per_page=100&page={page}")
-            labels.extend(response)
-            page += 1
-            if len(response) < 100:
-                break
-        return labels
+
+        def fetch():
+            labels = []
+            page = 1
+            while True:
+                response = self._rest_query(f"labels?per_page=100&page={page}")
+                labels.extend(response)
+                page += 1
+                if len(response) < 100:
+                    break
+            return labels
+
+        return self._cached("labels", fetch)
 
     @property
     def pages(self) -> dict:
@@ -365,7 +3041,21 @@ class Repo:
         ----------
         - [GitHub Docs](https://docs.github.com/en/free-pro-team@latest/rest/pages/pages?apiVersion=2022-11-28#get-a-github-pages-site)
         """
-        return self._rest_query("pages")
+        return self._cached("pages", lambda: self._rest_query("pages"))
+
+    def snapshot(self, pages: bool = True) -> RepoSnapshot:
+        """Get information, labels, branches, tags, Pages site, rulesets,
+        branch protection rules, and discussion categories of the repository at once.
+
+        All data except the Pages site information is fetched in a single GraphQL query,
+        plus one follow-up query per additional page of any connection with more than 100 items.
+
+        Parameters
+        ----------
+        pages : bool, default: True
+            Whether to also fetch the GitHub Pages site information with a REST request.
+        """
+        return self._github.repo_snapshots([(self._username, self._name)], pages=pages)[0]
 
     def tag_names(self, pattern: Optional[str] = None) -> list[str | tuple[str, ...]]:
         tags = [tag['ref'].removeprefix("refs/tags/") for tag in self.tags]
@@ -379,8 +3069,40 @@ class Repo:
                 hits.append(match.groups() or tag)
         return hits
 
-    def content(self, path: str = "", ref: str = None) -> dict:
-        return self._rest_query(f"contents/{path.removesuffix('/')}{f'?ref={ref}' if ref else ''}")
+    def content(self, path: str = "", ref: str = None, raw: bool = False) -> dict | list[dict] | bytes:
+        """Get the content of a file or directory in the repository.
+
+        Parameters
+        ----------
+        path : str, default: ""
+            Path to the file or directory in the repository. Defaults to the root directory.
+        ref : str, optional
+            The name of the commit/branch/tag. Defaults to the default branch of the repository.
+        raw : bool, default: False
+            Return the decoded bytes of the file, fetched with the raw media type,
+            instead of the JSON metadata with base64-encoded content.
+            This avoids base64-decoding the payload in memory,
+            and also works for files larger than 1 MB (up to 100 MB).
+
+        Returns
+        -------
+        dict | list[dict] | bytes
+            The file's raw content when `raw` is True,
+            otherwise the metadata of the file (dict) or of the directory entries (list).
+
+        Raises
+        ------
+        ValueError
+            If `raw` is True and `path` is not a file.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#get-repository-content)
+        """
+        if not raw:
+            return self._rest_query(self._content_query(path=path, ref=ref))
+        with self._raw_content_response(path=path, ref=ref) as response:
+            return response.content
 
     # def download_content(
     #     self,
@@ -426,6 +3148,40 @@ class Repo:
     #     download(self.content(path=path, ref=ref))
     #     return final_download_paths
 
+    def contents_many(
+        self, paths: Sequence[str], ref: Optional[str] = None, max_size: int = 100, max_workers: int = 8
+    ) -> dict[str, str | bytes | None]:
+        """Get the contents of many files in the repository in as few requests as possible.
+
+        This is much faster than calling `content` for each file,
+        as the text of all files is fetched in batched GraphQL queries;
+        see `GitHub.contents_many` for details.
+
+        Parameters
+        ----------
+        paths : Sequence[str]
+            Paths to the files in the repository.
+        ref : str, optional
+            The name of the commit/branch/tag. Defaults to the default branch of the repository.
+        max_size : int, default: 100
+            Maximum number of files in a single GraphQL query.
+        max_workers : int, default: 8
+            Maximum number of concurrent REST requests for binary or oversized files.
+
+        Returns
+        -------
+        dict[str, str | bytes | None]
+            Mapping of paths to their contents:
+            text (str) for text files, raw bytes for binary files,
+            and None for paths that do not exist or are not files.
+        """
+        contents = self._github.contents_many(
+            [(self._username, self._name, ref, path) for path in paths],
+            max_size=max_size,
+            max_workers=max_workers,
+        )
+        return dict(zip(paths, contents))
+
     def download_dir(
         self,
         path: str = "",
@@ -433,7 +3189,53 @@ class Repo:
         recursive: bool = True,
         download_path: str | Path = ".",
         create_dirs: bool = True,
+        overwrite: bool = False,
+        strategy: Literal["contents", "tree", "archive"] = "contents",
+        max_workers: int = 8,
     ) -> list[Path]:
+        """Download the files in a directory of the repository.
+
+        Parameters
+        ----------
+        path : str, default: ""
+            Path to the directory in the repository. Defaults to the root directory.
+        ref : str, optional
+            The name of the commit/branch/tag. Defaults to the default branch of the repository.
+        recursive : bool, default: True
+            Whether to also download files in subdirectories.
+        download_path : str | pathlib.Path, default: "."
+            Local directory to download the files to.
+        create_dirs : bool, default: True
+            Whether to create local directories if they do not exist.
+        overwrite : bool, default: False
+            Whether to overwrite existing local files.
+        strategy : {'contents', 'tree', 'archive'}, default: 'contents'
+            How to list and download the files:
+            - 'contents': List each directory with one Contents API request,
+              and download files one by one directly into `download_path`
+              (i.e., files in subdirectories are not placed in corresponding local subdirectories).
+            - 'tree': List the whole directory tree with a single Git Trees API request,
+              and download files concurrently, keeping their paths relative to `path`.
+            - 'archive': Stream the tarball of the whole repository in a single request,
+              and extract only the regular files under `path` on the fly,
+              keeping their paths relative to `path`.
+              The archive is never written to disk or held in memory as a whole.
+              This is the fastest option for large directories.
+        max_workers : int, default: 8
+            Maximum number of concurrent downloads when `strategy` is 'tree'.
+
+        Returns
+        -------
+        list[pathlib.Path]
+            Paths to the downloaded files.
+
+        References
+        ----------
+        - [GitHub API Docs: Contents](https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#get-repository-content)
+        - [GitHub API Docs: Trees](https://docs.github.com/en/rest/git/trees?apiVersion=2022-11-28#get-a-tree)
+        - [GitHub API Docs: Blobs](https://docs.github.com/en/rest/git/blobs?apiVersion=2022-11-28#get-a-blob)
+        - [GitHub API Docs: Archives](https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#download-a-repository-archive-tar)
+        """
 
         def download(content):
             if isinstance(content, dict):
@@ -446,7 +3248,10 @@ class Repo:
                     filename = Path(entry["path"]).name
                     full_download_path = download_path / filename
                     _pylinks.http.download(
-                        url=entry["download_url"], filepath=full_download_path, create_dirs=create_dirs
+                        url=entry["download_url"],
+                        filepath=full_download_path,
+                        create_dirs=create_dirs,
+                        overwrite=overwrite,
                     )
                     final_download_paths.append(full_download_path)
                 elif entry["type"] == "dir" and recursive:
@@ -454,6 +3259,28 @@ class Repo:
             return
 
         download_path = Path(download_path).resolve()
+        if strategy == "tree":
+            blobs = self.tree_blobs(path=path, ref=ref, recursive=recursive)
+            if not blobs and path:
+                raise ValueError(f"Expected a non-empty directory, but found nothing at '{path}'.")
+            return self._download_blobs(
+                blobs=blobs,
+                download_path=download_path,
+                create_dirs=create_dirs,
+                overwrite=overwrite,
+                max_workers=max_workers,
+            )
+        if strategy == "archive":
+            return self._download_archive(
+                path=path,
+                ref=ref,
+                recursive=recursive,
+                download_path=download_path,
+                create_dirs=create_dirs,
+                overwrite=overwrite,
+            )
+        if strategy != "contents":
+            raise ValueError(f"Invalid strategy: {strategy}")
         final_download_paths = []
         dir_content = self.content(path=path, ref=ref)
         if not isinstance(dir_content, list):
@@ -461,6 +3288,239 @@ class Repo:
         download(dir_content)
         return final_download_paths
 
+    def sync_dir(
+        self,
+        path: str = "",
+        ref: Optional[str] = None,
+        download_path: str | Path = ".",
+        delete: bool = False,
+        max_workers: int = 8,
+        index_filename: str = ".pylinks-sync.json",
+    ) -> DirSyncReport:
+        """Incrementally synchronize a local directory with a directory of the repository.
+
+        The remote directory is listed with the Git Trees API (see `tree_blobs`),
+        and compared with the git blob hashes of the local files.
+        Only added or changed files are downloaded (concurrently), keeping their paths relative to `path`.
+        Local blob hashes are cached in an index file inside `download_path`,
+        and only recomputed for files whose size or modification time has changed.
+
+        Parameters
+        ----------
+        path : str, default: ""
+            Path to the directory in the repository. Defaults to the root directory.
+        ref : str, optional
+            The name of the commit/branch/tag. Defaults to the default branch of the repository.
+        download_path : str | pathlib.Path, default: "."
+            Local directory to synchronize.
+        delete : bool, default: False
+            Whether to delete local files that do not exist in the remote directory.
+        max_workers : int, default: 8
+            Maximum number of concurrent downloads.
+        index_filename : str, default: ".pylinks-sync.json"
+            Name of the index file caching the blob hashes of local files.
+
+        Returns
+        -------
+        DirSyncReport
+            Relative paths of added, updated, removed, and unchanged files.
+        """
+        download_path = Path(download_path).resolve()
+        download_path.mkdir(parents=True, exist_ok=True)
+        index_path = download_path / index_filename
+        index = _json.loads(index_path.read_text()) if index_path.is_file() else {}
+        local = {}
+        new_index = {}
+        for filepath in download_path.rglob("*"):
+            if filepath == index_path or not filepath.is_file() or filepath.is_symlink():
+                continue
+            rel_path = filepath.relative_to(download_path).as_posix()
+            stat = filepath.stat()
+            cached = index.get(rel_path)
+            if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+                sha = cached["sha"]
+            else:
+                sha = _git_blob_hash(filepath)
+            local[rel_path] = sha
+            new_index[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha": sha}
+        remote = {blob["path"]: blob for blob in self.tree_blobs(path=path, ref=ref, recursive=True)}
+        added = [rel_path for rel_path in remote if rel_path not in local]
+        updated = [rel_path for rel_path in remote if rel_path in local and local[rel_path] != remote[rel_path]["sha"]]
+        unchanged = [rel_path for rel_path in remote if local.get(rel_path) == remote[rel_path]["sha"]]
+        removed = [rel_path for rel_path in local if rel_path not in remote]
+        self._download_blobs(
+            blobs=[remote[rel_path] for rel_path in added + updated],
+            download_path=download_path,
+            overwrite=True,
+            max_workers=max_workers,
+        )
+        for rel_path in added + updated:
+            stat = (download_path / rel_path).stat()
+            new_index[rel_path] = {
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha": remote[rel_path]["sha"]
+            }
+        if delete:
+            for rel_path in removed:
+                filepath = download_path / rel_path
+                filepath.unlink()
+                new_index.pop(rel_path)
+                # Remove directories left empty
+                for parent in filepath.parents:
+                    if parent == download_path or any(parent.iterdir()):
+                        break
+                    parent.rmdir()
+        index_path.write_text(_json.dumps(new_index))
+        return DirSyncReport(added=added, updated=updated, removed=removed, unchanged=unchanged)
+
+    def tree_blobs(self, path: str = "", ref: Optional[str] = None, recursive: bool = True) -> list[dict]:
+        """List the files (blobs) in a directory of the repository using the Git Trees API.
+
+        The tree of the directory is found by descending along `path` (one request per path component),
+        and is then listed with a single request, unless it is too large
+        for GitHub to return at once, in which case it is walked one directory at a time.
+
+        Parameters
+        ----------
+        path : str, default: ""
+            Path to the directory in the repository. Defaults to the root directory.
+        ref : str, optional
+            The name of the commit/branch/tag. Defaults to the default branch of the repository.
+        recursive : bool, default: True
+            Whether to also list files in subdirectories.
+
+        Returns
+        -------
+        list[dict]
+            Tree entries of the files, with keys 'path' (relative to `path`),
+            'mode', 'type', 'sha' (git blob hash), 'size', and 'url'.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/git/trees?apiVersion=2022-11-28#get-a-tree)
+        """
+
+        def walk(tree_sha: str, prefix: str) -> list[dict]:
+            entries = []
+            for entry in self._rest_query(f"git/trees/{tree_sha}")["tree"]:
+                entry_path = f"{prefix}{entry['path']}"
+                if entry["type"] == "blob":
+                    entries.append(entry | {"path": entry_path})
+                elif entry["type"] == "tree" and recursive:
+                    entries.extend(walk(entry["sha"], f"{entry_path}/"))
+            return entries
+
+        # Descend along the path to the subdirectory's tree, so that only that tree is listed.
+        tree_sha = ref or "HEAD"
+        for part in path.strip("/").split("/") if path.strip("/") else []:
+            subtree = next(
+                (
+                    entry for entry in self._rest_query(f"git/trees/{tree_sha}")["tree"]
+                    if entry["path"] == part and entry["type"] == "tree"
+                ),
+                None,
+            )
+            if subtree is None:
+                return []
+            tree_sha = subtree["sha"]
+        tree = self._rest_query(f"git/trees/{tree_sha}{'?recursive=1' if recursive else ''}")
+        if tree.get("truncated"):
+            # Too many entries for a single response; walk the tree directory by directory.
+            return walk(tree["sha"], "")
+        return [entry for entry in tree["tree"] if entry["type"] == "blob"]
+
+    def _content_query(self, path: str, ref: str | None) -> str:
+        return f"contents/{path.removesuffix('/')}{f'?ref={ref}' if ref else ''}"
+
+    def _raw_content_response(self, path: str, ref: str | None) -> Response:
+        """Send a streaming request for the raw content of a file.
+
+        With the raw media type, GitHub returns the file body directly,
+        but still returns the JSON listing when `path` is a directory;
+        this is detected from the content type before the body is read.
+        """
+        response = self._github._request(
+            url=self._github._endpoint["api"] / f"repos/{self._username}/{self._name}/{self._content_query(path, ref)}",
+            extra_headers={"Accept": "application/vnd.github.raw+json"},
+            stream=True,
+        )
+        if response.headers.get("Content-Type", "").startswith("application/json"):
+            response.close()
+            raise ValueError(f"Expected a file, but '{path}' is not a file.")
+        return response
+
+    def _download_archive(
+        self,
+        path: str,
+        ref: str | None,
+        recursive: bool,
+        download_path: Path,
+        create_dirs: bool,
+        overwrite: bool,
+    ) -> list[Path]:
+        """Download the files in a directory by streaming the repository's tarball.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#download-a-repository-archive-tar)
+        """
+        prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+        response = self._github._request(
+            url=self._github._endpoint["api"] / f"repos/{self._username}/{self._name}/tarball{f'/{ref}' if ref else ''}",
+            stream=True,
+        )
+        final_download_paths = []
+        with response:
+            response.raw.decode_content = True
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    # Member names start with a top-level directory named '{owner}-{repo}-{sha}'.
+                    member_path = member.name.split("/", 1)[-1]
+                    if not member_path.startswith(prefix):
+                        continue
+                    rel_path = member_path.removeprefix(prefix)
+                    if not recursive and "/" in rel_path:
+                        continue
+                    if rel_path.startswith("/") or ".." in rel_path.split("/"):
+                        raise RuntimeError(f"Unsafe path in repository archive: {member.name}")
+                    filepath = _download_target(
+                        download_path / rel_path, create_dirs=create_dirs, overwrite=overwrite
+                    )
+                    with archive.extractfile(member) as source, _atomic_write(filepath) as target:
+                        shutil.copyfileobj(source, target)
+                    final_download_paths.append(filepath)
+        return final_download_paths
+
+    def _download_blobs(
+        self,
+        blobs: list[dict],
+        download_path: Path,
+        create_dirs: bool = True,
+        overwrite: bool = False,
+        max_workers: int = 8,
+    ) -> list[Path]:
+        """Download git blobs concurrently to paths relative to a local directory.
+
+        Parameters
+        ----------
+        blobs : list[dict]
+            Tree entries of the blobs, as returned by `tree_blobs`.
+        download_path : pathlib.Path
+            Local directory to which the 'path' of each entry is relative.
+        """
+        def download(blob: dict) -> Path:
+            return self._github.rest_download(
+                query=f"repos/{self._username}/{self._name}/git/blobs/{blob['sha']}",
+                filepath=download_path / blob["path"],
+                extra_headers={"Accept": "application/vnd.github.raw+json"},
+                create_dirs=create_dirs,
+                overwrite=overwrite,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(download, blobs))
+
     def download_file(
         self,
         path: str = "",
@@ -468,26 +3528,54 @@ class Repo:
         download_path: str | Path = ".",
         download_filename: str | None = None,
         create_dirs: bool = True,
-        overwrite: bool = False,
-    ) -> Path:
-        content = self.content(path=path, ref=ref)
-        # when `path` is a file, GitHub returns a dict instead of a list
-        if not isinstance(content, dict) or content["type"] != "file":
-            raise ValueError(f"Expected a file, but got: {content}")
-        download_path = Path(download_path).resolve()
-        if download_filename:
-            full_download_path = download_path / download_filename
-        else:
-            full_download_path = download_path / Path(content["path"]).name
-        _pylinks.http.download(
-            url=content["download_url"],
-            filepath=full_download_path,
-            create_dirs=create_dirs,
-            overwrite=overwrite,
-        )
-        return full_download_path
+        overwrite: bool = False,
+        chunk_size: int = 2 ** 16,
+    ) -> Path:
+        """Download a file from the repository.
+
+        The file body is fetched with the raw media type in a single request,
+        and streamed to disk in chunks. It is written to a temporary file
+        that replaces the target file only when the download is complete.
+
+        Parameters
+        ----------
+        path : str, default: ""
+            Path to the file in the repository.
+        ref : str, optional
+            The name of the commit/branch/tag. Defaults to the default branch of the repository.
+        download_path : str | pathlib.Path, default: "."
+            Local directory to download the file to.
+        download_filename : str, optional
+            Local filename. Defaults to the filename in the repository.
+        create_dirs : bool, default: True
+            Whether to create local directories if they do not exist.
+        overwrite : bool, default: False
+            Whether to overwrite an existing local file.
+        chunk_size : int, default: 65536
+            Number of bytes to read into memory at once.
+
+        Returns
+        -------
+        pathlib.Path
+            Path to the downloaded file.
+
+        Raises
+        ------
+        ValueError
+            If `path` is not a file.
 
-    def semantic_versions(self, tag_prefix: str = "v") -> list[str]:
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#get-repository-content)
+        """
+        filepath = Path(download_path) / (download_filename or Path(path).name)
+        filepath = _download_target(filepath, create_dirs=create_dirs, overwrite=overwrite)
+        with self._raw_content_response(path=path, ref=ref) as response, _atomic_write(filepath) as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+        return filepath
+
+    def semantic_versions(self, tag_prefix: str = "v", revalidate: bool = True) -> list[str]:
         """
         Get a list of all tags from a GitHub repository that represent SemVer version numbers,
         i.e. 'X.Y.Z' where X, Y, and Z are integers.
@@ -496,32 +3584,105 @@ class Repo:
         ----------
         tag_prefix : str, default: 'v'
             Prefix of tags to match.
+        revalidate : bool, default: True
+            Whether to revalidate a previously fetched version index; see `version_index`.
 
         Returns
         -------
-        A sorted list of SemVer version numbers as tuples of integers. For example:
-            `[(0, 1, 0), (0, 1, 1), (0, 2, 0), (1, 0, 0), (1, 1, 0)]`
+        A sorted list of SemVer version numbers as strings. For example:
+            `['0.1.0', '0.1.1', '0.2.0', '1.0.0', '1.1.0']`
         """
-        tags = self.tag_names(pattern=rf"^{tag_prefix}(\d+\.\d+\.\d+)$")
-        return sorted((tag[0] for tag in tags), key=lambda x: tuple(map(int, x.split("."))))
+        return self.version_index(tag_prefix=tag_prefix, revalidate=revalidate).versions
+
+    def version_index(self, tag_prefix: str = "v", revalidate: bool = True) -> VersionIndex:
+        """Get a sorted index of all tags that represent SemVer version numbers.
+
+        Only tags starting with `tag_prefix` are fetched, by filtering refs server-side.
+        The index is cached on the client, and revalidated on each call
+        with a conditional request using the ETag of the previous response.
+        This returns no data (and does not count against the rate limit) when the tags are unchanged,
+        so repeated calls only refetch the tags after they have changed.
+
+        Parameters
+        ----------
+        tag_prefix : str, default: 'v'
+            Prefix of tags to match. Tags must be of the form '{tag_prefix}X.Y.Z',
+            where X, Y, and Z are integers.
+        revalidate : bool, default: True
+            Whether to revalidate a previously fetched index.
+            If False, a cached index is returned without sending a request, even if it may be stale;
+            this is useful when the cache is kept up to date with `GitHub.ingest_webhook`.
+
+        Returns
+        -------
+        VersionIndex
 
-    def discussion_categories(self) -> list[dict[str, str]]:
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/git/refs?apiVersion=2022-11-28#list-matching-references)
+        - [GitHub API Docs: Conditional requests](https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api?apiVersion=2022-11-28#use-conditional-requests-if-appropriate)
+        """
+        key = (f"{self._username}/{self._name}".lower(), tag_prefix)
+        index = self._github._version_indices.get(key)
+        if index and not revalidate:
+            return index
+        response = self._github._request(
+            url=self._github._endpoint["api"] / f"repos/{self._username}/{self._name}/git/matching-refs/tags/{tag_prefix}",
+            extra_headers={"If-None-Match": index.etag} if index and index.etag else None,
+        )
+        if response.status_code == 304:
+            return index
+        pattern = re.compile(rf"^{re.escape(tag_prefix)}(\d+\.\d+\.\d+)$")
+        versions = []
+        for ref in response.json():
+            match = pattern.match(ref["ref"].removeprefix("refs/tags/"))
+            if match:
+                versions.append(match.group(1))
+        index = VersionIndex(versions=versions, etag=response.headers.get("ETag"))
+        self._github._version_indices[key] = index
+        return index
+
+    def discussion_categories(
+        self, fields: Literal["minimal", "full"] | str | Sequence[str] = "full"
+    ) -> list[dict[str, str]]:
         """Get discussion categories for a repository.
 
+        Parameters
+        ----------
+        fields : {'minimal', 'full'} | str | Sequence[str], default: 'full'
+            Fields to fetch for each category, either as the name of a preset,
+            a GraphQL selection string, or a sequence of field names.
+            The 'minimal' preset fetches "name", "slug", and "id",
+            and the 'full' preset additionally fetches "emoji", "emojiHTML", "createdAt",
+            "updatedAt", "isAnswerable", and "description".
+
         Returns
         -------
-            A list of discussion categories as dictionaries with keys "name", "slug", and "id".
+            A list of discussion categories as dictionaries with the requested fields as keys.
 
         References
         ----------
         - [GitHub Docs](https://docs.github.com/en/graphql/guides/using-the-graphql-api-for-discussions)
-        -
+        - [GitHub API Docs](https://docs.github.com/en/graphql/reference/objects#discussioncategory)
         """
-        payload = "discussionCategories(first: 100) {edges {node {name, slug, id, emoji, emojiHTML, createdAt, updatedAt, isAnswerable, description}}}"
-        data = self._graphql_query(payload)
+        payload = (
+            f"discussionCategories(first: 100) "
+            f"{{edges {{node {{{_graphql_fields(fields, _DISCUSSION_CATEGORY_FIELDS)}}}}}}}"
+        )
+        data = self._graphql_query(payload, operation="discussion_categories")
         discussions = [entry["node"] for entry in data["discussionCategories"]["edges"]]
         return discussions
 
+    def mirror(self, path: str | Path) -> RepoMirror:
+        """Get a local SQLite mirror of the issues, pull requests, comments, and labels of the repository.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path
+            Path to the SQLite database file. It is created if it does not exist.
+        """
+        return RepoMirror(repo=self, path=path)
+
     def issue(self, number: int) -> dict:
         return self._rest_query(f"issues/{number}")
 
@@ -666,6 +3827,197 @@ class Repo:
     def issue_comment_update(self, comment_id: int, body: str) -> dict:
         return self._rest_query(f"issues/comments/{comment_id}", verb="PATCH", json={"body": body})
 
+    def issues_triage(self, operations: Sequence[dict], max_size: int = 25) -> list[TriageResult]:
+        """Apply triage operations to many issues and pull requests in as few requests as possible.
+
+        Node IDs of all issues, pull requests, labels, and assignees are resolved
+        from the client's node-ID cache, or otherwise in batched GraphQL queries.
+        All operations are then sent as aliased GraphQL mutations in batches of at most `max_size`.
+        Errors are collected per item instead of being raised,
+        so that one failing operation (or one failing request) does not prevent the others.
+
+        Parameters
+        ----------
+        operations : Sequence[dict]
+            Operations, each as a dictionary with the following keys:
+            - 'number' (required): Number of the issue or pull request.
+            - 'labels' (optional): Names of labels to add.
+            - 'assignees' (optional): Usernames of users to assign.
+            - 'title', 'body' (optional): New title and body.
+            - 'state' (optional): New state; either 'open' or 'closed'.
+            - 'state_reason' (optional): Reason for closing an issue;
+              either 'completed' or 'not_planned'. Only used when 'state' is 'closed'.
+            - 'comment' (optional): Body of a comment to add.
+        max_size : int, default: 25
+            Maximum number of mutations in a single request.
+
+        Returns
+        -------
+        list[TriageResult]
+            Results of the operations, in the same order as the input.
+
+        References
+        ----------
+        - [GitHub API Docs: Mutations](https://docs.github.com/en/graphql/reference/mutations)
+        """
+        node_ids = self._github._node_ids
+        resolved: dict[tuple, tuple[str, str] | str] = {}
+        failures: dict[tuple, list[dict]] = {}
+        pending: list[tuple[tuple, str | tuple[str, dict]]] = []
+        for number in dict.fromkeys(operation["number"] for operation in operations):
+            for kind, typename in (("issue", "Issue"), ("pull", "PullRequest")):
+                node_id = node_ids.get(kind, self._username, self._name, str(number))
+                if node_id:
+                    resolved[("number", number)] = (typename, node_id)
+                    break
+            else:
+                pending.append(
+                    (
+                        ("number", number),
+                        self._graphql_selection(
+                            f"issueOrPullRequest(number: {int(number)}) "
+                            "{__typename ... on Issue {id} ... on PullRequest {id}}"
+                        ),
+                    )
+                )
+        for label in dict.fromkeys(label for operation in operations for label in operation.get("labels", [])):
+            node_id = node_ids.get("label", self._username, self._name, label)
+            if node_id:
+                resolved[("label", label)] = node_id
+            else:
+                pending.append(
+                    (
+                        ("label", label),
+                        (self._graphql_selection("label(name: $name) {id}"), {"name": (label, "String", True)}),
+                    )
+                )
+        for login in dict.fromkeys(login for operation in operations for login in operation.get("assignees", [])):
+            node_id = node_ids.get("user", login)
+            if node_id:
+                resolved[("user", login)] = node_id
+            else:
+                pending.append((("user", login), ("user(login: $login) {id}", {"login": (login, "String", True)})))
+        for start in range(0, len(pending), 50):
+            lookups = pending[start:start + 50]
+            try:
+                results = self._github.graphql_query_batch(
+                    [query for _, query in lookups], raise_errors=False, operation="issues_triage"
+                )
+            except _api_exception.WebAPIError as e:
+                for key, _ in lookups:
+                    failures[key] = _batch_request_errors(e)
+                continue
+            for (key, _), result in zip(lookups, results):
+                node = result.data
+                if node is not None and key[0] == "number":
+                    node = node["issueOrPullRequest"]
+                elif node is not None and key[0] == "label":
+                    node = node["label"]
+                if not node:
+                    failures[key] = result.errors or [{"message": f"Could not resolve {key[0]} '{key[1]}'."}]
+                    continue
+                if key[0] == "number":
+                    resolved[key] = (node["__typename"], node["id"])
+                    kind = "issue" if node["__typename"] == "Issue" else "pull"
+                    node_ids.set(node["id"], kind, self._username, self._name, str(key[1]))
+                elif key[0] == "label":
+                    resolved[key] = node["id"]
+                    node_ids.set(node["id"], "label", self._username, self._name, key[1])
+                else:
+                    resolved[key] = node["id"]
+                    node_ids.set(node["id"], "user", key[1])
+
+        triage_results = [TriageResult(number=operation["number"], data={}, errors=[]) for operation in operations]
+        mutations = []
+        owners = []
+        for idx, operation in enumerate(operations):
+            number_key = ("number", operation["number"])
+            if number_key not in resolved:
+                triage_results[idx].errors.extend(failures[number_key])
+                continue
+            typename, node_id = resolved[number_key]
+            requested = []
+            for key_type, key_name in (("label", "labels"), ("user", "assignees")):
+                ids = []
+                for item in operation.get(key_name, []):
+                    if (key_type, item) in resolved:
+                        ids.append(resolved[(key_type, item)])
+                    else:
+                        triage_results[idx].errors.extend(failures[(key_type, item)])
+                requested.append(ids)
+            label_ids, assignee_ids = requested
+            if label_ids:
+                mutations.append(
+                    (
+                        "addLabelsToLabelable",
+                        "AddLabelsToLabelableInput",
+                        {"labelableId": node_id, "labelIds": label_ids},
+                        "clientMutationId",
+                    )
+                )
+                owners.append(idx)
+            if assignee_ids:
+                mutations.append(
+                    (
+                        "addAssigneesToAssignable",
+                        "AddAssigneesToAssignableInput",
+                        {"assignableId": node_id, "assigneeIds": assignee_ids},
+                        "clientMutationId",
+                    )
+                )
+                owners.append(idx)
+            state = operation.get("state")
+            close_with_reason = typename == "Issue" and state == "closed" and operation.get("state_reason")
+            update = {key: operation[key] for key in ("title", "body") if key in operation}
+            if state and not close_with_reason:
+                update["state"] = state.upper()
+            if update:
+                if typename == "Issue":
+                    mutations.append(
+                        ("updateIssue", "UpdateIssueInput", {"id": node_id} | update, "clientMutationId")
+                    )
+                else:
+                    mutations.append(
+                        (
+                            "updatePullRequest",
+                            "UpdatePullRequestInput",
+                            {"pullRequestId": node_id} | update,
+                            "clientMutationId",
+                        )
+                    )
+                owners.append(idx)
+            if close_with_reason:
+                mutations.append(
+                    (
+                        "closeIssue",
+                        "CloseIssueInput",
+                        {"issueId": node_id, "stateReason": operation["state_reason"].upper()},
+                        "clientMutationId",
+                    )
+                )
+                owners.append(idx)
+            if operation.get("comment"):
+                mutations.append(
+                    (
+                        "addComment",
+                        "AddCommentInput",
+                        {"subjectId": node_id, "body": operation["comment"]},
+                        "clientMutationId",
+                    )
+                )
+                owners.append(idx)
+        for start in range(0, len(mutations), max_size):
+            batch = mutations[start:start + max_size]
+            try:
+                results = self._github.graphql_mutation_batch(batch, max_size=max_size, raise_errors=False)
+            except _api_exception.WebAPIError as e:
+                # The request failed as a whole (e.g., it timed out); only this batch is affected.
+                results = [GraphQLResult(data=None, errors=_batch_request_errors(e))] * len(batch)
+            for idx, (name, *_), result in zip(owners[start:start + max_size], batch, results):
+                triage_results[idx].data[name] = result.data
+                triage_results[idx].errors.extend(result.errors)
+        return triage_results
+
     def pull_list(
         self,
         state: Literal["open", "closed", "all"] = "open",
@@ -718,6 +4070,11 @@ class Repo:
         cursor_before: str | None = None,
         cursor_after: str | None = None,
         sort: Literal["first", "last"] = "last",
+        fields: Literal["minimal", "full"] | str | Sequence[str] = "full",
+        page_size: int = 100,
+        authors_count: int = 100,
+        target_cost: float | None = None,
+        target_seconds: float | None = None,
     ) -> list[dict]:
         """
         Get a list of commits for a pull request.
@@ -726,6 +4083,31 @@ class Repo:
         ----------
         number : int
             Pull request number.
+        count : int, default: 0
+            Maximum number of commits to fetch. If 0 or negative, all commits are fetched.
+        cursor_before : str, optional
+            Only fetch commits before this cursor.
+        cursor_after : str, optional
+            Only fetch commits after this cursor.
+        sort : {'first', 'last'}, default: 'last'
+            Whether to fetch commits from the start or the end of the commit list.
+        fields : {'minimal', 'full'} | str | Sequence[str], default: 'full'
+            Fields to fetch for each commit. This can be the name of a preset,
+            a GraphQL selection string on the `PullRequestCommit` object,
+            or a sequence of field names of its `commit` (i.e., `Commit`) object.
+            The 'minimal' preset only fetches the commit's "oid" and "committedDate",
+            while the 'full' preset fetches all commit data, including authors and committer.
+        page_size : int, default: 100
+            Initial number of commits per page (at most 100).
+        authors_count : int, default: 100
+            Maximum number of authors to fetch for each commit (at most 100),
+            when the 'full' preset is used.
+        target_cost : float, optional
+            Target rate-limit cost (in points) per page.
+            If set, the page size is adapted after each page to approach this cost.
+        target_seconds : float, optional
+            Target response time (in seconds) per page.
+            If set, the page size is adapted after each page to approach this response time.
 
         Returns
         -------
@@ -740,39 +4122,46 @@ class Repo:
         def post_process():
             out = []
             for datum in data:
-                commits = datum["pullRequest"]["commits"]["nodes"]
+                commits = datum["repository"]["pullRequest"]["commits"]["nodes"]
                 if sort == "last":
                     commits = reversed(commits)
                 for commit in commits:
-                    commit["commit"]["authors"] = commit["commit"]["authors"]["nodes"]
+                    if "authors" in commit.get("commit", {}):
+                        commit["commit"]["authors"] = commit["commit"]["authors"]["nodes"]
                     out.append(commit)
             return out
 
+        def make_query(size: int) -> str:
+            commits_args = ["after: $after", "before: $before", f"{sort}: {size}"]
+            commits_sig = f"commits({", ".join(commits_args)})"
+            return self._graphql_selection(
+                f"pullRequest(number: {number}) {{ {commits_sig} {{ {commits_fields} {page_info_fields} }} }}"
+            )
+
         git_actor_fields = "{name, email, date user {id, login}}"
-        commit_fields = f"{{abbreviatedOid, additions, deletions, authors(first: 100) {{nodes {git_actor_fields}}}, committer {git_actor_fields}, authoredByCommitter, authoredDate, committedDate, message, messageBody, messageHeadline, oid, id, resourcePath, url}}"
+        commit_fields = f"{{abbreviatedOid, additions, deletions, authors(first: {authors_count}) {{nodes {git_actor_fields}}}, committer {git_actor_fields}, authoredByCommitter, authoredDate, committedDate, message, messageBody, messageHeadline, oid, id, resourcePath, url}}"
         page_info_fields = "pageInfo {startCursor, endCursor, hasNextPage, hasPreviousPage}"
-        commits_args = ["after: $after", "before: $before", f"{sort}: {100 if count <= 0 else min(count, 100)}"]
-        commits_fields = f"nodes {{id, resourcePath, url, commit {commit_fields} }}"
-        commits_sig = f"commits({", ".join(commits_args)})"
-        payload = f"pullRequest(number: {number}) {{ {commits_sig} {{ {commits_fields} {page_info_fields} }} }}"
+        presets = {
+            "minimal": "commit {oid, committedDate}",
+            "full": f"id, resourcePath, url, commit {commit_fields}",
+        }
+        if not isinstance(fields, str):
+            fields = f"commit {{{_graphql_fields(fields, {})}}}"
+        commits_fields = f"nodes {{{_graphql_fields(fields, presets)}}}"
         variables = {
             "after": (cursor_after, "String", False),
             "before": (cursor_before, "String", False),
         }
-        data = [self._graphql_query(payload, variables)]
-        total_downloaded = 100
-        while True:
-            page_info = data[-1]["pullRequest"]["commits"]["pageInfo"]
-            if count <= 0:
-                must_continue = page_info["hasNextPage" if sort == "first" else "hasPreviousPage"]
-                if not must_continue:
-                    return post_process()
-            elif total_downloaded >= count:
-                return post_process()
-            else:
-                variables["after" if sort == "first" else "before"] = (page_info["endCursor" if sort == "first" else "startCursor"], "String", False)
-                data.append(self._graphql_query(payload, variables))
-                total_downloaded += 100
+        data = self._github._graphql_paginate(
+            query=make_query,
+            connection=lambda page: page["repository"]["pullRequest"]["commits"],
+            variables=variables,
+            count=count,
+            sort=sort,
+            page_size=_AdaptivePageSize(page_size, target_cost=target_cost, target_seconds=target_seconds),
+            operation="pull_commits",
+        )
+        return post_process()
         # commits = []
         # page = 1
         # while True:
@@ -853,7 +4242,7 @@ class Repo:
             self._github.graphql_mutation(
                 mutation_name="convertPullRequestToDraft" if draft else "markPullRequestReadyForReview",
                 mutation_input_name="ConvertPullRequestToDraftInput" if draft else "MarkPullRequestReadyForReviewInput",
-                mutation_input={"pullRequestId": self.pull(number=number)["node_id"]},
+                mutation_input={"pullRequestId": self.pull_node_id(number)},
                 mutation_payload="pullRequest {isDraft}"
             )
         data = {}
@@ -984,11 +4373,12 @@ class Repo:
                 mutation_input_name="UpdateRepositoryInput",
                 mutation_input={
                     "hasDiscussionsEnabled": has_discussions,
-                    "repositoryId": self.info["node_id"]
+                    "repositoryId": self.node_id
                 },
                 mutation_payload="repository {hasDiscussionsEnabled}"
             )
             output["hasDiscussionsEnabled"] = out['updateRepository']['repository']['hasDiscussionsEnabled']
+            self._invalidate("info")
 
         private_vulnerability_reporting = data.pop("private_vulnerability_reporting")
         if private_vulnerability_reporting is not None:
@@ -1048,6 +4438,223 @@ class Repo:
                 raise ValueError(f"Topic contains invalid pattern: {topic}.")
         return self._rest_query(query="topics", verb="PUT", json={"names": list(topics)})
 
+    def apply_settings(
+        self,
+        spec: dict,
+        dry_run: bool = False,
+        snapshot: RepoSnapshot | None = None,
+    ) -> SettingsApplyReport:
+        """Apply a declarative settings specification to the repository.
+
+        The current state of the repository is read at once with `snapshot`,
+        and compared with the specification; only the settings that differ are sent.
+        Rulesets are compared with their full definitions, which are read (concurrently)
+        only for rulesets named in the specification;
+        branch protection rules are created and updated in a single batched GraphQL mutation.
+        Settings not mentioned in the specification, and existing rulesets
+        and branch protection rules not named in it, are left untouched.
+        A failed change does not stop the others; it is reported in the `failed` field of the report.
+
+        Parameters
+        ----------
+        spec : dict
+            Settings specification, with the following (optional) keys:
+            - 'repo': Arguments of `repo_update`.
+              Security-related arguments (`advanced_security`, `secret_scanning`,
+              `secret_scanning_push_protection`, `automated_security_fixes`,
+              `private_vulnerability_reporting`, `vulnerability_alerts`)
+              are not part of the snapshot, and are thus always sent when specified.
+            - 'topics': List of topics, as in `repo_topics_replace`.
+            - 'pages': Arguments of `pages_update`. When the Pages site does not exist,
+              it is created with `pages_create`, which requires 'build_type'.
+            - 'rulesets': List of arguments of `ruleset_create`, matched to existing rulesets by name.
+            - 'branch_protection_rules': List of arguments of `branch_protection_rule_create`,
+              matched to existing rules by pattern.
+        dry_run : bool, default: False
+            Only compute and return the required changes, without sending any mutations.
+        snapshot : RepoSnapshot, optional
+            Current state of the repository, if already fetched (e.g., by `GitHub.repo_snapshots`).
+            It must include the Pages site information if `spec` contains 'pages'.
+
+        Returns
+        -------
+        SettingsApplyReport
+            Changes that were applied (or would have been applied, when `dry_run` is True).
+
+        References
+        ----------
+        - [GitHub API Docs: Rulesets](https://docs.github.com/en/rest/repos/rules?apiVersion=2022-11-28#get-a-repository-ruleset)
+        """
+        unknown = set(spec) - {"repo", "topics", "pages", "rulesets", "branch_protection_rules"}
+        if unknown:
+            raise ValueError(f"Unknown settings: {unknown}")
+        if snapshot is None:
+            snapshot = self.snapshot(pages="pages" in spec)
+        info = snapshot.info
+        report = SettingsApplyReport(
+            repo={}, topics=None, pages=None, rulesets={}, branch_protection_rules={}, failed={}
+        )
+
+        for arg_name, value in spec.get("repo", {}).items():
+            if arg_name not in _REPO_SETTINGS_FIELDS:
+                report.repo[arg_name] = value
+                continue
+            current = info
+            for field in _REPO_SETTINGS_FIELDS[arg_name]:
+                current = (current or {}).get(field)
+            if arg_name == "visibility":
+                current = current.lower()
+            if value != current and not (value == "" and current is None):
+                report.repo[arg_name] = value
+
+        if "topics" in spec and sorted(spec["topics"]) != sorted(info["topics"]):
+            report = report._replace(topics=list(spec["topics"]))
+
+        if "pages" in spec:
+            desired = spec["pages"]
+            current = snapshot.pages
+            if current is None:
+                if "build_type" not in desired:
+                    raise ValueError("'build_type' must be specified to create the Pages site.")
+                report = report._replace(pages=dict(desired))
+            else:
+                pages = {}
+                if "cname" in desired and (desired["cname"] or None) != current.get("cname"):
+                    pages["cname"] = desired["cname"]
+                if "https_enforced" in desired and desired["https_enforced"] != current.get("https_enforced"):
+                    pages["https_enforced"] = desired["https_enforced"]
+                source = current.get("source") or {}
+                build_type = desired.get("build_type", current.get("build_type"))
+                branch = desired.get("branch", source.get("branch"))
+                path = desired.get("path", source.get("path", "/"))
+                if build_type != current.get("build_type") or (
+                    build_type == "legacy" and (branch, path) != (source.get("branch"), source.get("path"))
+                ):
+                    pages |= {"build_type": build_type, "branch": branch, "path": path}
+                if pages:
+                    report = report._replace(pages=pages)
+
+        ruleset_changes = []
+        if spec.get("rulesets"):
+            candidates = {}
+            for ruleset in snapshot.rulesets:
+                candidates.setdefault(ruleset["name"], []).append(ruleset["databaseId"])
+            ids = [ruleset_id for ruleset in spec["rulesets"] for ruleset_id in candidates.get(ruleset["name"], [])]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                current_rulesets = {
+                    ruleset["id"]: ruleset
+                    for ruleset in executor.map(lambda ruleset_id: self._rest_query(f"rulesets/{ruleset_id}"), ids)
+                }
+            for ruleset in spec["rulesets"]:
+                data = self._ruleset_data(**ruleset)
+                current = next(
+                    (
+                        current_rulesets[ruleset_id] for ruleset_id in candidates.get(ruleset["name"], [])
+                        # Rulesets inherited from the organization cannot be updated in the repository
+                        if current_rulesets[ruleset_id].get("source_type", "Repository") == "Repository"
+                    ),
+                    None
+                )
+                if current is None:
+                    ruleset_changes.append(("rulesets", "POST", data, ruleset["name"]))
+                    report.rulesets[ruleset["name"]] = "created"
+                elif not _ruleset_equal(data, current):
+                    data = {"bypass_actors": [], "conditions": {}, "rules": []} | data
+                    ruleset_changes.append((f"rulesets/{current['id']}", "PUT", data, ruleset["name"]))
+                    report.rulesets[ruleset["name"]] = "updated"
+
+        rule_mutations = []
+        rule_patterns = []
+        if spec.get("branch_protection_rules"):
+            current_rules = {rule["pattern"]: rule for rule in snapshot.branch_protection_rules}
+            for rule in spec["branch_protection_rules"]:
+                inputs = self._prepare_branch_protection_rule_input(rule)
+                current = current_rules.get(rule["pattern"])
+                if current is None:
+                    inputs["repositoryId"] = info["id"]
+                    rule_mutations.append(
+                        (
+                            "createBranchProtectionRule",
+                            "CreateBranchProtectionRuleInput",
+                            inputs,
+                            "branchProtectionRule {id}",
+                        )
+                    )
+                    rule_patterns.append(rule["pattern"])
+                    report.branch_protection_rules[rule["pattern"]] = "created"
+                    continue
+                changes = {}
+                for input_name, value in inputs.items():
+                    if input_name in _BRANCH_PROTECTION_RULE_ALLOWANCE_INPUTS:
+                        allowances = current[_BRANCH_PROTECTION_RULE_ALLOWANCE_INPUTS[input_name]]["nodes"]
+                        if sorted(value) != sorted(node["actor"]["id"] for node in allowances):
+                            changes[input_name] = value
+                    elif isinstance(value, list):
+                        if sorted(value) != sorted(current[input_name] or []):
+                            changes[input_name] = value
+                    elif value != current[input_name]:
+                        changes[input_name] = value
+                if changes:
+                    changes["branchProtectionRuleId"] = current["id"]
+                    rule_mutations.append(
+                        (
+                            "updateBranchProtectionRule",
+                            "UpdateBranchProtectionRuleInput",
+                            changes,
+                            "branchProtectionRule {id}",
+                        )
+                    )
+                    rule_patterns.append(rule["pattern"])
+                    report.branch_protection_rules[rule["pattern"]] = "updated"
+
+        if dry_run:
+            return report
+
+        def attempt(key: str, send: Callable[[], Any]) -> bool:
+            try:
+                send()
+            except Exception as e:
+                report.failed[key] = e
+                return False
+            return True
+
+        def apply_pages():
+            if snapshot.pages is None:
+                self.pages_create(
+                    **{key: report.pages[key] for key in ("build_type", "branch", "path") if key in report.pages}
+                )
+                pages = {key: report.pages[key] for key in ("cname", "https_enforced") if key in report.pages}
+                if pages:
+                    self.pages_update(**pages)
+            else:
+                self.pages_update(**report.pages)
+            return
+
+        if report.repo and not attempt("repo", lambda: self.repo_update(**report.repo)):
+            report.repo.clear()
+        if report.topics is not None and not attempt("topics", lambda: self.repo_topics_replace(report.topics)):
+            report = report._replace(topics=None)
+        if report.pages is not None and not attempt("pages", apply_pages):
+            report = report._replace(pages=None)
+        for query, verb, data, name in ruleset_changes:
+            if not attempt(
+                f"rulesets/{name}", lambda: self._rest_query(query=query, verb=verb, json=data)
+            ):
+                report.rulesets.pop(name)
+        if rule_mutations:
+            try:
+                results = self._github.graphql_mutation_batch(rule_mutations, raise_errors=False)
+            except Exception as e:
+                results = [e] * len(rule_mutations)
+            for pattern, mutation, result in zip(rule_patterns, rule_mutations, results):
+                if isinstance(result, GraphQLResult):
+                    if not result.errors:
+                        continue
+                    result = _api_exception.GraphQLResponseError({"errors": result.errors}, mutation[0])
+                report.failed[f"branch_protection_rules/{pattern}"] = result
+                report.branch_protection_rules.pop(pattern)
+        return report
+
     def pages_create(
         self,
         build_type: Literal['legacy', 'workflow'],
@@ -1174,6 +4781,127 @@ class Repo:
             raise ValueError("At least one of 'new_name', 'color', or 'description' must be specified.")
         return self._rest_query(query=f"labels/{name}", verb="PATCH", json=data)
 
+    def labels_apply(
+        self,
+        desired: Sequence[dict[str, str | Sequence[str]]],
+        delete: bool = False,
+        dry_run: bool = False,
+        max_workers: int = 4,
+    ) -> LabelsApplyReport:
+        """Reconcile the labels of the repository with a desired set of labels.
+
+        Current labels are read once, and compared with the desired labels
+        to compute the minimal set of create, rename, update, and delete requests,
+        which are then sent concurrently. A failed request does not stop the others;
+        it is reported in the `failed` field of the report.
+        Since these requests are mutations, they are spaced by the client's mutation queue
+        to respect secondary rate limits.
+        As in GitHub, label names are matched case-insensitively.
+
+        Parameters
+        ----------
+        desired : Sequence[dict[str, str | Sequence[str]]]
+            Desired labels, each as a dictionary with the following keys:
+            - 'name' (required): Name of the label.
+            - 'color' (optional): Hexadecimal color code of the label, without the leading '#'.
+            - 'description' (optional): Description of the label (max. 100 characters).
+            - 'previous_names' (optional): Other names the label may currently have;
+              an existing label with one of these names is renamed, instead of creating a new one.
+            Omitted colors and descriptions are left unchanged for existing labels.
+        delete : bool, default: False
+            Whether to delete existing labels that do not match any desired label.
+        dry_run : bool, default: False
+            Only compute and return the plan, without sending any mutations.
+        max_workers : int, default: 4
+            Maximum number of concurrent requests.
+
+        Returns
+        -------
+        LabelsApplyReport
+            Names of the created, updated, renamed, deleted, unchanged, and failed labels.
+            When `dry_run` is True, these are the changes that would have been made.
+
+        Raises
+        ------
+        ValueError
+            If two desired labels have the same name (compared case-insensitively).
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/issues/labels?apiVersion=2022-11-28)
+        """
+        _check_unique_label_names(desired)
+        for label in desired:
+            self._validate_label_data(label["name"], label.get("color", ""), label.get("description", ""))
+        current = {label["name"].lower(): label for label in self.labels}
+        matches = {}
+        for idx, label in enumerate(desired):
+            if label["name"].lower() in current:
+                matches[idx] = current.pop(label["name"].lower())
+        for idx, label in enumerate(desired):
+            if idx in matches:
+                continue
+            for previous_name in label.get("previous_names", []):
+                if previous_name.lower() in current:
+                    matches[idx] = current.pop(previous_name.lower())
+                    break
+        report = LabelsApplyReport(created=[], updated=[], renamed=[], deleted=[], unchanged=[], failed={})
+        # Changes as tuples of (query, verb, data, label name, report field, report entry)
+        changes = []
+        for idx, label in enumerate(desired):
+            existing = matches.get(idx)
+            if not existing:
+                data = {key: label[key] for key in ("name", "color", "description") if key in label}
+                changes.append(("labels", "POST", data, label["name"], report.created, label["name"]))
+                continue
+            data = {}
+            if label["name"] != existing["name"]:
+                data["new_name"] = label["name"]
+            if "color" in label and label["color"].lower() != existing["color"].lower():
+                data["color"] = label["color"]
+            if "description" in label and label["description"] != (existing["description"] or ""):
+                data["description"] = label["description"]
+            if not data:
+                report.unchanged.append(label["name"])
+                continue
+            query = f"labels/{urllib.parse.quote(existing['name'], safe='')}"
+            if "new_name" in data:
+                changes.append(
+                    (query, "PATCH", data, existing["name"], report.renamed, (existing["name"], label["name"]))
+                )
+            else:
+                changes.append((query, "PATCH", data, existing["name"], report.updated, label["name"]))
+        if delete:
+            for label in current.values():
+                changes.append(
+                    (
+                        f"labels/{urllib.parse.quote(label['name'], safe='')}", "DELETE", None,
+                        label["name"], report.deleted, label["name"],
+                    )
+                )
+
+        def send(change) -> Exception | None:
+            query, verb, data, *_ = change
+            try:
+                self._rest_query(
+                    query=query, verb=verb, json=data, response_type="str" if verb == "DELETE" else "json"
+                )
+            except Exception as e:
+                return e
+            return None
+
+        if dry_run:
+            errors = [None] * len(changes)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                errors = list(executor.map(send, changes))
+        for (*_, name, field, entry), error in zip(changes, errors):
+            if error is None:
+                field.append(entry)
+            else:
+                report.failed[name] = error
+        return report
+
     def release_get(self, release_id: int) -> dict:
         return self._rest_query(query=f"releases/{release_id}")
 
@@ -1280,7 +5008,14 @@ class Repo:
         return self._rest_query(query=f"releases/{release_id}", verb="PATCH", json=data)
 
     def release_asset_list(self, release_id: int) -> list[dict]:
-        return self._rest_query(query=f"releases/{release_id}/assets")
+        assets = []
+        page = 1
+        while True:
+            response = self._rest_query(query=f"releases/{release_id}/assets?per_page=100&page={page}")
+            assets.extend(response)
+            page += 1
+            if len(response) < 100:
+                return assets
 
     def release_asset_delete(self, asset_id: int) -> None:
         self._rest_query(query=f"releases/assets/{asset_id}", verb="DELETE", response_type=None)
@@ -1293,9 +5028,16 @@ class Repo:
         mime_type: str = "",
         name: str = "",
         label: str = "",
+        progress: Callable[[int, int], None] | None = None,
+        chunk_size: int = 2 ** 20,
     ) -> dict:
         """Upload a file as an asset to a release.
 
+        The file is streamed from disk in chunks with an explicit content length,
+        so memory usage does not grow with the file size, and sending starts immediately.
+        A SHA-256 digest is computed while streaming,
+        and verified against the digest reported by GitHub for the uploaded asset.
+
         Parameters
         ----------
         release_id : int
@@ -1304,8 +5046,20 @@ class Repo:
             Path to the file to upload.
         mime_type : str, optional
             MIME type of the file. If not specified, it will be guessed from the file extension.
+        name : str, optional
+            Name of the asset. Defaults to the filename.
         label : str, optional
             Label for the uploaded file to display on GitHub UI instead of the actual filename.
+        progress : Callable[[int, int], None], optional
+            Function called after each chunk is read for sending,
+            with the number of bytes read so far and the total file size.
+        chunk_size : int, default: 1048576
+            Number of bytes to read into memory at once.
+
+        Raises
+        ------
+        pylinks.exception.api.WebAPIValueError
+            If the digest reported by GitHub does not match the digest of the sent file.
 
         References
         ----------
@@ -1321,18 +5075,265 @@ class Repo:
                 raise RuntimeError(
                     f"Could not guess MIME type of file '{filepath}'. Please provide it as input argument."
                 )
-        headers = {"Content-Type": mime_type}
-        query = f"releases/{release_id}/assets?name={name or filepath.name}"
-        if label:
-            query += f"&label={label}"
-        return self._rest_query(
+        stream = _UploadStream(filepath, chunk_size=chunk_size, progress=progress)
+        headers = {"Content-Type": mime_type, "Content-Length": str(len(stream))}
+        params = {"name": name or filepath.name} | ({"label": label} if label else {})
+        query = f"releases/{release_id}/assets?{urllib.parse.urlencode(params, quote_via=urllib.parse.quote)}"
+        asset = self._rest_query(
             query=query,
             verb="POST",
-            data=filepath.read_bytes(),
+            data=stream,
             extra_headers=headers,
             endpoint="upload"
         )
 
+        def digest_matches(value: dict) -> bool:
+            return value.get("digest") in (None, f"sha256:{stream.sha256}")
+
+        if stream.sha256 and not digest_matches(asset):
+            raise _api_exception.WebAPIValueError(response_value=asset, response_verifier=digest_matches)
+        return asset
+
+    def release_publish(
+        self,
+        tag_name: str,
+        assets: Sequence[str | Path | dict[str, str | Path]],
+        name: str | None = None,
+        body: str | None = None,
+        target_commitish: str | None = None,
+        draft: bool = False,
+        prerelease: bool | None = None,
+        make_latest: Literal['true', 'false', 'legacy'] | None = None,
+        max_workers: int = 4,
+        retries: int = 2,
+    ) -> ReleasePublishReport:
+        """Create or update a release, and upload its assets concurrently.
+
+        The existing assets of the release are listed once,
+        and assets with the same name, size, and SHA-256 digest as a local file are skipped.
+        Outdated assets are deleted and re-uploaded, and the rest are uploaded concurrently.
+        Each asset that fails to upload is retried on its own,
+        after removing any partially uploaded asset with the same name;
+        a failure of that cleanup counts as a failed attempt, and the last error of each asset is reported.
+        A new release (or an existing draft) that is to be published is kept as a draft
+        until all assets are uploaded, so that it never appears with missing assets;
+        if any asset fails, the release is left as a draft.
+
+        Parameters
+        ----------
+        tag_name : str
+            The name of the tag of the release.
+        assets : Sequence[str | pathlib.Path | dict[str, str | pathlib.Path]]
+            Files to upload, each either as a path, or as a dictionary with the following keys:
+            - 'path' (required): Path to the file.
+            - 'name' (optional): Name of the asset; defaults to the filename.
+            - 'label' (optional): Label of the asset to display on GitHub UI.
+            - 'mime_type' (optional): MIME type of the file; guessed from the file extension by default.
+        name : str, optional
+            The name of the release.
+        body : str, optional
+            The body of the release post.
+        target_commitish : str, optional
+            The commitish value that determines where the Git tag is created from, if it does not exist.
+        draft : bool, default: False
+            Whether the release should remain a draft.
+        prerelease : bool, optional
+            Whether to identify the release as a prerelease.
+        make_latest : {'true', 'false', 'legacy'}, optional
+            Whether the release should be set as the latest release of the repository.
+        max_workers : int, default: 4
+            Maximum number of concurrent uploads.
+        retries : int, default: 2
+            Number of times to retry uploading an asset after a failure.
+
+        Returns
+        -------
+        ReleasePublishReport
+            The release, and the names of uploaded, skipped, and failed assets.
+
+        References
+        ----------
+        - [GitHub API Docs: Releases](https://docs.github.com/en/rest/releases/releases?apiVersion=2022-11-28)
+        - [GitHub API Docs: Release Assets](https://docs.github.com/en/rest/releases/assets?apiVersion=2022-11-28)
+        """
+        uploads = []
+        for asset in assets:
+            asset = {"path": asset} if isinstance(asset, (str, Path)) else dict(asset)
+            asset["path"] = Path(asset["path"]).resolve()
+            if not asset["path"].is_file():
+                raise FileNotFoundError(f"File not found: {asset['path']}")
+            asset.setdefault("name", asset["path"].name)
+            uploads.append(asset)
+        fields = {
+            key: value for key, value in (
+                ("name", name), ("body", body), ("target_commitish", target_commitish), ("prerelease", prerelease)
+            ) if value is not None
+        }
+        release = self._release_by_tag(tag_name)
+        if release is None:
+            release = self.release_create(tag_name=tag_name, draft=True, **fields)
+        else:
+            changes = {key: value for key, value in fields.items() if release.get(key) != value}
+            if changes:
+                release = self.release_update(release["id"], **changes)
+        existing = {asset["name"]: asset for asset in self.release_asset_list(release["id"])}
+        report = ReleasePublishReport(release=release, uploaded=[], skipped=[], failed={})
+        pending = []
+        for asset in uploads:
+            current = existing.get(asset["name"])
+            if current and current["size"] == asset["path"].stat().st_size and current.get("digest") == (
+                f"sha256:{_file_sha256(asset['path'])}"
+            ):
+                report.skipped.append(asset["name"])
+                continue
+            if current:
+                self.release_asset_delete(current["id"])
+            pending.append(asset)
+
+        def upload(asset: dict) -> None:
+            for attempt in range(retries + 1):
+                try:
+                    if attempt:
+                        # A failed upload may leave an incomplete asset behind, which blocks the name.
+                        for current in self.release_asset_list(release["id"]):
+                            if current["name"] == asset["name"]:
+                                self.release_asset_delete(current["id"])
+                    self.release_asset_upload(
+                        release_id=release["id"],
+                        filepath=asset["path"],
+                        mime_type=asset.get("mime_type", ""),
+                        name=asset["name"],
+                        label=asset.get("label", ""),
+                    )
+                    report.uploaded.append(asset["name"])
+                    return
+                except Exception as e:
+                    if attempt == retries:
+                        report.failed[asset["name"]] = e
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(upload, pending))
+        if release["draft"] and not draft and not report.failed:
+            publish = {"draft": False} | ({"make_latest": make_latest} if make_latest else {})
+            release = self.release_update(release["id"], **publish)
+        elif make_latest and not release["draft"]:
+            release = self.release_update(release["id"], make_latest=make_latest)
+        return report._replace(release=release)
+
+    def release_assets_download(
+        self,
+        release: int | str | None = None,
+        patterns: str | Sequence[str] = "*",
+        download_path: str | Path = ".",
+        create_dirs: bool = True,
+        max_workers: int = 8,
+        chunk_size: int = 2 ** 20,
+        latest: bool = False,
+    ) -> AssetsDownloadReport:
+        """Download the assets of a release whose names match any of the given patterns.
+
+        The assets of the release are listed once, and the matching assets are
+        streamed to disk concurrently. Assets that already exist locally with the same
+        size and SHA-256 digest are skipped, and downloaded files are hashed while they are streamed,
+        and verified against the digest reported by GitHub.
+
+        Parameters
+        ----------
+        release : int | str, optional
+            ID of the release, or its tag name. Required unless `latest` is True.
+        patterns : str | Sequence[str], default: '*'
+            Unix shell-style wildcard patterns (e.g., '*-linux-x86_64.tar.gz'),
+            matched case-sensitively against asset names.
+        download_path : str | pathlib.Path, default: '.'
+            Local directory to download the assets into.
+        create_dirs : bool, default: True
+            Whether to create the directory if it does not exist.
+        max_workers : int, default: 8
+            Maximum number of concurrent downloads.
+        chunk_size : int, default: 1048576
+            Number of bytes to read into memory at once.
+        latest : bool, default: False
+            Download the assets of the latest published release, instead of `release`.
+
+        Returns
+        -------
+        AssetsDownloadReport
+            Local paths of downloaded and skipped assets, and the download throughput.
+
+        Raises
+        ------
+        ValueError
+            If no release exists with the given tag name,
+            or if not exactly one of `release` and `latest` is given.
+        pylinks.exception.api.WebAPIValueError
+            If the digest of a downloaded file does not match the digest reported by GitHub;
+            the downloaded data is deleted, and any existing local file is left untouched.
+
+        References
+        ----------
+        - [GitHub API Docs](https://docs.github.com/en/rest/releases/assets?apiVersion=2022-11-28#get-a-release-asset)
+        """
+        if latest == (release is not None):
+            raise ValueError("Exactly one of 'release' and 'latest' must be given.")
+        if latest:
+            release = self._rest_query(query="releases/latest")["id"]
+        elif isinstance(release, str):
+            release_info = self._release_by_tag(release)
+            if release_info is None:
+                raise ValueError(f"No release found for tag '{release}'.")
+            release = release_info["id"]
+        patterns = [patterns] if isinstance(patterns, str) else patterns
+        download_path = Path(download_path)
+        report = AssetsDownloadReport(downloaded=[], skipped=[], size=0, duration=0.0)
+        pending = []
+        for asset in self.release_asset_list(release):
+            if not any(fnmatch.fnmatchcase(asset["name"], pattern) for pattern in patterns):
+                continue
+            filepath = download_path / asset["name"]
+            if (
+                asset.get("digest")
+                and filepath.is_file()
+                and filepath.stat().st_size == asset["size"]
+                and asset["digest"] == f"sha256:{_file_sha256(filepath)}"
+            ):
+                report.skipped.append(filepath)
+                continue
+            pending.append(asset)
+
+        def download(asset: dict) -> Path:
+            return self._github.rest_download(
+                query=f"repos/{self._username}/{self._name}/releases/assets/{asset['id']}",
+                filepath=download_path / asset["name"],
+                extra_headers={"Accept": "application/octet-stream"},
+                create_dirs=create_dirs,
+                overwrite=True,
+                chunk_size=chunk_size,
+                digest=asset.get("digest"),
+            )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            downloaded = list(executor.map(download, pending))
+        return report._replace(
+            downloaded=downloaded,
+            size=sum(asset["size"] for asset in pending),
+            duration=time.perf_counter() - start,
+        )
+
+    def _release_by_tag(self, tag_name: str) -> dict | None:
+        """Get the release for a tag, including draft releases, or None if it does not exist."""
+        try:
+            return self._rest_query(query=f"releases/tags/{tag_name}")
+        except _api_exception.WebAPIStatusCodeError as e:
+            if e.response.status_code != 404:
+                raise
+        # Draft releases are not returned by tag name; they are listed first among all releases.
+        for release in self._rest_query(query="releases?per_page=100"):
+            if release["draft"] and release["tag_name"] == tag_name:
+                return release
+        return None
+
     def rulesets(self, include_parents: bool = True) -> list[dict]:
         """
         List of all rulesets for the repository.
@@ -1341,17 +5342,21 @@ class Repo:
         ----------
         - [GitHub Docs](https://docs.github.com/en/rest/repos/rules?apiVersion=2022-11-28#get-all-repository-rulesets)
         """
-        rulesets = []
-        page = 1
-        while True:
-            response = self._rest_query(
-                f"rulesets?per_page=100&page={page}&includes_parents={'true' if include_parents else 'false'}"
-            )
-            rulesets.extend(response)
-            page += 1
-            if len(response) < 100:
-                break
-        return rulesets
+
+        def fetch():
+            rulesets = []
+            page = 1
+            while True:
+                response = self._rest_query(
+                    f"rulesets?per_page=100&page={page}&includes_parents={'true' if include_parents else 'false'}"
+                )
+                rulesets.extend(response)
+                page += 1
+                if len(response) < 100:
+                    break
+            return rulesets
+
+        return self._cached(f"rulesets:{include_parents}", fetch)
 
     def ruleset_create(
         self,
@@ -1451,6 +5456,38 @@ class Repo:
     ----------
     - [GitHub API Docs](https://docs.github.com/en/rest/repos/rules?apiVersion=2022-11-28#create-a-repository-ruleset)
     """
+        args = locals()
+        args.pop("self")
+        return self._rest_query(query="rulesets", verb="POST", json=self._ruleset_data(**args))
+
+    @staticmethod
+    def _ruleset_data(
+        name: str,
+        target: Literal['branch', 'tag'] = "branch",
+        enforcement: Literal['disabled', 'evaluate', 'active'] = 'active',
+        bypass_actors: list[
+           tuple[int, Literal['OrganizationAdmin', 'RepositoryRole', 'Team', 'Integration'], bool]
+        ] | None = None,
+        ref_name_include: list[str] | None = None,
+        ref_name_exclude: list[str] | None = None,
+        creation: bool = False,
+        update: bool = False,
+        update_allows_fetch_and_merge: bool = True,
+        deletion: bool = False,
+        required_linear_history: bool = False,
+        required_deployment_environments: list[str] | None = None,
+        required_signatures: bool = False,
+        required_pull_request: bool = False,
+        dismiss_stale_reviews_on_push: bool = False,
+        require_code_owner_review: bool = False,
+        require_last_push_approval: bool = False,
+        required_approving_review_count: int = 0,
+        required_review_thread_resolution: bool = False,
+        required_status_checks: list[tuple[str, int] | str] | None = None,
+        strict_required_status_checks_policy: bool = False,
+        non_fast_forward: bool = False,
+    ) -> dict:
+        """Create the request body of a ruleset from the arguments of `ruleset_create`."""
         data = {"name": name, "target": target, "enforcement": enforcement}
         if bypass_actors:
             data["bypass_actors"] = [
@@ -1523,7 +5560,7 @@ class Repo:
             rules.append({"type": "non_fast_forward"})
         if rules:
             data["rules"] = rules
-        return self._rest_query(query="rulesets", verb="POST", json=data)
+        return data
 
     def ruleset_update(
         self,
@@ -1807,16 +5844,19 @@ class Repo:
         """
         Create a branch linked to an issue.
 
+        Node IDs of the issue and the repository are resolved through the client's node-ID cache,
+        so that no lookup requests are needed when they are already known.
+
         Parameters
         ----------
         issue_id : str | int
-            ID of the issue.
+            Number of an issue in this repository, or node ID of an issue (in any repository).
         base_sha : str
             Commit SHA to base the new branch on.
         name : str, optional
             Name of the new branch. If not specified, defaults to issue number and title.
         repository_id : str | int, optional
-            ID of the repository to create the branch in. If not specified, defaults to the issue repository.
+            Node ID of the repository to create the branch in. Defaults to this repository.
 
         Returns
         -------
@@ -1828,15 +5868,13 @@ class Repo:
         ----------
         - [GitHub API Docs](https://docs.github.com/en/graphql/reference/mutations#createlinkedbranch)
         """
-        args = locals()
-        args.pop("self")
-        input_map = {
-            "issue_id": "issueId",
-            "base_sha": "oid",
-            "name": "name",
-            "repository_id": "repositoryId",
+        inputs = {
+            "issueId": self.issue_node_id(issue_id) if isinstance(issue_id, int) else issue_id,
+            "oid": base_sha,
+            "repositoryId": repository_id or self.node_id,
         }
-        inputs = {input_map[k]: v for k, v in args.items() if v is not None}
+        if name is not None:
+            inputs["name"] = name
         data = self._github.graphql_mutation(
             mutation_name="createLinkedBranch",
             mutation_input_name="CreateLinkedBranchInput",
@@ -1866,16 +5904,30 @@ class Repo:
         """
         return self._rest_query(query=f"branches/{old_name}/rename", verb="POST", json={"new_name": new_name})
 
-    def branch_protection_rules(self) -> list[dict]:
+    def branch_protection_rules(
+        self, fields: Literal["minimal", "full"] | str | Sequence[str] = "minimal"
+    ) -> list[dict]:
         """
         Get the branch protection rules for the repository.
 
+        Parameters
+        ----------
+        fields : {'minimal', 'full'} | str | Sequence[str], default: 'minimal'
+            Fields to fetch for each rule, either as the name of a preset,
+            a GraphQL selection string, or a sequence of field names.
+            The 'minimal' preset fetches "id" and "pattern",
+            and the 'full' preset fetches all settings of the rule,
+            including the node IDs of actors in its allowance lists.
+
         References
         ----------
         - [GitHub API Docs](https://docs.github.com/en/graphql/reference/objects#branchprotectionruleconnection)
         """
-        payload = "branchProtectionRules(first: 100) {nodes {id, pattern}}"
-        data = self._graphql_query(payload)
+        payload = (
+            f"branchProtectionRules(first: 100) "
+            f"{{nodes {{{_graphql_fields(fields, _BRANCH_PROTECTION_RULE_FIELDS)}}}}}"
+        )
+        data = self._graphql_query(payload, operation="branch_protection_rules")
         return data["branchProtectionRules"]["nodes"]
 
     def branch_protection_rule_create(
@@ -1917,7 +5969,7 @@ class Repo:
         args = locals()
         args.pop("self")
         inputs = self._prepare_branch_protection_rule_input(args)
-        inputs["repositoryId"] = self.info["node_id"]
+        inputs["repositoryId"] = self.node_id
         data = self._github.graphql_mutation(
             mutation_name="createBranchProtectionRule",
             mutation_input_name="CreateBranchProtectionRuleInput",
@@ -2016,3 +6068,238 @@ class Repo:
                 "The description must be 100 characters or less."
             )
         return
+
+
+def _ruleset_equal(data: dict, current: dict) -> bool:
+    """Check whether an existing ruleset (as returned by the REST API)
+    matches a ruleset request body, ignoring fields and parameters not set in the body.
+    """
+    if any(data[key] != current.get(key) for key in ("name", "target", "enforcement")):
+        return False
+    if not _is_subset(data.get("bypass_actors", []), current.get("bypass_actors") or []):
+        return False
+    ref_name = (current.get("conditions") or {}).get("ref_name") or {}
+    desired_ref_name = data.get("conditions", {}).get("ref_name", {})
+    for key in ("include", "exclude"):
+        if sorted(desired_ref_name.get(key, [])) != sorted(ref_name.get(key, [])):
+            return False
+    return _is_subset(data.get("rules", []), current.get("rules") or [])
+
+
+def _is_subset(desired, current) -> bool:
+    """Check whether all (nested) values of `desired` are present in `current`.
+
+    Dictionaries match if all keys of `desired` match;
+    lists match if they have the same length and each element of `desired` matches an element of `current`.
+    """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(
+            key in current and _is_subset(value, current[key]) for key, value in desired.items()
+        )
+    if isinstance(desired, list):
+        return (
+            isinstance(current, list)
+            and len(desired) == len(current)
+            and all(any(_is_subset(item, current_item) for current_item in current) for item in desired)
+        )
+    return desired == current
+
+
+def _batch_request_errors(error: _api_exception.WebAPIError) -> list[dict]:
+    """Get GraphQL-style errors to attribute to each item of a batched request that failed as a whole."""
+    errors = error.response.get("errors") if isinstance(error, _api_exception.GraphQLResponseError) else None
+    return [
+        item | {"exception": error}
+        for item in errors or [{"message": f"Request failed with {type(error).__name__}."}]
+    ]
+
+
+def _git_blob_hash(filepath: Path, chunk_size: int = 2 ** 16) -> str:
+    """Compute the git blob hash (SHA-1) of a file, without reading it into memory at once.
+
+    References
+    ----------
+    - [Git Book: Git Objects](https://git-scm.com/book/en/v2/Git-Internals-Git-Objects)
+    """
+    sha = hashlib.sha1(f"blob {filepath.stat().st_size}\0".encode())
+    with open(filepath, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _file_sha256(filepath: Path, chunk_size: int = 2 ** 20) -> str:
+    """Compute the SHA-256 hash of a file, without reading it into memory at once."""
+    sha = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _version_key(version: str) -> tuple[int, int, int]:
+    """Parse a (possibly partial) 'X.Y.Z' version number into a tuple of integers, padding with zeros."""
+    parts = tuple(int(part) for part in version.split("."))
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f"Invalid version number: '{version}'.")
+    return parts + (0,) * (3 - len(parts))
+
+
+def _download_target(filepath: str | Path, create_dirs: bool, overwrite: bool) -> Path:
+    """Resolve a local download path, checking for existing files and creating parent directories."""
+    filepath = Path(filepath).resolve()
+    if filepath.exists():
+        if filepath.is_dir():
+            raise ValueError(f"Filepath {filepath} is a directory.")
+        if not overwrite:
+            raise FileExistsError(f"File {filepath} already exists.")
+    if not filepath.parent.exists():
+        if not create_dirs:
+            raise FileNotFoundError(f"Directory {filepath.parent} does not exist.")
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+    return filepath
+
+
+@contextmanager
+def _atomic_write(filepath: Path):
+    """Open a temporary file next to a target file for binary writing,
+    and move it into place only when the block completes without error.
+
+    An interrupted write never leaves a partial file at the target path;
+    the temporary file is deleted instead.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".part", delete=False
+    ) as f:
+        try:
+            yield f
+        except BaseException:
+            f.close()
+            Path(f.name).unlink()
+            raise
+    Path(f.name).replace(filepath)
+    return
+
+
+def _rate_limit_delay(response: Response, attempt: int, backoff_init: float) -> float | None:
+    """Get the time to wait before retrying a request that failed with a rate-limit response.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The failed response.
+    attempt : int
+        Number of previous retries of the request.
+    backoff_init : float
+        Time (in seconds) to wait after the first rate-limit response that does not specify a wait time.
+        This is doubled after each retry.
+
+    Returns
+    -------
+    float | None
+        Time to wait in seconds, or `None` when the response is not a rate-limit response.
+
+    References
+    ----------
+    - [GitHub API Docs](https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api?apiVersion=2022-11-28#exceeding-the-rate-limit)
+    """
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        return float(retry_after)
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return max(int(response.headers.get("X-RateLimit-Reset", 0)) - time.time(), 0) + 1
+    if response.status_code == 429 or "secondary rate limit" in response.text.lower():
+        return backoff_init * 2 ** attempt
+    return None
+
+
+def _check_unique_label_names(labels: Sequence[dict]) -> None:
+    """Raise a ValueError if two labels have the same name, compared case-insensitively as in GitHub."""
+    names = {}
+    for label in labels:
+        key = label["name"].lower()
+        if key in names:
+            raise ValueError(f"Duplicate label names: '{names[key]}' and '{label['name']}'.")
+        names[key] = label["name"]
+    return
+
+
+def _graphql_fields(fields: str | Sequence[str], presets: dict[str, str]) -> str:
+    """Get a GraphQL selection string from a preset name, a selection string, or a sequence of field names."""
+    if isinstance(fields, str):
+        return presets.get(fields, fields)
+    if not fields:
+        raise ValueError("At least one field must be specified.")
+    return ", ".join(fields)
+
+
+def _graphql_estimate(selection: str, default_page_size: int = 100) -> tuple[int, int]:
+    """Estimate the number of nodes and the rate-limit cost of a GraphQL selection.
+
+    Connections are recognized by their `first` or `last` arguments;
+    when these are given as variables, `default_page_size` is assumed.
+
+    Returns
+    -------
+    tuple[int, int]
+        Number of nodes, and rate-limit cost in points.
+
+    References
+    ----------
+    - [GitHub API Docs](https://docs.github.com/en/graphql/overview/rate-limits-and-node-limits-for-the-graphql-api)
+    """
+    page_size_pattern = re.compile(r"\b(?:first|last)\s*:\s*(\d+|\$\w+)")
+    # Empty the string literals, so that their content is not mistaken for syntax
+    selection = _GRAPHQL_STRING.sub('""', selection)
+    nodes = 0
+    requests = 0
+    stack = [1]
+    pending = 1
+    idx = 0
+    while idx < len(selection):
+        char = selection[idx]
+        if char == "(":
+            end = selection.find(")", idx)
+            end = len(selection) if end == -1 else end
+            match = page_size_pattern.search(selection, idx, end)
+            if match:
+                value = match.group(1)
+                pending = int(value) if value.isdigit() else default_page_size
+            idx = end
+        elif char == "{":
+            if pending > 1:
+                # Connection: one request per parent node, returning up to `pending` nodes each.
+                requests += stack[-1]
+                nodes += stack[-1] * pending
+            stack.append(stack[-1] * pending)
+            pending = 1
+        elif char == "}":
+            if len(stack) > 1:
+                stack.pop()
+        idx += 1
+    return nodes, max(1, round(requests / 100))
+
+
+def _lock_file(file) -> None:
+    """Acquire an exclusive lock on an open file, blocking until it is available."""
+    if _fcntl:
+        _fcntl.flock(file.fileno(), _fcntl.LOCK_EX)
+        return
+    file.seek(0)
+    while True:
+        try:
+            _msvcrt.locking(file.fileno(), _msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(file) -> None:
+    if _fcntl:
+        _fcntl.flock(file.fileno(), _fcntl.LOCK_UN)
+        return
+    file.seek(0)
+    _msvcrt.locking(file.fileno(), _msvcrt.LK_UNLCK, 1)
+    return
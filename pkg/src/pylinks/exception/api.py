@@ -119,6 +119,7 @@ class GraphQLResponseError(WebAPIError):
                 ),
             )
         )
+        self.response = response
         self.query = query
         return
 
@@ -0,0 +1,77 @@
+import io
+import json
+
+import pytest
+import requests
+
+from pylinks.api.github import GitHub, MutationQueue
+
+
+def make_response(
+    url: str,
+    status_code: int = 200,
+    body: dict | list | str | bytes | None = None,
+    headers: dict | None = None,
+    stream: bytes | None = None,
+) -> requests.Response:
+    """Create a `requests.Response` without sending a request."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = "Test"
+    response.headers.update(headers or {})
+    if stream is not None:
+        response.raw = io.BytesIO(stream)
+    elif isinstance(body, (dict, list)):
+        response._content = json.dumps(body).encode()
+        response.headers.setdefault("Content-Type", "application/json")
+    elif isinstance(body, str):
+        response._content = body.encode()
+    else:
+        response._content = body or b""
+    return response
+
+
+class FakeAPI:
+    """Replacement for `requests.request`, recording each call and answering it with a handler.
+
+    The handler is called with the HTTP method, the URL, and the keyword arguments of the call,
+    and returns either a `requests.Response`, or the arguments of `make_response` after the URL.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def __call__(self, method, url, **kwargs):
+        url = str(url)
+        self.calls.append((method, url, kwargs))
+        result = self.handler(method, url, kwargs)
+        if isinstance(result, requests.Response):
+            return result
+        if not isinstance(result, tuple):
+            result = (200, result)
+        return make_response(url, *result)
+
+    def paths(self, method: str | None = None) -> list[str]:
+        """Paths (with query strings) of the recorded calls, optionally filtered by method."""
+        return [
+            url.split("://", 1)[1].split("/", 1)[1] for verb, url, _ in self.calls if method in (None, verb)
+        ]
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """Install a `FakeAPI` for `requests.request`; call the fixture with a handler to use it."""
+
+    def install(handler) -> FakeAPI:
+        api = FakeAPI(handler)
+        monkeypatch.setattr(requests, "request", api)
+        return api
+
+    return install
+
+
+@pytest.fixture
+def github() -> GitHub:
+    return GitHub(token="token", mutation_queue=MutationQueue(min_interval=0))
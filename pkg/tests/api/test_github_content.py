@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from conftest import make_response
+
+LISTING = [{"name": "a.md", "path": "docs/a.md", "type": "file"}]
+
+
+def contents_handler(files: dict[str, bytes], stream_factory=None):
+    """Handler for the Contents API, answering raw requests for files and JSON listings for directories."""
+
+    def handler(method, url, kwargs):
+        path = url.split("/repos/o/r/contents/", 1)[1].split("?", 1)[0]
+        raw = kwargs["headers"].get("Accept") == "application/vnd.github.raw+json"
+        if path not in files:
+            # GitHub returns the JSON listing of a directory even with the raw media type
+            body = json.dumps(LISTING).encode()
+            return make_response(url, stream=body, headers={"Content-Type": "application/json"}) if raw else LISTING
+        if not raw:
+            return {"name": path, "type": "file", "encoding": "base64"}
+        response = make_response(url, stream=files[path], headers={"Content-Type": "application/octet-stream"})
+        if stream_factory:
+            response.raw = stream_factory()
+        return response
+
+    return handler
+
+
+def test_raw_content(fake_api, github):
+    api = fake_api(contents_handler({"docs/a.md": b"\x00binary"}))
+    repo = github.repo("o", "r")
+    assert repo.content("docs/a.md", ref="v1", raw=True) == b"\x00binary"
+    assert api.paths() == ["repos/o/r/contents/docs/a.md?ref=v1"]
+    assert repo.content("docs/a.md")["encoding"] == "base64"
+    assert repo.content("docs") == LISTING
+
+
+def test_raw_content_of_directory_is_rejected(fake_api, github):
+    fake_api(contents_handler({}))
+    with pytest.raises(ValueError):
+        github.repo("o", "r").content("docs/", raw=True)
+
+
+def test_download_file(fake_api, github, tmp_path):
+    fake_api(contents_handler({"docs/a.md": b"content"}))
+    repo = github.repo("o", "r")
+    filepath = repo.download_file("docs/a.md", download_path=tmp_path / "new", chunk_size=2)
+    assert filepath == tmp_path / "new" / "a.md"
+    assert filepath.read_bytes() == b"content"
+    with pytest.raises(FileExistsError):
+        repo.download_file("docs/a.md", download_path=tmp_path / "new")
+    renamed = repo.download_file("docs/a.md", download_path=tmp_path, download_filename="b.md")
+    assert renamed.read_bytes() == b"content"
+
+
+def test_download_file_of_directory_creates_nothing(fake_api, github, tmp_path):
+    fake_api(contents_handler({}))
+    with pytest.raises(ValueError):
+        github.repo("o", "r").download_file("docs", download_path=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+class BrokenStream:
+    def __init__(self):
+        self.reads = 0
+
+    def read(self, *args, **kwargs):
+        self.reads += 1
+        if self.reads > 1:
+            raise OSError("connection reset")
+        return b"partial"
+
+    def close(self):
+        pass
+
+
+def test_interrupted_download_keeps_existing_file(fake_api, github, tmp_path):
+    target = tmp_path / "a.md"
+    target.write_bytes(b"old")
+    fake_api(contents_handler({"docs/a.md": b"new"}, stream_factory=BrokenStream))
+    with pytest.raises(OSError):
+        github.repo("o", "r").download_file("docs/a.md", download_path=tmp_path, overwrite=True)
+    assert target.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [target]
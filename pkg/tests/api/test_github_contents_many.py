@@ -0,0 +1,69 @@
+import pytest
+
+from pylinks.api.github import _GRAPHQL_RATE_LIMIT_ALIAS
+from pylinks.exception.api import GraphQLResponseError
+
+from conftest import make_response
+
+BLOBS = {
+    "HEAD:README.md": {"text": "readme", "isBinary": False, "isTruncated": False},
+    "v1:README.md": {"text": "old readme", "isBinary": False, "isTruncated": False},
+    "HEAD:logo.png": {"text": None, "isBinary": True, "isTruncated": False},
+    "HEAD:large.txt": {"text": "trunc", "isBinary": False, "isTruncated": True},
+    "HEAD:docs": {},  # a tree does not match the `... on Blob` fragment
+}
+RAW = {"logo.png": b"\x89PNG\x00", "large.txt": "truncated no more: é".encode()}
+
+
+def contents_handler(calls: list):
+    def handler(method, url, kwargs):
+        if url.endswith("/graphql"):
+            variables = kwargs["json"]["variables"]
+            data = {_GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 1}}
+            errors = []
+            for name, expression in variables.items():
+                alias = name.removesuffix("_expression")
+                if f'{alias}: repository(name: "missing"' in kwargs["json"]["query"]:
+                    data[alias] = None
+                    errors.append({"type": "NOT_FOUND", "path": [alias], "message": "Could not resolve"})
+                else:
+                    data[alias] = {"object": BLOBS.get(expression)}
+            return {"data": data} | ({"errors": errors} if errors else {})
+        calls.append((url.split("/repos/", 1)[1], kwargs["headers"]["Accept"]))
+        path = url.split("/contents/", 1)[1].split("?", 1)[0]
+        return make_response(url, stream=RAW[path])
+
+    return handler
+
+
+def test_text_binary_truncated_and_missing(fake_api, github):
+    calls = []
+    fake_api(contents_handler(calls))
+    contents = github.contents_many(
+        [
+            ("o", "r", None, "README.md"),
+            ("o", "r", "v1", "/README.md"),
+            ("o", "r", None, "logo.png"),
+            ("o", "r", None, "large.txt"),
+            ("o", "r", None, "missing.txt"),
+            ("o", "r", None, "docs/"),
+        ]
+    )
+    assert contents == ["readme", "old readme", b"\x89PNG\x00", "truncated no more: é", None, None]
+    # Only binary and truncated blobs fall back to the REST API, with the raw media type
+    assert sorted(calls) == [
+        ("o/r/contents/large.txt", "application/vnd.github.raw+json"),
+        ("o/r/contents/logo.png", "application/vnd.github.raw+json"),
+    ]
+
+
+def test_repo_contents_many_maps_paths(fake_api, github):
+    fake_api(contents_handler([]))
+    contents = github.repo("o", "r").contents_many(["README.md", "missing.txt", "logo.png"], max_size=2)
+    assert contents == {"README.md": "readme", "missing.txt": None, "logo.png": b"\x89PNG\x00"}
+
+
+def test_missing_repository_is_raised(fake_api, github):
+    fake_api(contents_handler([]))
+    with pytest.raises(GraphQLResponseError):
+        github.contents_many([("o", "r", None, "README.md"), ("o", "missing", None, "README.md")])
@@ -0,0 +1,199 @@
+import hashlib
+import io
+import random
+import tarfile
+from pathlib import Path
+from typing import Sequence
+
+import pytest
+
+from pylinks.exception.api import WebAPIValueError
+
+from conftest import make_response
+
+TREES = {
+    "HEAD": [
+        {"path": "README.md", "type": "blob", "sha": "r"},
+        {"path": "docs", "type": "tree", "sha": "docs"},
+        {"path": "src", "type": "tree", "sha": "src"},
+    ],
+    "docs": [{"path": "index.md", "type": "blob", "sha": "i"}],
+    "src": [
+        {"path": "a.py", "type": "blob", "sha": "a"},
+        {"path": "pkg", "type": "tree", "sha": "pkg"},
+    ],
+    "pkg": [{"path": "b.py", "type": "blob", "sha": "b"}],
+}
+RECURSIVE = {
+    "src": [
+        {"path": "a.py", "type": "blob", "sha": "a"},
+        {"path": "pkg", "type": "tree", "sha": "pkg"},
+        {"path": "pkg/b.py", "type": "blob", "sha": "b"},
+    ],
+}
+
+
+def tree_handler(truncated: bool = False):
+    def handler(method, url, kwargs):
+        query = url.split("/git/trees/")[1]
+        sha, _, params = query.partition("?")
+        if params == "recursive=1":
+            return {"sha": sha, "tree": [] if truncated else RECURSIVE[sha], "truncated": truncated}
+        return {"sha": sha, "tree": TREES[sha], "truncated": False}
+
+    return handler
+
+
+def test_tree_blobs_lists_only_the_subtree(fake_api, github):
+    api = fake_api(tree_handler())
+    blobs = github.repo("o", "r").tree_blobs("src/")
+    assert [blob["path"] for blob in blobs] == ["a.py", "pkg/b.py"]
+    assert api.paths() == ["repos/o/r/git/trees/HEAD", "repos/o/r/git/trees/src?recursive=1"]
+
+
+def test_tree_blobs_walks_only_the_truncated_subtree(fake_api, github):
+    api = fake_api(tree_handler(truncated=True))
+    blobs = github.repo("o", "r").tree_blobs("src")
+    assert [blob["path"] for blob in blobs] == ["a.py", "pkg/b.py"]
+    assert not any("docs" in path for path in api.paths())
+
+
+def test_tree_blobs_non_recursive_and_missing(fake_api, github):
+    fake_api(tree_handler())
+    repo = github.repo("o", "r")
+    assert [blob["path"] for blob in repo.tree_blobs("src/pkg", recursive=False)] == ["b.py"]
+    assert [blob["path"] for blob in repo.tree_blobs(recursive=False)] == ["README.md"]
+    assert repo.tree_blobs("src/missing") == []
+
+
+class BrokenStream:
+    def __init__(self):
+        self.reads = 0
+
+    def read(self, *args, **kwargs):
+        self.reads += 1
+        if self.reads > 1:
+            raise OSError("connection reset")
+        return b"partial"
+
+    def close(self):
+        pass
+
+
+def test_rest_download_replaces_target_only_when_complete(fake_api, github, tmp_path):
+    target = tmp_path / "file.bin"
+    target.write_bytes(b"old")
+
+    def broken(method, url, kwargs):
+        response = make_response(url)
+        response.raw = BrokenStream()
+        return response
+
+    fake_api(broken)
+    with pytest.raises(OSError):
+        github.rest_download("repos/o/r/git/blobs/x", target, overwrite=True)
+    assert target.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [target]
+
+    fake_api(lambda method, url, kwargs: make_response(url, stream=b"new content"))
+    assert github.rest_download("repos/o/r/git/blobs/x", target, overwrite=True) == target
+    assert target.read_bytes() == b"new content"
+    assert list(tmp_path.iterdir()) == [target]
+    with pytest.raises(FileExistsError):
+        github.rest_download("repos/o/r/git/blobs/x", target)
+
+
+def test_rest_download_verifies_digest_while_streaming(fake_api, github, tmp_path):
+    target = tmp_path / "file.bin"
+    target.write_bytes(b"old")
+    fake_api(lambda method, url, kwargs: make_response(url, stream=b"tampered"))
+    with pytest.raises(WebAPIValueError):
+        github.rest_download(
+            "repos/o/r/git/blobs/x", target, overwrite=True, digest=f"sha256:{hashlib.sha256(b'new').hexdigest()}"
+        )
+    assert target.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [target]
+
+    fake_api(lambda method, url, kwargs: make_response(url, stream=b"new"))
+    digest = f"sha256:{hashlib.sha256(b'new').hexdigest()}"
+    github.rest_download("repos/o/r/git/blobs/x", target, overwrite=True, digest=digest, chunk_size=1)
+    assert target.read_bytes() == b"new"
+
+
+def tarball(members: dict[str, bytes | None], symlinks: Sequence[str] = ()) -> bytes:
+    """Gzipped tarball of a repository, with members given relative to its top-level directory."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(f"o-r-0123abc/{name}")
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                archive.addfile(info)
+                continue
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+        for name in symlinks:
+            info = tarfile.TarInfo(f"o-r-0123abc/{name}")
+            info.type = tarfile.SYMTYPE
+            info.linkname = "/etc/passwd"
+            archive.addfile(info)
+    return buffer.getvalue()
+
+
+def serve_tarball(data: bytes):
+    def handler(method, url, kwargs):
+        assert "/repos/o/r/tarball" in url
+        return make_response(url, stream=data)
+
+    return handler
+
+
+MEMBERS = {
+    "README.md": b"readme",
+    "docs": None,
+    "docs/a.md": b"a",
+    "docs/sub/b.md": b"b",
+    "documents/c.md": b"c",
+}
+
+
+def files_in(directory: Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in directory.rglob("*") if path.is_file()
+    }
+
+
+def test_archive_extracts_only_files_under_path(fake_api, github, tmp_path):
+    fake_api(serve_tarball(tarball(MEMBERS, symlinks=["docs/link"])))
+    paths = github.repo("o", "r").download_dir("docs", download_path=tmp_path, strategy="archive")
+    assert sorted(paths) == [tmp_path / "a.md", tmp_path / "sub" / "b.md"]
+    assert files_in(tmp_path) == {"a.md": b"a", "sub/b.md": b"b"}
+
+
+def test_archive_non_recursive(fake_api, github, tmp_path):
+    fake_api(serve_tarball(tarball(MEMBERS)))
+    paths = github.repo("o", "r").download_dir("/docs/", recursive=False, download_path=tmp_path, strategy="archive")
+    assert paths == [tmp_path / "a.md"]
+    fake_api(serve_tarball(tarball(MEMBERS)))
+    github.repo("o", "r").download_dir(recursive=False, download_path=tmp_path / "root", strategy="archive")
+    assert files_in(tmp_path / "root") == {"README.md": b"readme"}
+
+
+@pytest.mark.parametrize("name", ["docs/../../evil.md", "docs/sub/../../../evil.md", "/etc/evil.md"])
+def test_archive_rejects_unsafe_paths(fake_api, github, tmp_path, name):
+    fake_api(serve_tarball(tarball({name: b"evil"})))
+    path = "docs" if name.startswith("docs") else ""
+    with pytest.raises(RuntimeError):
+        github.repo("o", "r").download_dir(path, download_path=tmp_path / "out", strategy="archive")
+    assert not list(tmp_path.rglob("evil.md"))
+
+
+def test_archive_never_leaves_partial_files(fake_api, github, tmp_path):
+    large = random.Random(0).randbytes(2 ** 18)  # incompressible
+    data = tarball({"a.md": b"a", "large.bin": large})
+    fake_api(serve_tarball(data[:len(data) // 2]))
+    with pytest.raises((EOFError, tarfile.ReadError)):
+        github.repo("o", "r").download_dir(download_path=tmp_path, strategy="archive")
+    assert files_in(tmp_path) == {"a.md": b"a"}
+    assert list(tmp_path.iterdir()) == [tmp_path / "a.md"]
@@ -0,0 +1,81 @@
+import json
+
+from pylinks.api.github import GitHub, _AdaptivePageSize, _GRAPHQL_RATE_LIMIT_ALIAS
+
+
+def test_document_selects_rate_limit_after_trailing_comment():
+    document = GitHub._graphql_document("query", "viewer {login}  # trailing comment")
+    lines = document.splitlines()
+    assert lines[0] == "query {viewer {login}  # trailing comment"
+    assert lines[1] == f"{_GRAPHQL_RATE_LIMIT_ALIAS}: rateLimit {{cost remaining resetAt}}"
+    assert lines[2] == "}"
+
+
+def test_document_without_cost():
+    document = GitHub._graphql_document("mutation($x:Int!)", "doIt(x: $x) {ok}", cost=False)
+    assert "rateLimit" not in document
+    assert document == "mutation($x:Int!) {doIt(x: $x) {ok}\n}"
+
+
+def test_query_cost_is_recorded_and_removed(fake_api, github):
+    def handler(method, url, kwargs):
+        assert "rateLimit" in kwargs["json"]["query"]
+        return {"data": {"viewer": {"login": "me"}, _GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 3}}}
+
+    fake_api(handler)
+    assert github.graphql_query("viewer {login}\n") == {"viewer": {"login": "me"}}
+    assert github.graphql_query("viewer {login}", operation="me") == {"viewer": {"login": "me"}}
+    costs = github.graphql_costs
+    assert costs["viewer"]["calls"] == 1 and costs["viewer"]["cost"] == 3
+    assert costs["me"]["calls"] == 1
+
+
+def test_mutation_does_not_select_cost(fake_api, github):
+    api = fake_api(lambda method, url, kwargs: {"data": {"addStar": {"clientMutationId": None}}})
+    github.graphql_mutation("addStar", "AddStarInput", {"starrableId": "ID"}, "clientMutationId")
+    assert "rateLimit" not in api.calls[0][2]["json"]["query"]
+    assert github.graphql_costs["addStar"]["cost"] == 1
+
+
+def test_adaptive_page_size_is_opt_in():
+    page_size = _AdaptivePageSize(100)
+    page_size.update(cost=50, seconds=60)
+    assert page_size.size == 100
+
+
+def test_adaptive_page_size_approaches_targets_within_bounds():
+    page_size = _AdaptivePageSize(100, target_seconds=5)
+    page_size.update(cost=1, seconds=20)
+    assert page_size.size == 50  # at most halved per page
+    page_size.update(cost=1, seconds=6)
+    assert page_size.size == 42
+    page_size = _AdaptivePageSize(40, target_cost=10)
+    page_size.update(cost=1, seconds=1)
+    assert page_size.size == 80  # at most doubled per page
+    page_size.update(cost=1, seconds=1)
+    assert page_size.size == 100  # capped at the maximum
+
+
+def test_search_keeps_default_page_size(fake_api, github):
+    sizes = []
+
+    def handler(method, url, kwargs):
+        query = kwargs["json"]["query"]
+        sizes.append(int(query.split("first: ")[1].split(")")[0]))
+        page = len(sizes)
+        return {
+            "data": {
+                "search": {
+                    "pageInfo": {
+                        "startCursor": "s", "endCursor": f"c{page}", "hasNextPage": page < 3, "hasPreviousPage": False
+                    },
+                    "nodes": [{"number": page}],
+                },
+                _GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 1},
+            }
+        }
+
+    fake_api(handler)
+    pages = github.search_code_graphql("is:issue", "issue", "nodes {... on Issue {number}}")
+    assert [page["nodes"][0]["number"] for page in pages] == [1, 2, 3]
+    assert sizes == [100, 100, 100]
@@ -0,0 +1,110 @@
+import re
+
+import pytest
+
+from pylinks.api.github import GitHub, _GRAPHQL_RATE_LIMIT_ALIAS, _graphql_estimate
+from pylinks.exception.api import GraphQLResponseError
+
+
+def echo(errors=None):
+    """Handler answering each aliased field of a document with its alias."""
+
+    def handler(method, url, kwargs):
+        aliases = re.findall(r"\b([qm]\d+): ", kwargs["json"]["query"])
+        data = {alias: {"alias": alias} for alias in aliases}
+        if "rateLimit" in kwargs["json"]["query"]:
+            data[_GRAPHQL_RATE_LIMIT_ALIAS] = {"cost": 1}
+        response = {"data": data}
+        document_errors = [error for error in errors or [] if error.get("path", aliases)[0] in aliases]
+        if document_errors:
+            response["errors"] = document_errors
+            for error in document_errors:
+                if error.get("path"):
+                    data[error["path"][0]] = None
+        return response
+
+    return handler
+
+
+def documents(api) -> list[str]:
+    return [kwargs["json"]["query"] for _, _, kwargs in api.calls]
+
+
+def test_aliases_and_variables_are_rewritten(fake_api, github):
+    api = fake_api(echo())
+    results = github.graphql_query_batch(
+        [
+            ('repo: repository(name: $name, owner: "price $5") {id}', {"name": ("r", "String", True)}),
+            'viewer {login}',
+        ]
+    )
+    assert [result.data for result in results] == [{"alias": "q0"}, {"alias": "q1"}]
+    assert all(result.errors == [] for result in results)
+    document = documents(api)[0]
+    assert document.startswith("query($q0_name:String!) {")
+    assert 'q0: repository(name: $q0_name, owner: "price $5") {id}' in document
+    assert "q1: viewer {login}" in document
+    assert api.calls[0][2]["json"]["variables"] == {"q0_name": "r"}
+
+
+def test_batches_are_split_on_size(fake_api, github):
+    api = fake_api(echo())
+    results = github.graphql_query_batch(["viewer {login}"] * 5, max_size=2)
+    assert [result.data["alias"] for result in results] == ["q0", "q1", "q2", "q3", "q4"]
+    assert [len(re.findall(r"\bq\d+: ", document)) for document in documents(api)] == [2, 2, 1]
+
+
+def test_batches_are_split_on_nodes_and_cost():
+    nested = 'repository(name: "r", owner: "o") {issues(first: 100) {nodes {labels(first: 100) {nodes {name}}}}}'
+    assert _graphql_estimate(nested) == (10100, 1)
+    assert GitHub._graphql_batches([nested] * 3, max_size=50, max_nodes=20_200, max_cost=5000) == [[0, 1], [2]]
+    assert GitHub._graphql_batches([nested] * 3, max_size=50, max_nodes=500_000, max_cost=1) == [[0], [1], [2]]
+    # A selection above the limits is still sent, on its own
+    assert GitHub._graphql_batches([nested, "viewer {login}"], 50, 100, 5000) == [[0], [1]]
+
+
+@pytest.mark.parametrize(
+    "selection, expected",
+    [
+        ('repository(name: "a)b", owner: "o") {issues(first: 100) {nodes {labels(first: 100) {id}}}}', (10100, 1)),
+        ('search(query: "a (b) c", first: 50) {nodes {id}}', (50, 1)),
+        ('search(query: "first: 10 {", first: $n) {nodes {id}}', (100, 1)),
+        ('search(query: """a "(b)" c""", last: 5) {nodes {id}}', (5, 1)),
+    ],
+)
+def test_estimate_ignores_string_literals(selection, expected):
+    assert _graphql_estimate(selection) == expected
+
+
+def test_variables_in_strings_are_not_renamed():
+    selection = 'repository(name: "price $5 \\" $x", owner: $owner) {id}'
+    assert GitHub._graphql_aliased_selection(selection, "q3") == (
+        'repository(name: "price $5 \\" $x", owner: $q3_owner) {id}'
+    )
+
+
+def test_errors_are_attributed_to_aliases(fake_api, github):
+    errors = [
+        {"message": "not found", "path": ["q1", "repository"]},
+        {"message": "something went wrong"},
+    ]
+    fake_api(echo(errors))
+    results = github.graphql_query_batch(["viewer {login}"] * 3, raise_errors=False)
+    assert [result.data for result in results] == [{"alias": "q0"}, None, {"alias": "q2"}]
+    assert results[0].errors == [errors[1]]
+    assert results[1].errors == errors
+    with pytest.raises(GraphQLResponseError):
+        github.graphql_query_batch(["viewer {login}"] * 3)
+
+
+def test_mutation_batch(fake_api, github):
+    api = fake_api(echo([{"message": "forbidden", "path": ["m2"]}]))
+    mutations = [("addStar", "AddStarInput", {"starrableId": f"ID{idx}"}, "clientMutationId") for idx in range(3)]
+    results = github.graphql_mutation_batch(mutations, max_size=2, raise_errors=False)
+    assert [result.data for result in results] == [{"alias": "m0"}, {"alias": "m1"}, None]
+    assert [len(result.errors) for result in results] == [0, 0, 1]
+    first, second = documents(api)
+    assert first.startswith("mutation($m0:AddStarInput!, $m1:AddStarInput!) {")
+    assert "m1: addStar(input:$m1) {clientMutationId}" in first
+    assert "rateLimit" not in first
+    assert api.calls[1][2]["json"]["variables"] == {"m2": {"starrableId": "ID2"}}
@@ -0,0 +1,23 @@
+from pylinks.api.github import GitHub, Repo, User
+
+
+def test_handles_share_the_client(github):
+    repo = github.repo("o", "r")
+    assert repo._github is github
+    assert github.user("o").repo("r")._github is github
+
+
+def test_standalone_handles_create_a_client(fake_api):
+    api = fake_api(lambda method, url, kwargs: {"authorization": kwargs["headers"].get("Authorization")})
+    repo = Repo("o", "r", token="secret")
+    assert isinstance(repo._github, GitHub)
+    assert repo.info == {"authorization": "Bearer secret"}
+    assert Repo("o", "r", "secret", None)._github is not repo._github
+    user = User("o", token="secret")
+    assert user.info == {"authorization": "Bearer secret"}
+    assert api.paths() == ["repos/o/r", "users/o"]
+
+
+def test_handles_are_lightweight(github):
+    repo = github.repo("o", "r")
+    assert not hasattr(repo, "__dict__")
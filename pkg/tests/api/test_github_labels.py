@@ -0,0 +1,96 @@
+import pytest
+
+from pylinks.exception.api import WebAPIStatusCodeError
+
+CURRENT = [
+    {"name": "bug", "color": "d73a4a", "description": "Something isn't working"},
+    {"name": "Docs", "color": "0075ca", "description": ""},
+    {"name": "wontfix", "color": "ffffff", "description": None},
+    {"name": "stale", "color": "eeeeee", "description": ""},
+]
+DESIRED = [
+    {"name": "bug", "color": "D73A4A"},
+    {"name": "docs", "color": "0075ca"},
+    {"name": "type: feature", "color": "a2eeef", "description": "New feature"},
+    {"name": "invalid", "color": "e4e669", "previous_names": ["wontfix"]},
+]
+
+
+def handler(fail: set[str] = frozenset(), fail_list: bool = False):
+    def handle(method, url, kwargs):
+        if method == "GET":
+            if fail_list:
+                return 404, {"message": "Not Found"}
+            return [] if "page=2" in url else CURRENT
+        name = url.rsplit("/labels", 1)[1].lstrip("/") or kwargs["json"]["name"]
+        if name in fail:
+            return 422, {"message": "Validation Failed"}
+        return 204 if method == "DELETE" else 200, "" if method == "DELETE" else {"name": name}
+
+    return handle
+
+
+def test_plan(fake_api, github):
+    api = fake_api(handler())
+    report = github.repo("o", "r").labels_apply(DESIRED, delete=True, dry_run=True)
+    assert report.created == ["type: feature"]
+    assert report.updated == []
+    assert report.renamed == [("Docs", "docs"), ("wontfix", "invalid")]
+    assert report.deleted == ["stale"]
+    assert report.unchanged == ["bug"]
+    assert report.failed == {}
+    assert all(method == "GET" for method, _, _ in api.calls)
+
+
+def test_apply_sends_minimal_changes(fake_api, github):
+    api = fake_api(handler())
+    report = github.repo("o", "r").labels_apply(DESIRED, delete=True)
+    assert sorted(api.paths("PATCH")) == ["repos/o/r/labels/Docs", "repos/o/r/labels/wontfix"]
+    assert api.paths("POST") == ["repos/o/r/labels"]
+    assert api.paths("DELETE") == ["repos/o/r/labels/stale"]
+    assert report.renamed == [("Docs", "docs"), ("wontfix", "invalid")]
+    assert report.deleted == ["stale"]
+
+
+def test_failed_changes_are_reported_without_stopping_others(fake_api, github):
+    fake_api(handler(fail={"wontfix", "type: feature"}))
+    report = github.repo("o", "r").labels_apply(DESIRED, delete=True)
+    assert report.created == []
+    assert report.renamed == [("Docs", "docs")]
+    assert report.deleted == ["stale"]
+    assert set(report.failed) == {"wontfix", "type: feature"}
+    assert all(isinstance(error, WebAPIStatusCodeError) for error in report.failed.values())
+
+
+def test_multi_repo_failure_is_isolated(fake_api, github):
+    good = handler()
+    bad = handler(fail_list=True)
+    fake_api(lambda method, url, kwargs: (bad if "/repos/o/bad/" in url else good)(method, url, kwargs))
+    reports = github.labels_apply([("o", "r1"), ("o", "bad"), ("o", "r2")], DESIRED)
+    assert isinstance(reports[1], WebAPIStatusCodeError)
+    assert reports[0].created == reports[2].created == ["type: feature"]
+
+
+def test_label_names_are_quoted_in_paths(fake_api, github):
+    current = [
+        {"name": "area/docs", "color": "000000", "description": ""},
+        {"name": "C#?", "color": "000000", "description": ""},
+    ]
+    responses = {"PATCH": (200, {}), "DELETE": (204, "")}
+    api = fake_api(
+        lambda method, url, kwargs: ([] if "page=2" in url else current) if method == "GET" else responses[method]
+    )
+    report = github.repo("o", "r").labels_apply([{"name": "area/docs", "color": "ffffff"}], delete=True)
+    assert api.paths("PATCH") == ["repos/o/r/labels/area%2Fdocs"]
+    assert api.paths("DELETE") == ["repos/o/r/labels/C%23%3F"]
+    assert report.updated == ["area/docs"] and report.deleted == ["C#?"]
+
+
+def test_duplicate_desired_names_are_rejected(fake_api, github):
+    api = fake_api(handler())
+    desired = [{"name": "bug", "color": "ffffff"}, {"name": "Bug", "color": "000000"}]
+    with pytest.raises(ValueError):
+        github.repo("o", "r").labels_apply(desired)
+    with pytest.raises(ValueError):
+        github.labels_apply([("o", "r")], desired)
+    assert api.calls == []
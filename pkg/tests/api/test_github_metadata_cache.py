@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from pylinks.api.github import GitHub, MetadataCache, MutationQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def counter():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    return fetch, calls
+
+
+def test_views_expire_after_ttl(clock):
+    cache = MetadataCache(ttl=60, ttls={"labels": 10})
+    fetch, calls = counter()
+    assert cache.get("repos/o/r", "info", fetch) == {"value": 1}
+    assert cache.get("repos/O/R", "info", fetch) == {"value": 1}
+    clock.now += 61
+    assert cache.get("repos/o/r", "info", fetch) == {"value": 2}
+    cache.get("repos/o/r", "labels", fetch)
+    clock.now += 11
+    cache.get("repos/o/r", "labels", fetch)
+    assert len(calls) == 4
+
+
+def test_values_are_copied(clock):
+    cache = MetadataCache()
+    fetch, _ = counter()
+    cache.get("repos/o/r", "info", fetch)["value"] = "modified"
+    assert cache.get("repos/o/r", "info", fetch) == {"value": 1}
+
+
+@pytest.mark.parametrize(
+    ("query", "verb", "remaining"),
+    [
+        ("repos/o/r/labels", "POST", {"info", "tags", "rulesets:True"}),
+        ("repos/o/r/labels/bug", "GET", {"info", "labels", "tags", "rulesets:True"}),
+        ("repos/o/r/releases", "POST", {"info", "labels", "rulesets:True"}),
+        ("repos/o/r/git/refs", "POST", {"info", "labels", "rulesets:True"}),
+        ("repos/o/r/rulesets/1", "PUT", {"info", "labels", "tags"}),
+        ("repos/o/r/topics", "PUT", {"labels", "tags", "rulesets:True"}),
+        ("repos/o/r", "PATCH", set()),
+        ("repos/o/r/transfer", "POST", set()),
+        ("repos/o/other/labels", "POST", {"info", "labels", "tags", "rulesets:True"}),
+    ],
+)
+def test_mutations_invalidate_affected_views(clock, query, verb, remaining):
+    cache = MetadataCache()
+    fetch, _ = counter()
+    for view in ("info", "labels", "tags", "rulesets:True"):
+        cache.get("repos/o/r", view, fetch)
+    cache.record(query, verb)
+    assert {view for _, view in cache._entries} == remaining
+
+
+def test_user_mutations(clock):
+    cache = MetadataCache()
+    fetch, _ = counter()
+    cache.get("users/a", "info", fetch)
+    cache.get("users/b", "info", fetch)
+    cache.get("repos/a/r", "info", fetch)
+    cache.record("user", "PATCH")
+    assert list(cache._entries) == [("repos/a/r", "info")]
+
+
+def test_client_caching_is_opt_in(fake_api):
+    tags = [{"ref": "refs/tags/v1"}]
+
+    def handler(method, url, kwargs):
+        if method == "POST":
+            tags.append({"ref": f"refs/tags/{kwargs['json']['tag_name']}"})
+            return 201, {"id": 1}
+        return list(tags)
+
+    api = fake_api(handler)
+    uncached = GitHub(token="token").repo("o", "r")
+    uncached.tag_names()
+    uncached.tag_names()
+    assert len(api.calls) == 2
+
+    api.calls.clear()
+    github = GitHub(token="token", metadata_cache=MetadataCache(), mutation_queue=MutationQueue(min_interval=0))
+    repo = github.repo("o", "r")
+    assert repo.tag_names() == ["v1"]
+    assert github.repo("o", "r").tag_names() == ["v1"]
+    assert len(api.calls) == 1
+    repo.release_create("v2")
+    assert repo.tag_names() == ["v1", "v2"]
@@ -0,0 +1,129 @@
+import pytest
+
+from conftest import make_response
+
+
+def issue(number: int, updated_at: str, state: str = "open", labels=(), author: str = "alice", pull=False) -> dict:
+    data = {
+        "number": number,
+        "title": f"Issue {number}",
+        "state": state,
+        "user": {"login": author},
+        "labels": [{"name": label} for label in labels],
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at,
+        "closed_at": None,
+    }
+    if pull:
+        data["pull_request"] = {}
+    return data
+
+
+def comment(id_: int, number: int, updated_at: str) -> dict:
+    return {
+        "id": id_,
+        "issue_url": f"https://api.github.com/repos/o/r/issues/{number}",
+        "user": {"login": "bob"},
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        "body": f"Comment {id_}",
+    }
+
+
+class Server:
+    """Fake list endpoints of a repository, honoring `since` and `If-None-Match`."""
+
+    def __init__(self):
+        self.issues = []
+        self.comments = []
+        self.labels = [{"name": "bug"}]
+        self.requests = []
+
+    def __call__(self, method, url, kwargs):
+        path, _, query = url.split("/repos/o/r/", 1)[1].partition("?")
+        params = dict(part.split("=", 1) for part in query.split("&"))
+        items = {"issues": self.issues, "issues/comments": self.comments, "labels": self.labels}[path]
+        if "since" in params:
+            items = [item for item in items if item["updated_at"] >= params["since"]]
+        etag = f'"{hash(repr(items))}"'
+        sent = (kwargs["headers"] or {}).get("If-None-Match")
+        self.requests.append((path, params.get("since"), sent))
+        if sent == etag:
+            return make_response(url, 304)
+        return 200, items, {"ETag": etag}
+
+
+@pytest.fixture
+def server(fake_api) -> Server:
+    server = Server()
+    fake_api(server)
+    return server
+
+
+@pytest.fixture
+def mirror(github, tmp_path):
+    with github.repo("o", "r").mirror(tmp_path / "mirror.db") as mirror:
+        yield mirror
+
+
+def test_sync_is_incremental_and_conditional(server, mirror):
+    server.issues = [issue(1, "2024-01-02T00:00:00Z"), issue(2, "2024-01-03T00:00:00Z")]
+    report = mirror.sync()
+    assert (report.issues, report.comments, report.labels) == (2, 0, 1)
+    # The ETag of the first request belongs to a URL without `since`, so it is not sent again
+    server.requests.clear()
+    report = mirror.sync()
+    assert report.labels == 0
+    assert ("issues", "2024-01-03T00:00:00Z", None) in server.requests
+    assert ("labels", None, None) not in server.requests
+    # Now the same URL is requested with its own ETag, and nothing is transferred
+    server.requests.clear()
+    assert mirror.sync() == (0, 0, 0)
+    issue_request = next(request for request in server.requests if request[0] == "issues")
+    assert issue_request[1] == "2024-01-03T00:00:00Z" and issue_request[2] is not None
+    # A new update is fetched, and the ETag of the old URL is dropped
+    server.issues.append(issue(1, "2024-01-04T00:00:00Z", state="closed"))
+    del server.issues[0]
+    assert mirror.sync().issues == 2  # `since` is inclusive
+    assert mirror.issue(1)["state"] == "closed"
+    server.requests.clear()
+    mirror.sync()
+    assert ("issues", "2024-01-04T00:00:00Z", None) in server.requests
+
+
+def test_queries(server, mirror):
+    server.issues = [
+        issue(1, "2024-01-02T00:00:00Z", labels=["Bug"]),
+        issue(2, "2024-01-03T00:00:00Z", state="closed", author="bob"),
+        issue(3, "2024-01-04T00:00:00Z", labels=["bug", "docs"], pull=True),
+    ]
+    server.comments = [comment(20, 1, "2024-01-05T00:00:00Z"), comment(10, 1, "2024-01-02T00:00:00Z")]
+    mirror.sync()
+
+    def numbers(**kwargs):
+        return [item["number"] for item in mirror.issues(**kwargs)]
+
+    assert numbers() == [1, 2, 3]
+    assert numbers(state="open") == [1, 3]
+    assert numbers(pulls=True) == [3]
+    assert numbers(pulls=False, state="closed") == [2]
+    assert numbers(label="BUG") == [1, 3]
+    assert numbers(label="docs", pulls=False) == []
+    assert numbers(author="bob") == [2]
+    assert numbers(updated_since="2024-01-03T00:00:00Z") == [2, 3]
+    assert [c["id"] for c in mirror.comments(1)] == [10, 20]
+    assert mirror.comments(2) == []
+    assert mirror.issue(4) is None
+    assert mirror.labels() == [{"name": "bug"}]
+
+
+def test_mirrors_of_repositories_are_separate(server, github, tmp_path):
+    server.issues = [issue(1, "2024-01-02T00:00:00Z")]
+    path = tmp_path / "mirror.db"
+    with github.repo("o", "r").mirror(path) as mirror:
+        mirror.sync()
+    with github.repo("o", "other").mirror(path) as other:
+        assert other.issues() == []
+        assert other.labels() == []
+    with github.repo("O", "R").mirror(path) as mirror:
+        assert [item["number"] for item in mirror.issues()] == [1]
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from pylinks.api.github import MutationQueue, _rate_limit_delay
+from pylinks.exception.api import WebAPIStatusCodeError
+
+from conftest import make_response
+
+
+def failing(status_code: int, headers: dict | None = None, body: str = ""):
+    return WebAPIStatusCodeError(make_response("https://api.github.com/x", status_code, body, headers))
+
+
+def test_requests_with_same_token_are_sent_in_order_and_spaced():
+    queue = MutationQueue(min_interval=0.05)
+    sent = []
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def send(idx):
+        def inner():
+            if idx == 0:
+                first_started.set()
+                release_first.wait(5)
+            sent.append((idx, time.monotonic()))
+            return idx
+        return inner
+
+    threads = [threading.Thread(target=queue.submit, args=("token", send(0)))]
+    threads[0].start()
+    first_started.wait(5)
+    for idx in range(1, 4):
+        thread = threading.Thread(target=queue.submit, args=("token", send(idx)))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)  # make submission order deterministic
+    release_first.set()
+    for thread in threads:
+        thread.join(5)
+    assert [idx for idx, _ in sent] == [0, 1, 2, 3]
+    gaps = [later - earlier for (_, earlier), (_, later) in zip(sent, sent[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+def test_different_tokens_do_not_wait_for_each_other():
+    queue = MutationQueue(min_interval=10)
+    start = time.monotonic()
+    assert queue.submit("a", lambda: 1) == 1
+    assert queue.submit("b", lambda: 2) == 2
+    assert time.monotonic() - start < 1
+
+
+def test_secondary_rate_limit_is_retried_after_requested_time():
+    queue = MutationQueue(min_interval=0)
+    attempts = []
+
+    def send():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise failing(403, {"Retry-After": "0.1"}, "You have exceeded a secondary rate limit.")
+        return "ok"
+
+    assert queue.submit("token", send) == "ok"
+    assert len(attempts) == 3
+    assert attempts[2] - attempts[1] >= 0.09
+
+
+def test_other_errors_are_not_retried():
+    queue = MutationQueue(min_interval=0)
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise failing(422, body="Validation Failed")
+
+    with pytest.raises(WebAPIStatusCodeError):
+        queue.submit("token", send)
+    assert len(attempts) == 1
+
+
+def test_retries_are_limited():
+    queue = MutationQueue(min_interval=0, max_retries=2)
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise failing(429, {"Retry-After": "0"})
+
+    with pytest.raises(WebAPIStatusCodeError):
+        queue.submit("token", send)
+    assert len(attempts) == 3
+
+
+@pytest.mark.parametrize(
+    ("status_code", "headers", "body", "attempt", "expected"),
+    [
+        (403, {"Retry-After": "7"}, "", 0, 7),
+        (429, {}, "", 2, 40),
+        (403, {}, "secondary rate limit", 0, 10),
+        (403, {}, "Resource not accessible by integration", 0, None),
+        (404, {"Retry-After": "7"}, "", 0, None),
+    ],
+)
+def test_rate_limit_delay(status_code, headers, body, attempt, expected):
+    response = make_response("https://api.github.com/x", status_code, body, headers)
+    assert _rate_limit_delay(response, attempt, backoff_init=10) == expected
+
+
+def test_primary_rate_limit_waits_until_reset():
+    reset = int(time.time()) + 30
+    response = make_response(
+        "https://api.github.com/x", 403, "", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}
+    )
+    assert 29 < _rate_limit_delay(response, 0, backoff_init=60) <= 31
+
+
+def test_client_sends_mutations_through_queue(fake_api, github, monkeypatch):
+    submitted = []
+    original_submit = github._mutation_queue.submit
+
+    def submit(token, send):
+        submitted.append(token)
+        return original_submit(token, send)
+
+    monkeypatch.setattr(github._mutation_queue, "submit", submit)
+    fake_api(lambda method, url, kwargs: {"name": "bug"})
+    github.repo("o", "r").info
+    assert submitted == []
+    github.repo("o", "r").label_create("bug", color="ff0000")
+    assert submitted == ["token"]
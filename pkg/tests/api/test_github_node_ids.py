@@ -0,0 +1,72 @@
+from pylinks.api.github import GitHub, MutationQueue, NodeIDCache, _GRAPHQL_RATE_LIMIT_ALIAS
+
+ISSUE = {
+    "node_id": "I_7",
+    "url": "https://api.github.com/repos/Octo/Repo/issues/7",
+    "number": 7,
+    "user": {"login": "alice", "type": "User", "node_id": "U_alice"},
+    "labels": [{"node_id": "LA_bug", "url": "https://api.github.com/repos/Octo/Repo/labels/bug", "name": "bug"}],
+}
+
+
+def test_record_observes_nested_objects():
+    cache = NodeIDCache()
+    cache.record("repos/Octo/Repo/issues/7", "GET", None, ISSUE)
+    assert cache.get("issue", "octo", "repo", "7") == "I_7"
+    assert cache.get("user", "ALICE") == "U_alice"
+    assert cache.get("label", "octo", "repo", "BUG") == "LA_bug"
+    repo = {"node_id": "R_1", "full_name": "Octo/Repo", "owner": {"login": "Octo", "type": "Organization"}}
+    cache.record("repos/Octo/Repo", "GET", None, repo)
+    assert cache.get("repo", "octo", "repo") == "R_1"
+
+
+def test_pull_request_issues_are_not_cached_as_issues():
+    cache = NodeIDCache()
+    cache.record("repos/o/r/issues/8", "GET", None, ISSUE | {"pull_request": {}, "url": "/repos/o/r/issues/8"})
+    assert cache.get("issue", "o", "r", "8") is None
+
+
+def test_mutations_invalidate_entries():
+    cache = NodeIDCache()
+    cache.record("repos/Octo/Repo/issues/7", "GET", None, ISSUE)
+    cache.set("R_1", "repo", "octo", "repo")
+    cache.record("repos/Octo/Repo/labels/bug", "PATCH", {"new_name": "defect"}, None)
+    assert cache.get("label", "octo", "repo", "bug") is None
+    cache.record("repos/Octo/Repo", "PATCH", {"name": "renamed"}, None)
+    assert cache.get("repo", "octo", "repo") is None
+    assert cache.get("issue", "octo", "repo", "7") is None
+    assert cache.get("user", "alice") == "U_alice"
+
+
+def test_save_and_load(tmp_path):
+    cache = NodeIDCache(tmp_path / "ids.json")
+    cache.set("U_1", "user", "bob")
+    cache.save()
+    assert NodeIDCache(tmp_path / "ids.json").get("user", "bob") == "U_1"
+
+
+def test_branch_create_linked_resolves_ids_through_cache(fake_api):
+    queries = []
+
+    def handler(method, url, kwargs):
+        query = kwargs["json"]["query"]
+        queries.append(query)
+        if "createLinkedBranch" in query:
+            assert kwargs["json"]["variables"]["mutationInput"] == {
+                "issueId": "I_7", "oid": "abc", "repositoryId": "R_1", "name": "fix"
+            }
+            return {"data": {"createLinkedBranch": {"linkedBranch": {"ref": {"name": "fix", "target": {"oid": "abc"}}}}}}
+        data = {"issue": {"id": "I_7"}} if "issue(" in query else {"id": "R_1"}
+        return {"data": {"repository": data, _GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 1}}}
+
+    fake_api(handler)
+    github = GitHub(token="token", mutation_queue=MutationQueue(min_interval=0))
+    repo = github.repo("o", "r")
+    assert repo.branch_create_linked(7, "abc", name="fix") == {"name": "fix", "sha": "abc"}
+    assert len(queries) == 3
+    queries.clear()
+    repo.branch_create_linked(7, "abc", name="fix")
+    assert len(queries) == 1
+    queries.clear()
+    repo.branch_create_linked("I_7", "abc", name="fix")
+    assert len(queries) == 1
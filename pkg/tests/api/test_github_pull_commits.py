@@ -0,0 +1,83 @@
+import pytest
+
+from pylinks.api.github import _GRAPHQL_RATE_LIMIT_ALIAS
+
+
+def commits_handler(pages: list[list[dict]], queries: list[str]):
+    """Handler answering pull-request commit queries with the given pages of commit nodes."""
+
+    def handler(method, url, kwargs):
+        queries.append(kwargs["json"]["query"])
+        page = len(queries)
+        commits = {
+            "nodes": pages[page - 1],
+            "pageInfo": {
+                "startCursor": f"s{page}",
+                "endCursor": f"e{page}",
+                "hasNextPage": page < len(pages),
+                "hasPreviousPage": page < len(pages),
+            },
+        }
+        return {
+            "data": {
+                "repository": {"pullRequest": {"commits": commits}},
+                _GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 1},
+            }
+        }
+
+    return handler
+
+
+def selection(query: str) -> str:
+    """Selection of the commit nodes in a query."""
+    return query.split("nodes {", 1)[1].rsplit(" pageInfo", 1)[0].strip()[:-1]
+
+
+def test_minimal_preset(fake_api, github):
+    queries = []
+    pages = [[{"commit": {"oid": "a"}}, {"commit": {"oid": "b"}}], [{"commit": {"oid": "c"}}]]
+    fake_api(commits_handler(pages, queries))
+    commits = github.repo("o", "r").pull_commits(1, fields="minimal", sort="first")
+    assert [commit["commit"]["oid"] for commit in commits] == ["a", "b", "c"]
+    assert selection(queries[0]) == "commit {oid, committedDate}"
+    assert '"e1"' not in queries[1] and "after: $after" in queries[1]
+
+
+def test_full_preset_flattens_authors(fake_api, github):
+    queries = []
+    node = {"id": "C", "commit": {"oid": "a", "authors": {"nodes": [{"name": "alice"}]}}}
+    fake_api(commits_handler([[node]], queries))
+    commits = github.repo("o", "r").pull_commits(1, authors_count=5)
+    assert commits[0]["commit"]["authors"] == [{"name": "alice"}]
+    assert "authors(first: 5)" in queries[0]
+    assert selection(queries[0]).startswith("id, resourcePath, url, commit {")
+
+
+@pytest.mark.parametrize(
+    "fields, expected",
+    [
+        (["oid", "message"], "commit {oid, message}"),
+        ("url commit {oid}", "url commit {oid}"),
+    ],
+)
+def test_custom_fields(fake_api, github, fields, expected):
+    queries = []
+    fake_api(commits_handler([[{"url": "u", "commit": {"oid": "a"}}]], queries))
+    github.repo("o", "r").pull_commits(1, fields=fields)
+    assert selection(queries[0]) == expected
+
+
+def test_empty_fields_are_rejected(fake_api, github):
+    fake_api(commits_handler([[]], []))
+    with pytest.raises(ValueError):
+        github.repo("o", "r").pull_commits(1, fields=[])
+
+
+def test_last_commits_are_fetched_backwards(fake_api, github):
+    queries = []
+    pages = [[{"commit": {"oid": "c"}}, {"commit": {"oid": "d"}}], [{"commit": {"oid": "a"}}, {"commit": {"oid": "b"}}]]
+    fake_api(commits_handler(pages, queries))
+    commits = github.repo("o", "r").pull_commits(1, fields="minimal", count=3, page_size=2)
+    # Pages are fetched backwards from the end, and each page is reversed, so the latest commit comes first
+    assert [commit["commit"]["oid"] for commit in commits] == ["d", "c", "b", "a"]
+    assert "last: 2" in queries[0] and "last: 1" in queries[1]
@@ -0,0 +1,130 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from pylinks.api.github import RateLimiter, _lock_file, _unlock_file
+
+
+def headers(remaining: int, limit: int = 1000, reset: float | None = None, resource: str = "core") -> dict:
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(reset if reset is not None else time.time() + 3600)),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def bucket(limiter: RateLimiter, token: str = "token", resource: str = "core") -> dict:
+    return json.loads(limiter.path.read_text())[RateLimiter._key(token, resource)]
+
+
+class Slept(Exception):
+    pass
+
+
+@pytest.fixture
+def limiter(tmp_path) -> RateLimiter:
+    return RateLimiter(tmp_path / "state.json")
+
+
+def test_tokens_are_not_written_to_disk(limiter):
+    limiter.update("secret-token", headers(500))
+    assert "secret-token" not in limiter.path.read_text()
+
+
+def test_acquire_counts_against_known_budget(limiter):
+    limiter.acquire("token")  # unknown budget: not counted
+    limiter.update("token", headers(900))
+    for _ in range(3):
+        limiter.acquire("token")
+    assert bucket(limiter)["remaining"] == 897
+
+
+def test_update_keeps_in_flight_requests_of_same_window(limiter):
+    reset = time.time() + 3600
+    limiter.update("token", headers(900, reset=reset))
+    limiter.acquire("token")
+    limiter.acquire("token")
+    # A response that does not reflect the two acquired requests yet
+    limiter.update("token", headers(900, reset=reset))
+    assert bucket(limiter)["remaining"] == 898
+    # A new window resets the budget
+    limiter.update("token", headers(1000, reset=reset + 3600))
+    assert bucket(limiter)["remaining"] == 1000
+
+
+def test_budgets_are_separate_per_resource(limiter):
+    limiter.update("token", headers(900))
+    limiter.update("token", headers(20, limit=30, resource="search"))
+    limiter.acquire("token", "search")
+    assert bucket(limiter)["remaining"] == 900
+    assert bucket(limiter, resource="search")["remaining"] == 19
+
+
+def test_empty_bucket_waits_until_reset(limiter, monkeypatch):
+    limiter.update("token", headers(0, reset=time.time() + 100))
+
+    def sleep(seconds):
+        raise Slept(seconds)
+
+    monkeypatch.setattr(time, "sleep", sleep)
+    with pytest.raises(Slept) as exc_info:
+        limiter.acquire("token")
+    assert 98 < exc_info.value.args[0] <= 100
+
+
+def test_low_budget_is_paced(tmp_path, monkeypatch):
+    limiter = RateLimiter(tmp_path / "state.json", pace_threshold=0.5, reserve=10)
+    limiter.update("token", headers(110, reset=time.time() + 100))
+    limiter.acquire("token")  # first request of the paced phase is not delayed
+
+    def sleep(seconds):
+        raise Slept(seconds)
+
+    monkeypatch.setattr(time, "sleep", sleep)
+    with pytest.raises(Slept) as exc_info:
+        limiter.acquire("token")
+    # 99 requests (above the reserve) spread over the ~100 s left
+    assert 0.9 < exc_info.value.args[0] <= 100 / 99
+
+
+def test_processes_share_one_bucket(limiter):
+    limiter.update("token", headers(1000))
+    script = (
+        "import sys\n"
+        "from pylinks.api.github import RateLimiter\n"
+        "limiter = RateLimiter(sys.argv[1])\n"
+        "for _ in range(100):\n"
+        "    limiter.acquire('token')\n"
+    )
+    processes = [
+        subprocess.Popen([sys.executable, "-c", script, str(limiter.path)]) for _ in range(2)
+    ]
+    assert all(process.wait(timeout=60) == 0 for process in processes)
+    assert bucket(limiter)["remaining"] == 800
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = tmp_path / "state.json.lock"
+    path.touch()
+    events = []
+
+    def contend():
+        with open(path, "r+") as file:
+            _lock_file(file)
+            events.append("acquired")
+            _unlock_file(file)
+
+    with open(path, "r+") as file:
+        _lock_file(file)
+        thread = threading.Thread(target=contend)
+        thread.start()
+        time.sleep(0.2)
+        events.append("released")
+        _unlock_file(file)
+    thread.join(timeout=10)
+    assert events == ["released", "acquired"]
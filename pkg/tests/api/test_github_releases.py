@@ -0,0 +1,231 @@
+import hashlib
+
+import pytest
+
+from pylinks.api.github import Repo, _UploadStream
+from pylinks.exception.api import WebAPIValueError
+
+from conftest import make_response
+
+
+@pytest.fixture
+def release_server(monkeypatch):
+    """Replace the release endpoints of `Repo` with an in-memory release."""
+    state = {
+        "release": {"id": 1, "tag_name": "v1.0.0", "draft": True},
+        "assets": {},
+        "fail_uploads": {},
+        "fail_cleanups": 0,
+        "calls": [],
+    }
+
+    def release_by_tag(self, tag_name):
+        return dict(state["release"])
+
+    def release_update(self, release_id, **fields):
+        state["calls"].append(("update", fields))
+        state["release"] |= fields
+        return dict(state["release"])
+
+    def asset_list(self, release_id):
+        state["calls"].append(("list",))
+        # Listings after the first upload are cleanups of failed uploads
+        if state["fail_cleanups"] and any(call[0] == "upload" for call in state["calls"]):
+            state["fail_cleanups"] -= 1
+            raise ConnectionError("cleanup failed")
+        return list(state["assets"].values())
+
+    def asset_delete(self, asset_id):
+        state["calls"].append(("delete", asset_id))
+        state["assets"] = {name: a for name, a in state["assets"].items() if a["id"] != asset_id}
+
+    def asset_upload(self, release_id, filepath, mime_type="", name="", label=""):
+        state["calls"].append(("upload", name))
+        if state["fail_uploads"].get(name):
+            state["fail_uploads"][name] -= 1
+            # A failed upload leaves an incomplete asset behind
+            state["assets"][name] = {"id": len(state["calls"]), "name": name, "size": 0, "state": "starter"}
+            raise ConnectionError(f"upload of {name} failed")
+        content = filepath.read_bytes()
+        state["assets"][name] = {
+            "id": len(state["calls"]),
+            "name": name,
+            "size": len(content),
+            "digest": f"sha256:{hashlib.sha256(content).hexdigest()}",
+        }
+        return state["assets"][name]
+
+    for attr, func in (
+        ("_release_by_tag", release_by_tag),
+        ("release_update", release_update),
+        ("release_asset_list", asset_list),
+        ("release_asset_delete", asset_delete),
+        ("release_asset_upload", asset_upload),
+    ):
+        monkeypatch.setattr(Repo, attr, func)
+    return state
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {}
+    for name in ("a.txt", "b.txt", "c.txt"):
+        paths[name] = tmp_path / name
+        paths[name].write_text(f"content of {name}")
+    return paths
+
+
+def test_publish_uploads_changed_assets_and_publishes(github, release_server, files):
+    content = files["c.txt"].read_bytes()
+    release_server["assets"]["c.txt"] = {
+        "id": 100, "name": "c.txt", "size": len(content), "digest": f"sha256:{hashlib.sha256(content).hexdigest()}"
+    }
+    release_server["assets"]["a.txt"] = {"id": 101, "name": "a.txt", "size": 1, "digest": "sha256:outdated"}
+    report = github.repo("o", "r").release_publish("v1.0.0", assets=list(files.values()), max_workers=1)
+    assert sorted(report.uploaded) == ["a.txt", "b.txt"]
+    assert report.skipped == ["c.txt"]
+    assert report.failed == {}
+    assert ("delete", 101) in release_server["calls"]
+    assert report.release["draft"] is False
+
+
+def test_failed_cleanup_is_retried_and_reported(github, release_server, files):
+    # 'a.txt' fails once, then the cleanup before its retry fails, then it succeeds;
+    # 'b.txt' fails on every attempt, and is reported instead of raising.
+    release_server["fail_uploads"] = {"a.txt": 1, "b.txt": 3}
+    release_server["fail_cleanups"] = 1
+    report = github.repo("o", "r").release_publish(
+        "v1.0.0", assets=[files["a.txt"], files["b.txt"]], max_workers=1, retries=2
+    )
+    assert report.uploaded == ["a.txt"]
+    assert release_server["calls"].count(("upload", "a.txt")) == 2
+    assert release_server["assets"]["a.txt"]["size"] == files["a.txt"].stat().st_size
+    assert list(report.failed) == ["b.txt"]
+    assert str(report.failed["b.txt"]) == "upload of b.txt failed"
+    assert release_server["calls"].count(("upload", "b.txt")) == 3
+    # The release is left as a draft, since not all assets were uploaded
+    assert report.release["draft"] is True
+
+
+def test_failed_cleanup_on_last_attempt_is_reported(github, release_server, files):
+    release_server["fail_uploads"] = {"a.txt": 1}
+    release_server["fail_cleanups"] = 1
+    report = github.repo("o", "r").release_publish("v1.0.0", assets=[files["a.txt"]], retries=1)
+    assert report.uploaded == []
+    assert str(report.failed["a.txt"]) == "cleanup failed"
+
+
+def asset_server(contents: dict[str, bytes], tags: dict[str, int], digests: dict[str, str] | None = None):
+    """Handler for the release endpoints used to download assets, with one release per tag."""
+    assets = [
+        {
+            "id": index,
+            "name": name,
+            "size": len(content),
+            "digest": (digests or {}).get(name, f"sha256:{hashlib.sha256(content).hexdigest()}"),
+        }
+        for index, (name, content) in enumerate(contents.items())
+    ]
+
+    def handler(method, url, kwargs):
+        path = url.split("/repos/o/r/", 1)[1]
+        if path == "releases/latest":
+            return {"id": 99, "tag_name": "v2.0.0"}
+        if path.startswith("releases/tags/"):
+            tag = path.removeprefix("releases/tags/")
+            return {"id": tags[tag], "tag_name": tag} if tag in tags else (404, {"message": "Not Found"})
+        if path.startswith("releases/assets/"):
+            assert kwargs["headers"]["Accept"] == "application/octet-stream"
+            asset = assets[int(path.rsplit("/", 1)[1])]
+            return make_response(url, stream=contents[asset["name"]])
+        release_id = int(path.split("/")[1])
+        return assets if release_id in tags.values() or release_id == 99 else (404, {"message": "Not Found"})
+
+    return handler
+
+
+def test_download_matching_assets_and_skip_existing(fake_api, github, tmp_path):
+    contents = {"tool-linux.tar.gz": b"linux", "tool-macos.tar.gz": b"macos", "notes.txt": b"notes"}
+    api = fake_api(asset_server(contents, tags={"v1.0.0": 1}))
+    (tmp_path / "tool-macos.tar.gz").write_bytes(b"macos")
+    report = github.repo("o", "r").release_assets_download("v1.0.0", patterns="tool-*", download_path=tmp_path)
+    assert report.downloaded == [tmp_path / "tool-linux.tar.gz"]
+    assert report.skipped == [tmp_path / "tool-macos.tar.gz"]
+    assert report.size == 5
+    assert (tmp_path / "tool-linux.tar.gz").read_bytes() == b"linux"
+    assert not (tmp_path / "notes.txt").exists()
+    assert [path for path in api.paths() if "assets/" in path] == ["repos/o/r/releases/assets/0"]
+
+
+def test_download_deletes_data_with_mismatched_digest(fake_api, github, tmp_path):
+    fake_api(asset_server({"a.bin": b"data"}, tags={"v1.0.0": 1}, digests={"a.bin": "sha256:" + "0" * 64}))
+    with pytest.raises(WebAPIValueError):
+        github.repo("o", "r").release_assets_download("v1.0.0", download_path=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_latest_is_a_flag_not_a_tag(fake_api, github, tmp_path):
+    contents = {"a.bin": b"data"}
+    api = fake_api(asset_server(contents, tags={"latest": 7}))
+    repo = github.repo("o", "r")
+    repo.release_assets_download("latest", download_path=tmp_path / "tag")
+    assert "repos/o/r/releases/tags/latest" in api.paths()
+    assert "repos/o/r/releases/7/assets?per_page=100&page=1" in api.paths()
+    repo.release_assets_download(latest=True, download_path=tmp_path / "flag")
+    assert "repos/o/r/releases/99/assets?per_page=100&page=1" in api.paths()
+    for kwargs in ({}, {"release": 1, "latest": True}):
+        with pytest.raises(ValueError):
+            repo.release_assets_download(**kwargs)
+
+
+def upload_handler(received: list, digest: str | None = "auto"):
+    """Handler for the upload endpoint, consuming the streamed body like `requests` does."""
+
+    def handler(method, url, kwargs):
+        body = b"".join(kwargs["data"])
+        received.append((url, kwargs["headers"], body))
+        asset = {"id": 1, "name": "asset", "size": len(body)}
+        if digest:
+            asset["digest"] = f"sha256:{hashlib.sha256(body).hexdigest()}" if digest == "auto" else digest
+        return 201, asset
+
+    return handler
+
+
+def test_upload_streams_file_with_encoded_name(fake_api, github, tmp_path):
+    filepath = tmp_path / "file.bin"
+    filepath.write_bytes(b"x" * 10)
+    received = []
+    fake_api(upload_handler(received))
+    progress = []
+    github.repo("o", "r").release_asset_upload(
+        1, filepath, mime_type="application/octet-stream", name="a b&c#d.bin", label="Linux (x86)",
+        chunk_size=4, progress=lambda read, total: progress.append((read, total)),
+    )
+    url, headers, body = received[0]
+    assert url.endswith("/repos/o/r/releases/1/assets?name=a%20b%26c%23d.bin&label=Linux%20%28x86%29")
+    assert headers["Content-Length"] == "10"
+    assert body == b"x" * 10
+    assert progress == [(4, 10), (8, 10), (10, 10)]
+
+
+def test_upload_stream_is_restarted_for_each_attempt(tmp_path):
+    filepath = tmp_path / "file.bin"
+    filepath.write_bytes(b"abcdefg")
+    stream = _UploadStream(filepath, chunk_size=3)
+    assert len(stream) == 7
+    assert next(iter(stream)) == b"abc"
+    assert stream.sha256 is None  # only set after a full iteration
+    assert b"".join(stream) == b"abcdefg"
+    assert stream.sha256 == hashlib.sha256(b"abcdefg").hexdigest()
+
+
+def test_upload_digest_mismatch_is_raised(fake_api, github, tmp_path):
+    filepath = tmp_path / "file.txt"
+    filepath.write_text("content")
+    fake_api(upload_handler([], digest="sha256:" + "0" * 64))
+    with pytest.raises(WebAPIValueError):
+        github.repo("o", "r").release_asset_upload(1, filepath)
+    # Assets without a reported digest are accepted
+    fake_api(upload_handler([], digest=None))
+    assert github.repo("o", "r").release_asset_upload(1, filepath)["size"] == 7
@@ -0,0 +1,148 @@
+import threading
+import time
+import urllib.parse
+
+import pytest
+
+from pylinks.api.github import _RequestPacer
+from pylinks.exception.api import WebAPIStatusCodeError
+
+
+class FakeClock:
+    def __init__(self, now: float = 100):
+        self.now = now
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(time, "time", clock.time)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def test_pacer_spaces_requests(clock):
+    pacer = _RequestPacer(per_minute=60)
+    for _ in range(3):
+        pacer.wait()
+    assert clock.sleeps == [1, 1]
+    clock.now += 5  # an idle pacer does not accumulate a burst
+    pacer.wait()
+    pacer.wait()
+    assert clock.sleeps == [1, 1, 1]
+
+
+def test_pacer_delay_postpones_following_requests(clock):
+    pacer = _RequestPacer(per_minute=60)
+    pacer.wait()
+    pacer.delay(10)
+    pacer.wait()
+    assert clock.sleeps == [10]
+    pacer.delay(0.5)  # shorter than the next reserved slot
+    pacer.wait()
+    assert clock.sleeps == [10, 1]
+
+
+def test_pacer_is_thread_safe(clock):
+    pacer = _RequestPacer(per_minute=6000)
+    slots = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            pacer.wait()
+            with lock:
+                slots.append(pacer._next_time)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(slots)) == 200
+
+
+def search_handler(sizes: list[int], incomplete_pages=(), duplicates=False, fail_first: int = 0):
+    """Handler answering code searches over files with the given sizes, like GitHub does."""
+    state = {"fail": fail_first}
+
+    def handler(method, url, kwargs):
+        if state["fail"]:
+            state["fail"] -= 1
+            return 403, {"message": "API rate limit exceeded"}, {"Retry-After": "0"}
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        query, page, per_page = params["q"][0], int(params["page"][0]), int(params["per_page"][0])
+        lower, upper = 0, float("inf")
+        if " size:" in query:
+            lower, upper = map(int, query.rsplit("size:", 1)[1].split(".."))
+        matches = [index for index, size in enumerate(sizes) if lower <= size <= upper]
+        start = (page - 1) * per_page
+        # GitHub returns at most 1,000 results per query
+        selected = matches[start:min(start + per_page, 1000)]
+        if duplicates and page > 1:
+            selected = [matches[0]] + selected
+        return {
+            "total_count": len(matches),
+            "incomplete_results": (query, page) in incomplete_pages,
+            "items": [{"repository": {"full_name": "o/r"}, "path": f"f{index}.py"} for index in selected],
+        }
+
+    return handler
+
+
+def test_crawl_splits_large_queries_by_size(fake_api, github):
+    sizes = [index * 150 for index in range(2500)]
+    api = fake_api(search_handler(sizes))
+    crawl = github.search_code_crawl("foo", per_minute=10 ** 9)
+    assert crawl.total_count is None
+    items = list(crawl)
+    assert sorted(item["path"] for item in items) == sorted(f"f{index}.py" for index in range(2500))
+    assert crawl.total_count == 2500
+    assert not crawl.incomplete_results
+    # Queries are recorded when submitted, with the sub-queries of a query in order
+    assert crawl.queries[:3] == ["foo", "foo size:0..196608", "foo size:196609..393216"]
+    assert all(query.startswith("foo size:") for query in crawl.queries[1:])
+    # No page beyond the result cap of a query is requested
+    assert all(int(urllib.parse.parse_qs(path)["page"][0]) <= 10 for path in api.paths())
+
+
+def test_crawl_without_split_is_incomplete(fake_api, github):
+    fake_api(search_handler([1] * 1500))
+    crawl = github.search_code_crawl("foo", per_minute=10 ** 9, split=False)
+    assert len(list(crawl)) == 1000
+    assert crawl.incomplete_results
+    assert crawl.queries == ["foo"]
+
+
+def test_crawl_of_unsplittable_query_is_incomplete(fake_api, github):
+    fake_api(search_handler([10] * 1100))
+    crawl = github.search_code_crawl("foo", per_minute=10 ** 9)
+    assert len(list(crawl)) == 1000
+    assert crawl.incomplete_results
+    assert crawl.queries[0] == "foo"
+    assert "foo size:10..10" in crawl.queries
+    assert len(crawl.queries) == len(set(crawl.queries))
+
+
+def test_crawl_deduplicates_and_reports_incomplete_pages(fake_api, github):
+    fake_api(search_handler(list(range(250)), incomplete_pages={("foo", 2)}, duplicates=True))
+    crawl = github.search_code_crawl("foo", per_minute=10 ** 9)
+    paths = [item["path"] for item in crawl]
+    assert len(paths) == len(set(paths)) == 250
+    assert crawl.incomplete_results
+
+
+def test_crawl_retries_rate_limited_requests(fake_api, github):
+    fake_api(search_handler(list(range(10)), fail_first=2))
+    assert len(list(github.search_code_crawl("foo", per_minute=10 ** 9, max_retries=2))) == 10
+    fake_api(search_handler(list(range(10)), fail_first=2))
+    with pytest.raises(WebAPIStatusCodeError):
+        list(github.search_code_crawl("foo", per_minute=10 ** 9, max_retries=1))
@@ -0,0 +1,84 @@
+from pylinks.api.github import RepoSnapshot
+from pylinks.exception.api import GraphQLResponseError, WebAPIStatusCodeError
+
+
+def snapshot(owner: str = "o") -> RepoSnapshot:
+    return RepoSnapshot(
+        info={
+            "id": f"R_{owner}",
+            "description": "old",
+            "hasWikiEnabled": True,
+            "visibility": "PUBLIC",
+            "topics": ["a", "b"],
+        },
+        labels=[],
+        branches=[],
+        tags=[],
+        pages=None,
+        rulesets=[],
+        branch_protection_rules=[
+            {"id": "BPR_main", "pattern": "main", "requiresLinearHistory": False, "allowsDeletions": False},
+        ],
+        discussion_categories=[],
+    )
+
+
+SPEC = {
+    "repo": {"description": "old", "has_wiki": False, "visibility": "public"},
+    "topics": ["b", "a"],
+    "branch_protection_rules": [
+        {"pattern": "main", "require_linear_history": True, "allow_deletions": False},
+        {"pattern": "release/*", "allow_deletions": False},
+    ],
+}
+
+
+def handler(fail_repo: bool = False):
+    def handle(method, url, kwargs):
+        if url.endswith("/graphql"):
+            return {
+                "data": {"m0": {"branchProtectionRule": {"id": "BPR_main"}}, "m1": None},
+                "errors": [{"path": ["m1"], "message": "Pattern already exists"}],
+            }
+        if fail_repo and method == "PATCH":
+            return 422, {"message": "Validation Failed"}
+        return {}
+
+    return handle
+
+
+def test_only_differences_are_planned(fake_api, github):
+    api = fake_api(handler())
+    report = github.repo("o", "r").apply_settings(SPEC, dry_run=True, snapshot=snapshot())
+    assert report.repo == {"has_wiki": False}
+    assert report.topics is None
+    assert report.branch_protection_rules == {"main": "updated", "release/*": "created"}
+    assert report.changed
+    assert api.calls == []
+
+
+def test_failed_changes_are_reported_without_stopping_others(fake_api, github):
+    api = fake_api(handler(fail_repo=True))
+    report = github.repo("o", "r").apply_settings(SPEC, snapshot=snapshot())
+    assert report.repo == {}
+    assert isinstance(report.failed["repo"], WebAPIStatusCodeError)
+    assert report.branch_protection_rules == {"main": "updated"}
+    assert isinstance(report.failed["branch_protection_rules/release/*"], GraphQLResponseError)
+    assert [method for method, _, _ in api.calls] == ["PATCH", "POST"]
+
+
+def test_multi_repo_failure_is_isolated(fake_api, github, monkeypatch):
+    def repo_snapshots(repos, pages):
+        # Only the first repository has a Pages site
+        return [
+            snapshot(owner)._replace(pages={"build_type": "workflow"} if idx == 0 else None)
+            for idx, (owner, _) in enumerate(repos)
+        ]
+
+    monkeypatch.setattr(github, "repo_snapshots", repo_snapshots)
+    fake_api(handler())
+    spec = {"pages": {"cname": "example.com"}, "repo": {"has_wiki": False}}
+    reports = github.apply_settings([("o", "r"), ("p", "r")], spec)
+    assert reports[0].pages == {"cname": "example.com"} and reports[0].repo == {"has_wiki": False}
+    # The second Pages site does not exist, and cannot be created without a build type
+    assert isinstance(reports[1], ValueError)
@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+from pylinks.api.github import _GRAPHQL_RATE_LIMIT_ALIAS, _REPO_SNAPSHOT_CONNECTIONS
+from pylinks.exception.api import WebAPIStatusCodeError
+
+
+class SnapshotServer:
+    """Fake GraphQL and Pages endpoints for repositories with the given numbers of labels."""
+
+    def __init__(self, labels: dict[str, int], pages: dict[str, int | dict]):
+        self.labels = labels
+        self.pages = pages
+        self.documents = []
+
+    def connection(self, repo: str, alias: str, cursor: str | None) -> dict:
+        items = [{"id": f"L_{repo}_{idx}", "name": f"label{idx}"} for idx in range(self.labels[repo])]
+        items = items if alias == "labels" else []
+        start = int(cursor or 0)
+        return {
+            "pageInfo": {"hasNextPage": start + 100 < len(items), "endCursor": str(start + 100)},
+            "nodes": items[start:start + 100],
+        }
+
+    def __call__(self, method, url, kwargs):
+        if not url.endswith("/graphql"):
+            repo = url.split("/repos/o/")[1].removesuffix("/pages")
+            result = self.pages[repo]
+            return (result, {"message": "Error"}) if isinstance(result, int) else result
+        query = kwargs["json"]["query"]
+        self.documents.append(query)
+        data = {_GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 1}}
+        for alias, repo, payload in re.findall(r'(q\d+): repository\(name: "(\w+)", owner: "o"\) \{(.*?)\}(?= q\d+:|\n)', query):
+            if payload.startswith("id, databaseId"):
+                data[alias] = {
+                    "id": f"R_{repo}",
+                    "repositoryTopics": {"nodes": [{"topic": {"name": "python"}}]},
+                } | {connection: self.connection(repo, connection, None) for connection in _REPO_SNAPSHOT_CONNECTIONS}
+            else:
+                connection, cursor = re.match(r'(\w+): .*after: "(\d+)"', payload).groups()
+                data[alias] = {connection: self.connection(repo, connection, cursor)}
+        return {"data": data}
+
+
+def test_connections_with_more_pages_are_followed_up(fake_api, github):
+    server = SnapshotServer(labels={"big": 250, "small": 3}, pages={"big": {"url": "pages"}, "small": 404})
+    fake_api(server)
+    big, small = github.repo_snapshots([("o", "big"), ("o", "small")])
+    assert [label["name"] for label in big.labels] == [f"label{idx}" for idx in range(250)]
+    assert len(small.labels) == 3
+    assert big.info["topics"] == ["python"]
+    assert big.pages == {"url": "pages"}
+    assert small.pages is None  # no Pages site
+    # One document for both repositories, then one follow-up for each further page of 'big'
+    assert len(server.documents) == 3
+    assert all("small" not in document for document in server.documents[1:])
+    assert github._node_ids.get("label", "o", "big", "label249") == "L_big_249"
+
+
+def test_batches_follow_the_node_estimate(fake_api, github):
+    repos = [f"r{idx}" for idx in range(20)]
+    server = SnapshotServer(labels=dict.fromkeys(repos, 1), pages={})
+    fake_api(server)
+    snapshots = github.repo_snapshots([("o", repo) for repo in repos], pages=False)
+    assert [snapshot.info["id"] for snapshot in snapshots] == [f"R_{repo}" for repo in repos]
+    assert [len(re.findall(r"\bq\d+: ", document)) for document in server.documents] == [12, 8]
+
+
+def test_pages_errors_other_than_not_found_are_raised(fake_api, github):
+    fake_api(SnapshotServer(labels={"r": 1}, pages={"r": 403}))
+    with pytest.raises(WebAPIStatusCodeError):
+        github.repo_snapshots([("o", "r")])
@@ -0,0 +1,68 @@
+import hashlib
+import shutil
+import subprocess
+
+import pytest
+
+from pylinks.api.github import _git_blob_hash
+
+from conftest import make_response
+
+
+def git_hash(content: bytes) -> str:
+    return hashlib.sha1(f"blob {len(content)}\0".encode() + content).hexdigest()
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (b"", "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"),
+        (b"hello\n", "ce013625030ba8dba906f756967f9e9ca394464a"),
+    ],
+)
+def test_git_blob_hash_known_values(tmp_path, content, expected):
+    filepath = tmp_path / "file"
+    filepath.write_bytes(content)
+    assert _git_blob_hash(filepath) == expected
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_git_blob_hash_matches_git_across_chunks(tmp_path):
+    filepath = tmp_path / "file"
+    filepath.write_bytes(bytes(range(256)) * 1000)
+    expected = subprocess.run(
+        ["git", "hash-object", str(filepath)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert _git_blob_hash(filepath, chunk_size=1000) == expected
+
+
+def test_sync_dir_downloads_only_changes(fake_api, github, tmp_path):
+    remote = {"a.txt": b"a", "sub/b.txt": b"b"}
+
+    def handler(method, url, kwargs):
+        if "/git/trees/" in url:
+            tree = [{"path": path, "type": "blob", "sha": git_hash(content)} for path, content in remote.items()]
+            return {"sha": "root", "tree": tree, "truncated": False}
+        sha = url.rsplit("/", 1)[1]
+        content = next(content for content in remote.values() if git_hash(content) == sha)
+        return make_response(url, stream=content)
+
+    api = fake_api(handler)
+    repo = github.repo("o", "r")
+    report = repo.sync_dir(download_path=tmp_path)
+    assert sorted(report.added) == ["a.txt", "sub/b.txt"]
+    assert (tmp_path / "sub" / "b.txt").read_bytes() == b"b"
+
+    remote["a.txt"] = b"changed"
+    (tmp_path / "local.txt").write_text("local only")
+    api.calls.clear()
+    report = repo.sync_dir(download_path=tmp_path)
+    assert report.updated == ["a.txt"] and report.unchanged == ["sub/b.txt"] and report.removed == ["local.txt"]
+    assert len([path for path in api.paths() if "/git/blobs/" in path]) == 1
+    assert (tmp_path / "a.txt").read_bytes() == b"changed"
+    assert (tmp_path / "local.txt").exists()
+
+    del remote["sub/b.txt"]
+    report = repo.sync_dir(download_path=tmp_path, delete=True)
+    assert sorted(report.removed) == ["local.txt", "sub/b.txt"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [".pylinks-sync.json", "a.txt"]
@@ -0,0 +1,60 @@
+import time
+
+from pylinks.api.github import GitHub, _TokenPool
+
+
+def headers(remaining: int, resource: str = "core", limit: int = 5000, reset: float | None = None) -> dict:
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(reset if reset is not None else time.time() + 3600)),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def test_duplicate_tokens_are_removed():
+    assert _TokenPool(["a", "b", "a"]).tokens == ["a", "b"]
+
+
+def test_unknown_budgets_are_tried_first():
+    pool = _TokenPool(["a", "b"])
+    pool.update("a", headers(4000))
+    assert pool.select() == "b"
+
+
+def test_token_with_most_remaining_budget_is_selected_per_resource():
+    pool = _TokenPool(["a", "b"])
+    pool.update("a", headers(4000))
+    pool.update("b", headers(100))
+    pool.update("a", headers(1, resource="search", limit=30))
+    pool.update("b", headers(20, resource="search", limit=30))
+    assert pool.select("core") == "a"
+    assert pool.select("search") == "b"
+
+
+def test_reset_window_restores_full_budget():
+    pool = _TokenPool(["a", "b"])
+    pool.update("a", headers(0, reset=time.time() - 1))
+    pool.update("b", headers(100))
+    assert pool.select() == "a"
+
+
+def test_responses_without_headers_are_ignored():
+    pool = _TokenPool(["a", "b"])
+    pool.update("a", {})
+    assert pool.snapshot() == {"...a": {}, "...b": {}}
+
+
+def test_client_routes_requests_and_records_budgets(fake_api):
+    def handler(method, url, kwargs):
+        token = kwargs["headers"]["Authorization"].removeprefix("Bearer ")
+        return 200, {"token": token}, headers({"tok-a": 10, "tok-b": 4000}[token])
+
+    api = fake_api(handler)
+    github = GitHub(token=["tok-a", "tok-b"])
+    used = [github.rest_query("rate_limit")["token"] for _ in range(4)]
+    # Both tokens are tried first; then the one with more budget is used.
+    assert sorted(used[:2]) == ["tok-a", "tok-b"]
+    assert used[2:] == ["tok-b", "tok-b"]
+    assert github.rate_limits["...ok-a"]["core"]["remaining"] == 10
+    assert len(api.calls) == 4
@@ -0,0 +1,47 @@
+from pylinks.api.github import _GRAPHQL_RATE_LIMIT_ALIAS
+
+
+def test_failed_batch_only_affects_its_items(fake_api, github):
+    node_ids = github._node_ids
+    for number in (1, 2, 3):
+        node_ids.set(f"I_{number}", "issue", "o", "r", str(number))
+    node_ids.set("LA_bug", "label", "o", "r", "bug")
+    documents = []
+
+    def handler(method, url, kwargs):
+        query = kwargs["json"]["query"]
+        documents.append(query)
+        if len(documents) == 1:
+            return {"errors": [{"message": "Something went wrong while executing your query."}]}
+        return {"data": {f"m{idx}": {"clientMutationId": None} for idx in range(10)}}
+
+    fake_api(handler)
+    operations = [{"number": 1, "labels": ["bug"]}, {"number": 2, "comment": "hi"}, {"number": 3, "state": "closed"}]
+    results = github.repo("o", "r").issues_triage(operations, max_size=2)
+    assert len(documents) == 2
+    for result in results[:2]:
+        assert result.errors[0]["message"] == "Something went wrong while executing your query."
+        assert "exception" in result.errors[0]
+    assert results[2].errors == []
+    assert results[2].data == {"updateIssue": {"clientMutationId": None}}
+
+
+def test_unresolved_items_are_reported(fake_api, github):
+    def handler(method, url, kwargs):
+        query = kwargs["json"]["query"]
+        if query.startswith("mutation"):
+            return {"data": {"m0": {"clientMutationId": None}}}
+        return {
+            "data": {
+                "q0": {"issueOrPullRequest": {"__typename": "PullRequest", "id": "PR_1"}},
+                "q1": {"issueOrPullRequest": None},
+                _GRAPHQL_RATE_LIMIT_ALIAS: {"cost": 1},
+            }
+        }
+
+    api = fake_api(handler)
+    results = github.repo("o", "r").issues_triage([{"number": 1, "title": "New"}, {"number": 404, "title": "x"}])
+    assert results[0].errors == [] and list(results[0].data) == ["updatePullRequest"]
+    assert results[1].errors == [{"message": "Could not resolve number '404'."}]
+    assert github._node_ids.get("pull", "o", "r", "1") == "PR_1"
+    assert len(api.calls) == 2
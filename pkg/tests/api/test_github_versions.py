@@ -0,0 +1,62 @@
+import pytest
+
+from pylinks.api.github import VersionIndex
+
+from conftest import make_response
+
+
+@pytest.fixture
+def index() -> VersionIndex:
+    return VersionIndex(["1.10.0", "0.1.0", "1.2.0", "2.0.0", "1.2.3", "0.9.9"])
+
+
+def test_versions_are_sorted_numerically(index):
+    assert index.versions == ["0.1.0", "0.9.9", "1.2.0", "1.2.3", "1.10.0", "2.0.0"]
+    assert len(index) == 6
+
+
+def test_latest(index):
+    assert index.latest() == "2.0.0"
+    assert index.latest(below="2") == "1.10.0"
+    assert index.latest(below="2.0.0", inclusive=True) == "2.0.0"
+    assert index.latest(below="1.2") == "0.9.9"
+    assert index.latest(below="1.2.3", inclusive=True) == "1.2.3"
+    assert index.latest(below="0.1.0") is None
+    assert VersionIndex([]).latest() is None
+
+
+def test_between(index):
+    assert index.between("1", "2") == ["1.2.0", "1.2.3", "1.10.0"]
+    assert index.between("1.2.1") == ["1.2.3", "1.10.0", "2.0.0"]
+    assert index.between(upper="1") == ["0.1.0", "0.9.9"]
+    assert index.between("3") == []
+
+
+def test_contains(index):
+    assert "1.2.3" in index
+    assert "1.2" in index  # partial versions are padded with zeros
+    assert "1.2.4" not in index
+
+
+def test_version_index_revalidates_with_etag(fake_api, github):
+    tags = ["v1.0.0", "v1.1.0", "vnext", "v2.0"]
+    etags = []
+
+    def handler(method, url, kwargs):
+        etags.append((kwargs["headers"] or {}).get("If-None-Match"))
+        etag = f'"{len(tags)}"'
+        if etags[-1] == etag:
+            return make_response(url, 304)
+        return 200, [{"ref": f"refs/tags/{tag}"} for tag in tags], {"ETag": etag}
+
+    api = fake_api(handler)
+    repo = github.repo("o", "r")
+    assert repo.semantic_versions() == ["1.0.0", "1.1.0"]
+    assert api.paths() == ["repos/o/r/git/matching-refs/tags/v"]
+    assert repo.semantic_versions() == ["1.0.0", "1.1.0"]
+    tags.append("v1.2.0")
+    # Another handle of the same repository shares the index, and sees the new tag
+    assert github.repo("O", "R").version_index().latest() == "1.2.0"
+    assert etags == [None, '"4"', '"4"']
+    assert github.repo("o", "r").version_index(revalidate=False).latest() == "1.2.0"
+    assert len(etags) == 3
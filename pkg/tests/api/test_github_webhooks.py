@@ -0,0 +1,98 @@
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import pytest
+
+from pylinks.api.github import GitHub
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+
+
+def payload(name: str) -> dict:
+    return json.loads((FIXTURES / f"{name}.json").read_text())
+
+
+@pytest.fixture
+def mirror(github, tmp_path):
+    with github.repo("octo-org", "hello-world").mirror(tmp_path / "mirror.db") as mirror:
+        yield mirror
+
+
+@pytest.fixture
+def filled_mirror(mirror):
+    mirror.ingest("issues", payload("issues_opened"))
+    mirror.ingest("pull_request", payload("pull_request_opened"))
+    mirror.ingest("issue_comment", payload("issue_comment_created"))
+    return mirror
+
+
+def numbers(mirror, **kwargs) -> list[int]:
+    return [item["number"] for item in mirror.issues(**kwargs)]
+
+
+def test_ingest_issues_pulls_and_comments(filled_mirror):
+    assert numbers(filled_mirror) == [1347, 1348]
+    assert numbers(filled_mirror, pulls=True) == [1348]
+    assert numbers(filled_mirror, label="bug") == [1347, 1348]
+    assert numbers(filled_mirror, label="docs") == [1347]
+    pull = filled_mirror.issue(1348)
+    assert pull["pull_request"]["merged_at"] is None
+    assert pull["pull_request"]["diff_url"].endswith("/pull/1348.diff")
+    assert "head" not in pull  # stored in the shape of the Issues API
+    assert [comment["id"] for comment in filled_mirror.comments(1347)] == [1081119451]
+
+
+def test_ingest_label_rename_updates_issues(filled_mirror):
+    assert filled_mirror.ingest("label", payload("label_edited"))
+    assert numbers(filled_mirror, label="bug") == []
+    assert numbers(filled_mirror, label="DEFECT") == [1347, 1348]
+    labels = filled_mirror.issue(1347)["labels"]
+    assert [label["name"] for label in labels] == ["defect", "docs"]
+    assert labels[0]["color"] == "b60205"
+    assert [label["name"] for label in filled_mirror.labels()] == ["defect"]
+
+
+def test_ingest_label_delete_updates_issues(filled_mirror):
+    assert filled_mirror.ingest("label", payload("label_deleted"))
+    assert numbers(filled_mirror, label="docs") == []
+    assert numbers(filled_mirror, label="bug") == [1347, 1348]
+    assert [label["name"] for label in filled_mirror.issue(1347)["labels"]] == ["bug"]
+
+
+def test_ingest_deletions(filled_mirror):
+    deleted = payload("issue_comment_created") | {"action": "deleted"}
+    assert filled_mirror.ingest("issue_comment", deleted)
+    assert filled_mirror.comments(1347) == []
+    assert filled_mirror.ingest("issues", payload("issues_opened") | {"action": "deleted"})
+    assert numbers(filled_mirror) == [1348]
+    assert numbers(filled_mirror, label="docs") == []
+
+
+def test_ingest_ignores_other_events_and_repositories(mirror):
+    other = payload("issues_opened")
+    other["repository"] = other["repository"] | {"full_name": "octo-org/other"}
+    assert not mirror.ingest("issues", other)
+    assert not mirror.ingest("star", payload("issues_opened") | {"action": "created"})
+    assert mirror.issues() == []
+
+
+def test_ingest_webhook(github, mirror):
+    secret = "It's a Secret to Everybody"
+    body = (FIXTURES / "issues_opened.json").read_bytes()
+    signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    assert GitHub.verify_webhook_signature(body, signature, secret)
+    assert not GitHub.verify_webhook_signature(body + b" ", signature, secret)
+    assert not GitHub.verify_webhook_signature(body, None, secret)
+
+    github.ingest_webhook("issues", body, mirrors=[mirror])
+    assert numbers(mirror) == [1347]
+    assert github._node_ids.get("issue", "octo-org", "hello-world", "1347") == "MDU6SXNzdWUx"
+    assert github._node_ids.get("label", "octo-org", "hello-world", "bug") == "MDU6TGFiZWwyMDgwNDU5NDY="
+    assert github._node_ids.get("repo", "octo-org", "hello-world") == "MDEwOlJlcG9zaXRvcnkxMjk2MjY5"
+
+    github.ingest_webhook("label", payload("label_edited"), mirrors=[mirror])
+    assert github._node_ids.get("label", "octo-org", "hello-world", "bug") is None
+    assert github._node_ids.get("label", "octo-org", "hello-world", "defect") == "MDU6TGFiZWwyMDgwNDU5NDY="
+    assert numbers(mirror, label="defect") == [1347]